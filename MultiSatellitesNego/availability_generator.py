@@ -0,0 +1,136 @@
+"""
+Title: Availability Generator
+
+Vectorised, seeded generation of satellite availability matrices for
+benchmark scenarios. Every (satellite, task, time window) assignment is
+flattened into arrays and one random slot per assignment is drawn and
+written with a single fancy-indexing assignment, so thousands of
+satellites take a few array operations instead of a Python loop per slot.
+
+Assignments come either from hand-written per-satellite tables (as in
+tools/availability_matrix.py) or from a sampling rule.
+
+Author: Zheng Wang
+Email: wanzy133@mymail.unisa.edu.au
+Supervisor: Dr. Jianglin Qiao
+
+Date Created: 17/10/2026
+"""
+
+import numpy as np
+
+from .coverage import SLOTS_PER_HOUR
+
+# 24 hours of 15-minute slots
+DEFAULT_SLOTS = 24 * SLOTS_PER_HOUR
+
+
+def task_window_arrays(tasks):
+    """
+    Flatten every task time window.
+
+    Returns:
+        tuple: (task_idx, window_idx, start_slot, end_slot, location) int arrays
+    """
+    rows = [
+        (task_idx, window_idx, window["start_time"] * SLOTS_PER_HOUR,
+         window["end_time"] * SLOTS_PER_HOUR, int(task["location_index"]))
+        for task_idx, task in enumerate(tasks)
+        for window_idx, window in enumerate(task["time_window"])
+    ]
+    arr = np.asarray(rows, dtype=np.int64).reshape(-1, 5)
+    return tuple(arr[:, i] for i in range(5))
+
+
+def flatten_assignments(tasks, assignments_list):
+    """
+    Turn per-satellite assignment tables into flat arrays.
+
+    Args:
+        tasks (list): Task dicts
+        assignments_list (list): One list per satellite of {"task_id": X, "tw_id": Y}
+
+    Returns:
+        tuple: (satellite_idx, start_slot, end_slot, location) int arrays.
+               Unknown tasks and invalid time window indices are skipped.
+    """
+    task_pos = {task["id"]: i for i, task in enumerate(tasks)}
+    rows = []
+    for sat_idx, assignments in enumerate(assignments_list):
+        for assignment in assignments:
+            task_idx = task_pos.get(assignment["task_id"])
+            if task_idx is None:
+                continue
+            windows = tasks[task_idx]["time_window"]
+            tw_id = assignment["tw_id"]
+            if not -len(windows) <= tw_id < len(windows):
+                continue
+            window = windows[tw_id]
+            rows.append((sat_idx, window["start_time"] * SLOTS_PER_HOUR,
+                         window["end_time"] * SLOTS_PER_HOUR, int(tasks[task_idx]["location_index"])))
+    arr = np.asarray(rows, dtype=np.int64).reshape(-1, 4)
+    return tuple(arr[:, i] for i in range(4))
+
+
+def place_assignments(n_satellites, satellite_idx, start_slot, end_slot, location, rng, n_slots=DEFAULT_SLOTS):
+    """
+    Write each assignment's location into one random slot of its window.
+
+    Assignments whose window is empty or outside [0, n_slots) are skipped.
+    When two assignments of a satellite draw the same slot, the later one wins.
+
+    Returns:
+        np.ndarray: (n_satellites, n_slots) int32 availability matrix
+    """
+    matrix = np.zeros((n_satellites, n_slots), dtype=np.int32)
+    valid = (start_slot >= 0) & (start_slot < end_slot) & (end_slot <= n_slots)
+    satellite_idx, start_slot, end_slot, location = (
+        satellite_idx[valid], start_slot[valid], end_slot[valid], location[valid]
+    )
+    # Uniform slot in [start_slot, end_slot)
+    chosen = start_slot + (rng.random(len(start_slot)) * (end_slot - start_slot)).astype(np.int64)
+    # NumPy doesn't define which duplicate index a fancy assignment keeps, so
+    # keep the last assignment per (satellite, slot): the first of the reversed
+    cells = (satellite_idx * n_slots + chosen)[::-1]
+    _, last = np.unique(cells, return_index=True)
+    last = len(cells) - 1 - last
+    matrix[satellite_idx[last], chosen[last]] = location[last]
+    return matrix
+
+
+def generate_availability(tasks, assignments_list, seed=None, n_slots=DEFAULT_SLOTS):
+    """
+    Availability matrices for hand-written per-satellite assignment tables.
+
+    Args:
+        tasks (list): Task dicts
+        assignments_list (list): One list per satellite of {"task_id": X, "tw_id": Y}
+        seed (int): Seed for reproducible output
+
+    Returns:
+        np.ndarray: (len(assignments_list), n_slots) availability matrix
+    """
+    rng = np.random.default_rng(seed)
+    return place_assignments(len(assignments_list), *flatten_assignments(tasks, assignments_list), rng, n_slots)
+
+
+def generate_random_availability(tasks, n_satellites, coverage_probability=0.3, seed=None,
+                                 n_slots=DEFAULT_SLOTS):
+    """
+    Availability matrices from a sampling rule: every satellite covers every
+    task time window independently with `coverage_probability`.
+
+    Args:
+        tasks (list): Task dicts
+        n_satellites (int): Number of satellites
+        coverage_probability (float): Chance a satellite sees a given time window
+        seed (int): Seed for reproducible output
+
+    Returns:
+        np.ndarray: (n_satellites, n_slots) availability matrix
+    """
+    rng = np.random.default_rng(seed)
+    _, _, start_slot, end_slot, location = task_window_arrays(tasks)
+    sat_idx, win_idx = np.nonzero(rng.random((n_satellites, len(start_slot))) < coverage_probability)
+    return place_assignments(n_satellites, sat_idx, start_slot[win_idx], end_slot[win_idx],
+                             location[win_idx], rng, n_slots)
@@ -0,0 +1,143 @@
+"""
+Title: Availability Index
+
+Inverted index from a location to the sorted slots in which each satellite
+sees it. Built once per scenario, it turns "is satellite X available for
+task T", "earliest window" and "all feasible windows" into bisect lookups
+instead of scans over every slot of every window.
+
+Only non-zero slots are stored (0 means the satellite sees nothing), so the
+index is much smaller than the dense 96-int availability lists.
+
+Author: Zheng Wang
+Email: wanzy133@mymail.unisa.edu.au
+Supervisor: Dr. Jianglin Qiao
+
+Date Created: 17/10/2026
+"""
+
+from bisect import bisect_left
+
+import numpy as np
+
+from .availability_runs import satellite_runs
+from .coverage import window_slots
+
+
+class AvailabilityIndex:
+    """
+    location_index -> {satellite_name: sorted list of slots}
+    """
+
+    def __init__(self):
+        self._slots = {}
+        self.satellite_names = []
+
+    @classmethod
+    def from_satellites(cls, satellites):
+        """
+        Build the index from satellite dicts with an 'availability_matrix'
+        or 'availability_runs'.
+        """
+        index = cls()
+        for sat in satellites:
+            if "availability_matrix" in sat:
+                index.add_satellite(sat["name"], sat["availability_matrix"])
+            else:
+                index.add_satellite_runs(sat["name"], satellite_runs(sat))
+        return index
+
+    def add_satellite(self, name, availability_matrix):
+        """
+        Add (or replace) one satellite's availability.
+        """
+        if name in self.satellite_names:
+            self.remove_satellite(name)
+        self.satellite_names.append(name)
+
+        row = np.asarray(availability_matrix)
+        slots = np.flatnonzero(row)
+        for slot, location in zip(slots.tolist(), row[slots].tolist()):
+            # Slots are visited in increasing order, so each list stays sorted
+            self._slots.setdefault(int(location), {}).setdefault(name, []).append(slot)
+
+    def add_satellite_runs(self, name, runs):
+        """
+        Add (or replace) one satellite's availability given as
+        [[start_slot, length, location_index], ...] runs.
+        """
+        if name in self.satellite_names:
+            self.remove_satellite(name)
+        self.satellite_names.append(name)
+
+        for start, length, location in sorted((int(r[0]), int(r[1]), int(r[2])) for r in runs):
+            self._slots.setdefault(location, {}).setdefault(name, []).extend(range(start, start + length))
+
+    def remove_satellite(self, name):
+        self.satellite_names.remove(name)
+        for by_sat in self._slots.values():
+            by_sat.pop(name, None)
+
+    def __contains__(self, name):
+        return name in self.satellite_names
+
+    def slots(self, location, satellite_name):
+        """Sorted slots in which `satellite_name` sees `location`."""
+        return self._slots.get(int(location), {}).get(satellite_name, [])
+
+    def first_slot_in(self, location, satellite_name, start_slot, end_slot):
+        """
+        Earliest slot in [start_slot, end_slot) in which the satellite sees
+        `location`, or None.
+        """
+        slots = self.slots(location, satellite_name)
+        i = bisect_left(slots, start_slot)
+        if i < len(slots) and slots[i] < end_slot:
+            return slots[i]
+        return None
+
+    def satellites_for(self, location, start_slot, end_slot):
+        """Names of the satellites that see `location` in [start_slot, end_slot)."""
+        return [
+            name
+            for name in self.satellite_names
+            if self.first_slot_in(location, name, start_slot, end_slot) is not None
+        ]
+
+    def feasible_windows(self, satellite_name, task):
+        """
+        All time windows of `task` the satellite can cover.
+
+        Returns:
+            list: [(window_index, first_covered_slot), ...] in window order
+        """
+        location = int(task["location_index"])
+        feasible = []
+        for window_index, window in enumerate(task["time_window"]):
+            slot = self.first_slot_in(location, satellite_name, *window_slots(window))
+            if slot is not None:
+                feasible.append((window_index, slot))
+        return feasible
+
+    def earliest_window(self, satellite_name, task):
+        """
+        The window of `task` in which the satellite first sees the task's location.
+
+        Returns:
+            tuple: (window_index, slot), or None if the satellite is not available
+        """
+        feasible = self.feasible_windows(satellite_name, task)
+        if not feasible:
+            return None
+        return min(feasible, key=lambda item: item[1])
+
+    def is_available(self, satellite_name, task):
+        """
+        Index of the first time window (in task order) the satellite covers,
+        or -1. Same contract as utils.is_satellite_available_for_task.
+        """
+        location = int(task["location_index"])
+        for window_index, window in enumerate(task["time_window"]):
+            if self.first_slot_in(location, satellite_name, *window_slots(window)) is not None:
+                return window_index
+        return -1
@@ -0,0 +1,138 @@
+"""
+Title: Run-Length-Encoded Availability
+
+Compact availability representation for long horizons. Instead of one int
+per slot, a satellite stores only the runs of consecutive slots in which it
+sees a location:
+
+    "availability_runs": [[start_slot, length, location_index], ...],
+    "availability_slots": 96
+
+Slots outside every run see nothing (0). A week at 1-minute resolution is
+then a few hundred small triples per satellite instead of 10,080 ints.
+
+Author: Zheng Wang
+Email: wanzy133@mymail.unisa.edu.au
+Supervisor: Dr. Jianglin Qiao
+
+Date Created: 17/10/2026
+"""
+
+import numpy as np
+
+from .coverage import NO_COVERAGE, FeasibilityTable, group_windows_by_location
+
+
+def encode_runs(availability_matrix):
+    """
+    Run-length encode a dense availability matrix.
+
+    Args:
+        availability_matrix (list): One location index per slot, 0 for none
+
+    Returns:
+        list: [[start_slot, length, location_index], ...] for the non-zero runs
+    """
+    row = np.asarray(availability_matrix)
+    if row.size == 0:
+        return []
+    # A run starts at every slot whose value differs from the previous one
+    starts = np.flatnonzero(np.diff(row, prepend=row[0] - 1))
+    lengths = np.diff(np.append(starts, row.size))
+    locations = row[starts]
+    keep = locations != 0
+    return np.stack([starts[keep], lengths[keep], locations[keep]], axis=1).tolist()
+
+
+def decode_runs(runs, n_slots):
+    """
+    Expand runs back into a dense availability matrix of `n_slots` ints.
+    """
+    matrix = np.zeros(n_slots, dtype=np.int32)
+    for start, length, location in runs:
+        matrix[start:start + length] = location
+    return matrix.tolist()
+
+
+def satellite_runs(satellite):
+    """
+    The runs of a satellite dict, whichever representation it was stored in.
+
+    Returns:
+        np.ndarray: (n_runs, 3) int array of (start_slot, length, location_index)
+    """
+    if "availability_runs" in satellite:
+        runs = satellite["availability_runs"]
+    else:
+        runs = encode_runs(satellite["availability_matrix"])
+    return np.asarray(runs, dtype=np.int64).reshape(-1, 3)
+
+
+def satellite_slots(satellite):
+    """Length of a satellite's planning horizon in slots."""
+    if "availability_slots" in satellite:
+        return satellite["availability_slots"]
+    if "availability_matrix" in satellite:
+        return len(satellite["availability_matrix"])
+    runs = satellite_runs(satellite)
+    return int((runs[:, 0] + runs[:, 1]).max()) if len(runs) else 0
+
+
+def has_dense_availability(satellite):
+    return "availability_matrix" in satellite
+
+
+class RunCoverageKernel:
+    """
+    Coverage queries answered directly on availability runs.
+
+    All satellites' runs are concatenated into flat arrays, so each distinct
+    location costs one (runs x windows) overlap mask instead of a pass over
+    every slot of the horizon.
+    """
+
+    def __init__(self, satellites):
+        self.satellite_names = [sat["name"] for sat in satellites]
+        runs = [satellite_runs(sat) for sat in satellites]
+        self.run_satellite = np.concatenate(
+            [np.full(len(r), i, dtype=np.int64) for i, r in enumerate(runs)] or [np.zeros(0, dtype=np.int64)]
+        )
+        stacked = np.concatenate(runs) if runs else np.zeros((0, 3), dtype=np.int64)
+        self.run_start = stacked[:, 0]
+        self.run_end = stacked[:, 0] + stacked[:, 1]
+        self.run_location = stacked[:, 2]
+
+    def feasibility(self, tasks):
+        """
+        Compute the feasibility tensor for a list of tasks.
+
+        Returns:
+            FeasibilityTable
+        """
+        n_sats = len(self.satellite_names)
+        num_windows = [len(task["time_window"]) for task in tasks]
+        first_slot = np.full((len(tasks), max(num_windows, default=0), n_sats), NO_COVERAGE, dtype=np.int32)
+
+        windows_by_location = group_windows_by_location(tasks)
+
+        for location, (task_idx, window_idx, starts, ends) in windows_by_location.items():
+            at_location = np.flatnonzero(self.run_location == location)
+            if not task_idx or at_location.size == 0:
+                continue
+            run_start = self.run_start[at_location][:, None]
+            run_end = self.run_end[at_location][:, None]
+            starts = np.asarray(starts)[None, :]
+            ends = np.asarray(ends)[None, :]
+
+            # (runs, windows): the run overlaps the window; it is first seen at max(starts)
+            overlaps = (run_start < ends) & (run_end > starts) & (starts < ends)
+            first = np.maximum(run_start, starts)
+
+            # Earliest overlapping run per (satellite, window)
+            best = np.full((n_sats, len(task_idx)), np.iinfo(np.int64).max)
+            run_idx, win_idx = np.nonzero(overlaps)
+            np.minimum.at(best, (self.run_satellite[at_location][run_idx], win_idx), first[run_idx, win_idx])
+            best = np.where(best == np.iinfo(np.int64).max, NO_COVERAGE, best)
+            first_slot[task_idx, window_idx, :] = best.T
+
+        return FeasibilityTable([t["id"] for t in tasks], self.satellite_names, num_windows, first_slot)
@@ -0,0 +1,155 @@
+"""
+Title: Availability Store
+
+Binary on-disk store for satellite availability, for constellations too
+large to embed every availability matrix in the scenario JSON.
+
+All satellites' availability is written as one (n_satellites, n_slots)
+.npy array next to the scenario, e.g. saved_data/1000s.json ->
+saved_data/1000s.avail.npy. The JSON then only references it:
+
+    "availability_store": {"path": "1000s.avail.npy", "shape": [1000, 96],
+                           "dtype": "int16", "sha256": "..."}
+
+and every satellite records its row as "availability_row". The store is
+opened with numpy.memmap, so each satellite's "availability_matrix" is a
+zero-copy view of its row and only the rows that are actually used are
+ever read from disk.
+
+Author: Zheng Wang
+Email: wanzy133@mymail.unisa.edu.au
+Supervisor: Dr. Jianglin Qiao
+
+Date Created: 17/10/2026
+"""
+
+import hashlib
+import os
+
+import numpy as np
+
+from .availability_runs import decode_runs, satellite_slots
+
+STORE_SUFFIX = ".avail.npy"
+
+
+def store_path(json_file):
+    """saved_data/1000s.json -> saved_data/1000s.avail.npy"""
+    root, _ = os.path.splitext(json_file)
+    return f"{root}{STORE_SUFFIX}"
+
+
+def _file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def is_store_backed(satellite):
+    """True if the satellite's availability is a view into a memory-mapped store."""
+    return isinstance(satellite.get("availability_matrix"), np.memmap)
+
+
+def write_availability_store(json_file, data):
+    """
+    Move the availability of every satellite in `data` into a .npy store
+    next to `json_file`. The satellites' 'availability_matrix' /
+    'availability_runs' are replaced by an 'availability_row' and `data`
+    gets an 'availability_store' reference. Nothing is written to the JSON
+    itself; save the scenario afterwards.
+
+    Args:
+        json_file (str): Path of the scenario JSON file
+        data (dict): The loaded scenario, updated in place
+
+    Returns:
+        str: Path of the written store
+    """
+    satellites = data["satellites"]
+    n_slots = max((satellite_slots(sat) for sat in satellites), default=0)
+    matrix = np.zeros((len(satellites), n_slots), dtype=np.int32)
+    for i, sat in enumerate(satellites):
+        if "availability_matrix" in sat:
+            row = np.asarray(sat["availability_matrix"])
+        else:
+            row = np.asarray(decode_runs(sat["availability_runs"], satellite_slots(sat)))
+        matrix[i, :len(row)] = row
+
+    # Location indices are small, so int16 halves the file in the common case
+    if matrix.size == 0 or matrix.max() < np.iinfo(np.int16).max:
+        matrix = matrix.astype(np.int16)
+
+    path = store_path(json_file)
+    # Write to a temporary file first so readers never see a partial store
+    tmp_path = f"{path}.tmp.npy"
+    np.save(tmp_path, matrix)
+    os.replace(tmp_path, path)
+
+    for i, sat in enumerate(satellites):
+        sat.pop("availability_matrix", None)
+        sat.pop("availability_runs", None)
+        sat.pop("availability_slots", None)
+        sat["availability_row"] = i
+
+    data["availability_store"] = {
+        "path": os.path.basename(path),
+        "shape": list(matrix.shape),
+        "dtype": str(matrix.dtype),
+        "sha256": _file_digest(path)
+    }
+    return path
+
+
+def open_availability_store(json_file, reference):
+    """
+    Memory-map the store referenced by a scenario.
+
+    Args:
+        json_file (str): Path of the scenario JSON file (the store path is relative to it)
+        reference (dict): The scenario's 'availability_store' entry
+
+    Returns:
+        np.memmap: Read-only (n_satellites, n_slots) array
+
+    Raises:
+        ValueError: If the store's shape or dtype does not match the reference
+    """
+    path = os.path.join(os.path.dirname(json_file), reference["path"])
+    store = np.load(path, mmap_mode="r")
+    if list(store.shape) != list(reference["shape"]) or str(store.dtype) != reference["dtype"]:
+        raise ValueError(
+            f"Availability store {path} is {store.dtype}{list(store.shape)}, "
+            f"expected {reference['dtype']}{reference['shape']}"
+        )
+    return store
+
+
+def attach_availability_store(json_file, data):
+    """
+    Point every satellite with an 'availability_row' at its row of the
+    scenario's memory-mapped store. Rows are views, so nothing is read
+    until a satellite's availability is actually used.
+    """
+    reference = data.get("availability_store")
+    if reference is None:
+        return
+    store = open_availability_store(json_file, reference)
+    for sat in data["satellites"]:
+        if "availability_row" in sat:
+            sat["availability_matrix"] = store[sat["availability_row"]]
+
+
+def detach_availability_store(data):
+    """
+    A copy of `data` that can be written back as JSON: store-backed
+    satellites keep their 'availability_row' and drop the memory-mapped view.
+    """
+    detached = dict(data)
+    detached["satellites"] = [
+        {key: value for key, value in sat.items() if key != "availability_matrix"}
+        if is_store_backed(sat) else sat
+        for sat in data["satellites"]
+    ]
+    return detached
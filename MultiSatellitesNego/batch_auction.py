@@ -0,0 +1,259 @@
+"""
+Title: Batch Auction
+
+Advances N independent two-party auction sessions in lockstep, with the
+offers, utilities and accept decisions of all sessions held in NumPy arrays.
+
+A session is the stage 1 auction of the traditional strategy: a satellite
+(buyer) and a task (seller) haggle over a price in 0..2 * memory_required,
+both following AuctionNegotiator's rules (apps/traditional_strategy.py) with
+the utility functions of its task_agenda():
+
+- satellite: price * (-1 / 9) + 1, i.e. AffineFun(slope=-1, bias=9) scaled
+  to a maximum of 1,
+- task: 0 below memory_required, otherwise (price - memory_required + 1)
+  scaled to a maximum of 1.
+
+Every price set a negotiator looks at is an interval of prices, so a
+proposal is a few array operations instead of a scan of the outcome space.
+The SAO protocol of a session of n_steps is followed: at step k (relative
+time (k + 1) / (n_steps + 1)) the satellite responds to the task's last
+offer and proposes, then the task responds and proposes. An agreement at
+step k ends the session after k + 1 steps.
+
+Where AuctionNegotiator picks randomly among its candidate offers
+(random.choice), the engine draws from its own seeded generator, so a batch
+matches sequential sessions in distribution rather than draw by draw.
+
+Author: Zheng Wang
+Email: wanzy133@mymail.unisa.edu.au
+Supervisor: Dr. Jianglin Qiao
+
+Date Created: 17/10/2026
+"""
+
+import numpy as np
+
+from .session_cache import SessionOutcome
+
+# The satellite's scaled AffineFun(slope=-1, bias=9), evaluated as negmas does
+_BUYER_SCALE = 1.0 / 9
+_BUYER_SLOPE = -1 * _BUYER_SCALE
+_BUYER_BIAS = 9 * _BUYER_SCALE
+
+# Slack of the aspiration ranges the negotiators pass to their invertors
+_ASPIRATION_SLACK = 1e-6
+
+# Offsets around the satellite's early target price holding its 3 closest prices
+_TARGET_WINDOW = np.arange(-2, 4)
+
+
+def buyer_utility(price):
+    """The satellite's utility of prices."""
+    return price * _BUYER_SLOPE + _BUYER_BIAS
+
+
+def seller_utility(price, memory_required, max_price):
+    """The task's utility of prices, for its memory requirement and highest price."""
+    scale = 1.0 / (max_price - memory_required + 1)
+    return np.where(price < memory_required, 0.0, (price - memory_required + 1) * scale)
+
+
+def _first_price(predicate, max_price):
+    """
+    Smallest price in 0..max_price for which a monotone (False, then True)
+    predicate holds, max_price + 1 where it never does. Binary search over
+    all elements at once.
+    """
+    lo = np.full(np.shape(max_price), -1)
+    hi = max_price + 1
+    while True:
+        searching = hi - lo > 1
+        if not searching.any():
+            return hi
+        mid = (lo + hi) // 2
+        holds = predicate(np.minimum(mid, max_price))
+        hi = np.where(searching & holds, mid, hi)
+        lo = np.where(searching & ~holds, mid, lo)
+
+
+class BatchAuction:
+    """
+    N auction sessions between satellites and tasks, advanced in lockstep.
+    """
+
+    def __init__(self, memory_required, available_memory, n_steps=20, rng=None):
+        """
+        Args:
+            memory_required: The task's memory requirement of each session
+                             (a scalar for one task against many satellites)
+            available_memory: The satellite's available memory of each session
+            n_steps (int): Steps of every session
+            rng: numpy Generator or seed of the random offer choices
+        """
+        available_memory = np.asarray(available_memory, dtype=float)
+        memory_required = np.broadcast_to(np.asarray(memory_required, dtype=float), available_memory.shape)
+        self.n_steps = n_steps
+        self.rng = np.random.default_rng(rng)
+        self.memory_required = memory_required
+        self.available_memory = available_memory
+        self.max_price = 2 * memory_required.astype(int)
+
+        n = len(available_memory)
+        self.buyer_offers = np.full(n, -1)
+        self.seller_offers = np.full(n, -1)
+        # The satellite's first offer, which the task keeps coming back to
+        self.partner_first = np.full(n, -1)
+        self.agreements = np.full(n, -1)
+        self.steps = np.full(n, n_steps)
+        self.running = np.ones(n, dtype=bool)
+        self.current_step = 0
+
+        # Relative time of every step and each session's thresholds at it, shape (n, n_steps)
+        self.times = np.arange(1, n_steps + 1) / (n_steps + 1)
+        aspiration = 1.0 * (1.0 - self.times)
+        max_price = self.max_price[:, None]
+        memory = memory_required[:, None]
+
+        buyer_min, buyer_max = buyer_utility(max_price), buyer_utility(0)
+        buyer_level = (buyer_max - buyer_min) * aspiration + buyer_min
+        # Highest price the satellite offers at its aspiration level (-1 for none)
+        self.buyer_top = _first_price(
+            lambda p: buyer_utility(p) < buyer_level - _ASPIRATION_SLACK, max_price
+        ) - 1
+        # Lowest utility it accepts (20% discount on its aspiration)
+        self.buyer_accept = (buyer_max - buyer_min) * aspiration * 0.8 + buyer_min
+        self.buyer_min = buyer_min[:, 0]
+
+        seller_min = seller_utility(0, memory, max_price)
+        seller_max = seller_utility(max_price, memory, max_price)
+        seller_level = (seller_max - seller_min) * aspiration + seller_min
+        # Lowest price the task offers at its aspiration level (max_price + 1 for none)
+        self.seller_bottom = _first_price(
+            lambda p: seller_utility(p, memory, max_price) >= seller_level - _ASPIRATION_SLACK, max_price
+        )
+        # Lowest price it accepts, demanding more early on
+        self.seller_accept = np.where(
+            self.times <= 0.3, memory * 1.5,
+            np.where(self.times <= 0.5, memory * 1.2,
+                     np.where(self.times <= 0.8, memory * 1.02, memory))
+        )
+
+    def __len__(self):
+        return len(self.available_memory)
+
+    @property
+    def done(self):
+        return self.current_step >= self.n_steps or not self.running.any()
+
+    def _choose(self, counts):
+        """Index of a uniform choice among counts candidates per session."""
+        return self.rng.integers(0, np.maximum(counts, 1))
+
+    def buyer_proposals(self, k):
+        """The satellites' offers at step k."""
+        t = self.times[k]
+        memory = self.available_memory
+        # Prices the satellite aspires to and can pay for are 0..top
+        top = np.minimum(self.buyer_top[:, k], np.floor(memory)).astype(int)
+        counts = top + 1
+        price_range = np.where(top > 0, top, 1)
+
+        if t < 0.4:
+            # One of the 3 prices closest to a target that grows with the memory
+            target = price_range * np.minimum(memory / 100, 0.7)
+            window = np.floor(target).astype(int)[:, None] + _TARGET_WINDOW
+            distance = np.where((window >= 0) & (window <= top[:, None]),
+                                np.abs(window - target[:, None]), np.inf)
+            # Closest first, ties to the higher price as in the invertor's order
+            order = np.lexsort((-window, distance), axis=-1)
+            pick = order[np.arange(len(top)), self._choose(np.minimum(3, counts))]
+            offers = window[np.arange(len(top)), pick]
+        elif t < 0.7:
+            # One of the highest prices, more of them with more memory
+            flexibility = np.minimum(0.3 + memory / 1000, 0.8)
+            selection = np.maximum(1, (counts * flexibility).astype(int))
+            offers = top - self._choose(selection)
+        else:
+            # One of the top 20% by utility plus a memory boost for higher prices
+            memory_factor = np.minimum(memory / 500, 0.5)
+            boost_wins = buyer_utility(top) + (top / price_range) * memory_factor > buyer_utility(0)
+            choice = self._choose(np.maximum(1, (counts * 0.2).astype(int)))
+            offers = np.where(boost_wins, top - choice, choice)
+
+        # Nothing affordable: offer the best price
+        return np.where(top < 0, 0, offers)
+
+    def seller_proposals(self, k):
+        """The tasks' offers at step k."""
+        max_price = self.max_price
+        # Prices the task aspires to and accepts are lowest..max_price
+        lowest = np.maximum(self.seller_bottom[:, k], np.ceil(self.memory_required)).astype(int)
+        # The offer closest to the satellite's first offer
+        offers = np.clip(self.partner_first, lowest, max_price)
+        if self.times[k] < 0.4:
+            # Early on, the lowest price at a 30% premium when there is one
+            premium = np.maximum(lowest, np.ceil(self.memory_required * 1.3)).astype(int)
+            offers = np.where(premium <= max_price, premium, offers)
+        return np.where(lowest > max_price, max_price, offers)
+
+    def buyer_accepts(self, offers, k):
+        """Whether the satellites accept the task's offers at step k."""
+        utility = buyer_utility(offers)
+        accept = utility >= self.buyer_accept[:, k]
+        if self.times[k] > 0.8:
+            # Anything not terrible in the final 20% of the time
+            accept |= utility > self.buyer_min * 1.2
+        return accept & (offers <= self.available_memory)
+
+    def seller_accepts(self, offers, k):
+        """Whether the tasks accept the satellites' offers at step k."""
+        return (offers >= self.memory_required) & (offers >= self.seller_accept[:, k])
+
+    def _agree(self, accepted, offers, k):
+        self.agreements = np.where(accepted, offers, self.agreements)
+        self.steps = np.where(accepted, k + 1, self.steps)
+        self.running &= ~accepted
+
+    def step(self):
+        """Advance every running session by one step."""
+        if self.done:
+            return
+        k = self.current_step
+        if k > 0:
+            self._agree(self.running & self.buyer_accepts(self.seller_offers, k), self.seller_offers, k)
+        self.buyer_offers = np.where(self.running, self.buyer_proposals(k), self.buyer_offers)
+        if k == 0:
+            self.partner_first = self.buyer_offers.copy()
+        self._agree(self.running & self.seller_accepts(self.buyer_offers, k), self.buyer_offers, k)
+        self.seller_offers = np.where(self.running, self.seller_proposals(k), self.seller_offers)
+        self.current_step += 1
+
+    def run(self):
+        """Run every session to its end."""
+        while not self.done:
+            self.step()
+        return self
+
+    def outcomes(self):
+        """SessionOutcome of every session, in order."""
+        return [
+            SessionOutcome((int(price),) if price >= 0 else None, int(step))
+            for price, step in zip(self.agreements, self.steps)
+        ]
+
+
+def run_auction_batch(memory_required, available_memory, n_steps=20, rng=None):
+    """
+    Run auction sessions of a task (or tasks) against satellites in lockstep.
+
+    Args:
+        memory_required: The task's memory requirement of each session
+        available_memory: The satellite's available memory of each session
+        n_steps (int): Steps of every session
+        rng: numpy Generator or seed of the random offer choices
+
+    Returns:
+        list: SessionOutcome of every session, in order
+    """
+    return BatchAuction(memory_required, available_memory, n_steps, rng).run().outcomes()
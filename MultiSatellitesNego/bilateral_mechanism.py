@@ -0,0 +1,256 @@
+"""
+Title: Bilateral Mechanism
+
+A stripped-down alternating offers mechanism for two negotiators over a
+finite outcome space, as a drop-in for SAOMechanism in the two-party
+sessions of the strategies.
+
+It follows SAOMechanism's protocol with its default settings (offering is
+accepting, ending when a negotiator does not propose, n_steps and no time
+limit) and drives the negotiators through the same negmas entry points
+(join, _on_negotiation_start, __call__ and _on_negotiation_end), so propose
+and respond see the same SAOState fields and nmi. What it leaves out is the
+machinery the strategies never use: the trace and history, a copy of the
+state per call, time limits, callbacks and checkpoints. Negotiators get the
+live state and must not keep it between calls.
+
+Like SAOMechanism, every step draws one number from the global `random`
+stream, so seeded runs of random negotiators take the same course under both.
+tools/bilateral_conformance.py checks agreements and steps against negmas.
+
+Author: Zheng Wang
+Email: wanzy133@mymail.unisa.edu.au
+Supervisor: Dr. Jianglin Qiao
+
+Date Created: 17/10/2026
+"""
+
+import random
+import time
+import uuid
+
+from negmas import ResponseType, SAOMechanism
+from negmas.helpers import unique_name
+from negmas.outcomes import make_os
+from negmas.sao import SAOState
+from negmas.sao.common import SAONMI
+
+# Mechanisms the strategies can run their sessions on
+MECHANISMS = ("sao", "bilateral")
+
+
+class BilateralMechanism:
+    """
+    Alternating offers between two negotiators, the first added opening.
+    """
+
+    def __init__(self, issues=None, outcome_space=None, n_steps=20, name=None):
+        """
+        Args:
+            issues (list): Issues of the outcome space (or give outcome_space)
+            outcome_space: A finite outcome space
+            n_steps (int): Steps of the session
+
+        Raises:
+            ValueError: If no finite outcome space is given
+        """
+        if outcome_space is None:
+            if issues is None:
+                raise ValueError("Either issues or outcome_space must be given")
+            outcome_space = make_os(issues)
+        if not outcome_space.is_finite():
+            raise ValueError("BilateralMechanism needs a finite outcome space")
+        self.outcome_space = outcome_space
+        self.n_steps = n_steps
+        self.id = str(uuid.uuid4())
+        # Named as SAOMechanism does, which also draws from the random stream
+        self.name = name if name else unique_name("", add_time=False, rand_digits=16)
+        self.negotiators = []
+        # Negotiator id -> id of its owner agent, if any
+        self._owners = {}
+        self._state = SAOState(relative_time=self._relative_time(0))
+        self._start_time = None
+        # One interface for both negotiators, as they share every limit
+        self.nmi = SAONMI(
+            id=self.id,
+            n_outcomes=outcome_space.cardinality,
+            outcome_space=outcome_space,
+            shared_time_limit=float("inf"),
+            shared_n_steps=n_steps,
+            private_time_limit=float("inf"),
+            private_n_steps=None,
+            pend=0.0,
+            pend_per_second=0.0,
+            step_time_limit=float("inf"),
+            negotiator_time_limit=float("inf"),
+            dynamic_entry=False,
+            max_n_negotiators=2,
+            _mechanism=self,
+        )
+
+    def _relative_time(self, step):
+        return min(1.0, (step + 1) / (self.n_steps + 1))
+
+    @property
+    def state(self) -> SAOState:
+        return self._state
+
+    @property
+    def agreement(self):
+        return self._state.agreement
+
+    @property
+    def negotiator_ids(self):
+        return [negotiator.id for negotiator in self.negotiators]
+
+    def random_outcomes(self, n=1, with_replacement=False):
+        return list(self.outcome_space.sample(n, with_replacement=with_replacement, fail_if_not_enough=False))
+
+    def random_outcome(self):
+        return self.outcome_space.random_outcome()
+
+    def discrete_outcomes(self, max_cardinality=float("inf")):
+        return list(self.outcome_space.enumerate_or_sample(max_cardinality=max_cardinality))
+
+    def add(self, negotiator, *, preferences=None, ufun=None, role=None):
+        """
+        Add a negotiator with its utility function, as SAOMechanism.add.
+
+        Returns:
+            bool: True if the negotiator joined, False if it was already added
+                  or refused, None if its ufun is for another outcome space
+
+        Raises:
+            ValueError: If the session already has two negotiators
+        """
+        if len(self.negotiators) >= 2:
+            raise ValueError("BilateralMechanism sessions have exactly two negotiators")
+        if ufun is not None:
+            preferences = ufun
+        if (preferences is not None and preferences.outcome_space is not None
+                and self.outcome_space not in preferences.outcome_space):
+            return None
+        if negotiator in self.negotiators:
+            return False
+        joined = negotiator.join(
+            nmi=self.nmi, state=self._state, preferences=preferences,
+            role=role if role is not None else "negotiator"
+        )
+        if joined:
+            self.negotiators.append(negotiator)
+            self._owners[negotiator.id] = negotiator.owner.id if negotiator.owner else None
+            self._state.n_negotiators += 1
+        return joined
+
+    def _start(self):
+        state = self._state
+        state.running = True
+        state.started = True
+        state.step = 0
+        state.relative_time = self._relative_time(0)
+        self._start_time = time.perf_counter()
+        for negotiator in self.negotiators:
+            negotiator._on_negotiation_start(state)
+
+    def _end(self):
+        self._state.running = False
+        for negotiator in self.negotiators:
+            negotiator._on_negotiation_end(self._state)
+
+    def _round(self):
+        """Let both negotiators act once; returns True once the session is over."""
+        state = self._state
+        for negotiator, partner in ((self.negotiators[0], self.negotiators[1]),
+                                    (self.negotiators[1], self.negotiators[0])):
+            if state.current_proposer == negotiator.id:
+                state.n_acceptances = 0
+            response = negotiator(state, dest=partner.id)
+
+            if response.response == ResponseType.NO_RESPONSE:
+                continue
+            if response.response == ResponseType.ACCEPT_OFFER:
+                if state.current_offer is None:
+                    state.broken = True
+                    return True
+                state.n_acceptances += 1
+                if state.n_acceptances == 2:
+                    state.agreement = state.current_offer
+                    return True
+                continue
+            if response.response != ResponseType.REJECT_OFFER:
+                # END_NEGOTIATION, LEAVE (which leaves one negotiator behind)
+                # or WAIT, which the strategies' negotiators never use
+                state.broken = True
+                return True
+
+            if response.outcome is None and not response.data:
+                # Refusing to propose ends the negotiation
+                state.broken = True
+                return True
+            state.n_acceptances = 1 if response.outcome is not None else 0
+            state.current_offer = response.outcome
+            state.current_data = response.data
+            state.current_proposer = negotiator.id
+            state.last_negotiator = negotiator.name
+            state.new_offers.append((negotiator.id, response.outcome))
+            state.new_data.append((negotiator.id, response.data))
+            state.new_offerer_agents = [self._owners[offerer] for offerer, _ in state.new_offers]
+        return False
+
+    def step(self) -> SAOState:
+        """Run one step (each negotiator acting once), starting the session if needed."""
+        state = self._state
+        # SAOMechanism draws for its per-step end probability even when it is 0
+        random.random()
+        if state.step >= self.n_steps:
+            state.timedout = True
+            self._end()
+            return state
+        if len(self.negotiators) < 2:
+            state.ended_without_starting = True
+            self._end()
+            return state
+        if not state.running:
+            self._start()
+
+        state.new_offers = []
+        state.new_data = []
+        ended = self._round()
+        state.step += 1
+        state.time = time.perf_counter() - self._start_time
+        state.relative_time = self._relative_time(state.step)
+        if ended:
+            self._end()
+        return state
+
+    def run(self) -> SAOState:
+        """Run the session to its end and return the final state."""
+        state = self._state
+        while True:
+            self.step()
+            if not state.running:
+                return state
+
+
+def make_session(mechanism, issues, n_steps, n_negotiators=2):
+    """
+    A negotiation session on the chosen mechanism.
+
+    Args:
+        mechanism (str): One of MECHANISMS
+        issues (list): Issues of the session
+        n_steps (int): Steps of the session
+        n_negotiators (int): Negotiators that will be added
+
+    Returns:
+        BilateralMechanism for "bilateral" sessions of two negotiators,
+        SAOMechanism otherwise
+
+    Raises:
+        ValueError: If the mechanism is unknown
+    """
+    if mechanism not in MECHANISMS:
+        raise ValueError(f"Unknown mechanism: {mechanism}. Available mechanisms: {list(MECHANISMS)}")
+    if mechanism == "bilateral" and n_negotiators == 2:
+        return BilateralMechanism(issues=issues, n_steps=n_steps)
+    return SAOMechanism(issues=issues, n_steps=n_steps)
@@ -0,0 +1,34 @@
+"""
+Title: Command Line Flags
+
+The flag parsing shared by the strategy apps and the tools, which read
+sys.argv directly (nego_app.py uses argparse).
+
+Author: Zheng Wang
+Email: wanzy133@mymail.unisa.edu.au
+Supervisor: Dr. Jianglin Qiao
+
+Date Created: 17/10/2026
+"""
+
+import sys
+
+
+def flag_value(name, default=None, argv=None):
+    """
+    Value following `name` on the command line, e.g. "42" for --seed 42.
+
+    Args:
+        name (str): The flag, e.g. "--seed"
+        default: Returned if the flag is missing or has no value
+        argv (list): The arguments to search, sys.argv by default
+
+    Returns:
+        str: The flag's value (or default)
+    """
+    argv = sys.argv if argv is None else argv
+    if name in argv:
+        idx = argv.index(name)
+        if idx + 1 < len(argv):
+            return argv[idx + 1]
+    return default
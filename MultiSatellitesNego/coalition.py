@@ -0,0 +1,279 @@
+"""
+Title: Coalition Table
+
+A satellite's coalition table lists, for each task, the partner
+satellites it would like to form a coalition with, ordered by priority
+(1 = most preferred). The JSON form stored in the scenario files is:
+
+    "coalition_table": {
+        "satellite": "sat1",
+        "preferences": [
+            {"task_id": 1, "preferred_satellites": ["sat3"], "priority": 1},
+            ...
+        ]
+    }
+
+CompactCoalitionTable holds the same table as arrays (one row per task
+pointing into a ranked list of coalitions, like a CSR sparse matrix), so a
+strategy can walk a task's candidates in priority order without regrouping
+or sorting the entries. Its compact JSON form stores the arrays directly:
+
+    "coalition_table": {
+        "satellite": "sat1",
+        "satellites": ["sat3", "sat5", ...],    partner names, indexed by "members"
+        "task_ids": [1, 2, ...],
+        "task_offsets": [0, 3, ...],            task i: coalitions task_offsets[i]..task_offsets[i+1]
+        "coalition_offsets": [0, 1, 2, ...],    coalition j: members coalition_offsets[j]..[j+1]
+        "members": [0, 1, ...]
+    }
+
+with an optional "priorities" list when a task's priorities aren't 1, 2, 3...
+
+Author: Zheng Wang
+Email: wanzy133@mymail.unisa.edu.au
+Supervisor: Dr. Jianglin Qiao
+
+Date Created: 17/10/2026
+"""
+
+from typing import Dict, List
+
+import numpy as np
+
+
+class CoalitionPreference:
+    def __init__(self, task_id, preferred_satellites: List[str], priority: int):
+        """
+        Initialize a CoalitionPreference object.
+
+        Args:
+            task_id: ID of the task the coalition is for
+            preferred_satellites: Names of the partner satellites
+            priority: Rank of this coalition among the task's coalitions (1 = first choice)
+        """
+        self.task_id = task_id
+        self.preferred_satellites = list(preferred_satellites)
+        self.priority = priority
+
+    def to_dict(self) -> Dict:
+        return {
+            "task_id": self.task_id,
+            "preferred_satellites": self.preferred_satellites,
+            "priority": self.priority
+        }
+
+    def __repr__(self):
+        return f"CoalitionPreference(task_id={self.task_id}, preferred_satellites={self.preferred_satellites}, priority={self.priority})"
+
+
+class CoalitionTable:
+    def __init__(self, satellite_id: str, preferences: List[CoalitionPreference] | None = None):
+        """
+        Initialize a CoalitionTable object.
+
+        Args:
+            satellite_id: Name of the satellite (the initiator) owning the table
+            preferences: Its coalition preferences
+        """
+        self.satellite_id = satellite_id
+        self.preferences = list(preferences) if preferences else []
+
+    def add_preference(self, task_id, preferred_satellites: List[str], priority: int | None = None):
+        """
+        Add a coalition for a task. Without a priority it ranks after the
+        task's existing coalitions.
+        """
+        if priority is None:
+            priority = len(self.get_preferences_for_task(task_id)) + 1
+        self.preferences.append(CoalitionPreference(task_id, preferred_satellites, priority))
+
+    def get_preferences_for_task(self, task_id) -> List[CoalitionPreference]:
+        """The coalitions for one task, in priority order."""
+        return sorted(
+            (pref for pref in self.preferences if pref.task_id == task_id),
+            key=lambda pref: pref.priority
+        )
+
+    def to_dict(self) -> Dict:
+        return {
+            "satellite": self.satellite_id,
+            "preferences": [pref.to_dict() for pref in self.preferences]
+        }
+
+    @classmethod
+    def from_dict(cls, table: Dict) -> "CoalitionTable":
+        """Build a table from its scenario JSON form."""
+        return cls(table["satellite"], [
+            CoalitionPreference(pref["task_id"], pref["preferred_satellites"], pref["priority"])
+            for pref in table.get("preferences", [])
+        ])
+
+    def __len__(self):
+        return len(self.preferences)
+
+
+class CompactCoalitionTable:
+    def __init__(self, satellite_id: str, satellite_names: List[str], task_ids: List,
+                 task_offsets, coalition_offsets, members, priorities=None):
+        """
+        Initialize a CompactCoalitionTable object.
+
+        Args:
+            satellite_id: Name of the satellite (the initiator) owning the table
+            satellite_names: Partner names, indexed by `members`
+            task_ids: The tasks with coalitions, in table order
+            task_offsets: (n_tasks + 1,) start of each task's coalitions
+            coalition_offsets: (n_coalitions + 1,) start of each coalition's members
+            members: Partner indices of all coalitions, best coalition of each task first
+            priorities: (n_coalitions,) priorities, if not simply 1, 2, 3... per task
+        """
+        self.satellite_id = satellite_id
+        self.satellite_names = list(satellite_names)
+        self.task_ids = list(task_ids)
+        self.task_offsets = np.asarray(task_offsets, dtype=np.int32)
+        self.coalition_offsets = np.asarray(coalition_offsets, dtype=np.int32)
+        self.members = np.asarray(members, dtype=np.int32)
+        self.priorities = None if priorities is None else np.asarray(priorities, dtype=np.int32)
+        self._task_pos = {task_id: i for i, task_id in enumerate(self.task_ids)}
+
+    @classmethod
+    def from_coalitions(cls, satellite_id: str, satellite_names: List[str], task_ids: List,
+                        coalitions: List[List[tuple]]) -> "CompactCoalitionTable":
+        """
+        Build from ranked coalitions per task, e.g. coalition_finder.find_coalitions
+        output. Tasks without coalitions are left out.
+
+        Args:
+            satellite_names: Names the member indices refer to
+            task_ids: One task id per entry of `coalitions`
+            coalitions: Per task, tuples of member indices, best first
+        """
+        kept = [(task_id, ranked) for task_id, ranked in zip(task_ids, coalitions) if ranked]
+        flat = [members for _, ranked in kept for members in ranked]
+        task_offsets = np.cumsum([0] + [len(ranked) for _, ranked in kept])
+        coalition_offsets = np.cumsum([0] + [len(members) for members in flat])
+        members = np.fromiter((m for coalition in flat for m in coalition), dtype=np.int32,
+                              count=int(coalition_offsets[-1]))
+        return cls._with_used_names(satellite_id, satellite_names, [task_id for task_id, _ in kept],
+                                    task_offsets, coalition_offsets, members)
+
+    @classmethod
+    def _with_used_names(cls, satellite_id, satellite_names, task_ids, task_offsets, coalition_offsets,
+                         members, priorities=None):
+        # Only keep the names the members refer to
+        used, members = np.unique(members, return_inverse=True)
+        return cls(satellite_id, [satellite_names[i] for i in used], task_ids,
+                   task_offsets, coalition_offsets, members, priorities)
+
+    @classmethod
+    def from_dict(cls, table: Dict) -> "CompactCoalitionTable":
+        """
+        Build a table from either JSON form. Preferences are grouped by task
+        (in order of first appearance) and ranked by priority.
+        """
+        if "members" in table:
+            return cls(table["satellite"], table["satellites"], table["task_ids"], table["task_offsets"],
+                       table["coalition_offsets"], table["members"], table.get("priorities"))
+
+        by_task = {}
+        for pref in table.get("preferences", []):
+            by_task.setdefault(pref["task_id"], []).append(
+                (pref["priority"], pref["preferred_satellites"])
+            )
+        name_pos = {}
+        task_offsets, coalition_offsets, members, priorities = [0], [0], [], []
+        for ranked in by_task.values():
+            ranked.sort(key=lambda entry: entry[0])
+            for priority, names in ranked:
+                priorities.append(priority)
+                members.extend(name_pos.setdefault(name, len(name_pos)) for name in names)
+                coalition_offsets.append(len(members))
+            task_offsets.append(len(priorities))
+
+        ranks = np.arange(len(priorities)) - np.repeat(task_offsets[:-1], np.diff(task_offsets)) + 1
+        contiguous = np.array_equal(ranks, priorities)
+        return cls(table["satellite"], list(name_pos), list(by_task), task_offsets, coalition_offsets,
+                   members, None if contiguous else priorities)
+
+    @classmethod
+    def from_table(cls, table: CoalitionTable) -> "CompactCoalitionTable":
+        """Build from a CoalitionTable."""
+        return cls.from_dict(table.to_dict())
+
+    def __len__(self):
+        return len(self.coalition_offsets) - 1
+
+    def __contains__(self, task_id):
+        return task_id in self._task_pos
+
+    def num_coalitions(self, task_id) -> int:
+        """Number of coalitions for a task (0 if it has none)."""
+        pos = self._task_pos.get(task_id)
+        if pos is None:
+            return 0
+        return int(self.task_offsets[pos + 1] - self.task_offsets[pos])
+
+    def coalition(self, task_id, rank: int) -> List[str] | None:
+        """
+        The task's coalition at `rank` (0 = best), or None past the last one.
+        Constant time, so a strategy moves to the next candidate by rank + 1.
+        """
+        pos = self._task_pos.get(task_id)
+        if pos is None:
+            return None
+        idx = self.task_offsets[pos] + rank
+        if rank < 0 or idx >= self.task_offsets[pos + 1]:
+            return None
+        lo, hi = self.coalition_offsets[idx], self.coalition_offsets[idx + 1]
+        return [self.satellite_names[m] for m in self.members[lo:hi]]
+
+    def candidates(self, task_id):
+        """Iterate the task's coalitions (lists of partner names), best first."""
+        rank = 0
+        coalition = self.coalition(task_id, rank)
+        while coalition is not None:
+            yield coalition
+            rank += 1
+            coalition = self.coalition(task_id, rank)
+
+    def priority(self, task_id, rank: int) -> int:
+        """Priority of the task's coalition at `rank`."""
+        if self.priorities is None:
+            return rank + 1
+        return int(self.priorities[self.task_offsets[self._task_pos[task_id]] + rank])
+
+    def get_preferences_for_task(self, task_id) -> List[CoalitionPreference]:
+        """The coalitions for one task, in priority order."""
+        return [
+            CoalitionPreference(task_id, coalition, self.priority(task_id, rank))
+            for rank, coalition in enumerate(self.candidates(task_id))
+        ]
+
+    @property
+    def preferences(self) -> List[CoalitionPreference]:
+        """Dict-style view of every entry, as CoalitionTable.preferences."""
+        return [pref for task_id in self.task_ids for pref in self.get_preferences_for_task(task_id)]
+
+    def to_table(self) -> CoalitionTable:
+        return CoalitionTable(self.satellite_id, self.preferences)
+
+    def to_dict(self) -> Dict:
+        """The verbose JSON form, as CoalitionTable.to_dict."""
+        return {
+            "satellite": self.satellite_id,
+            "preferences": [pref.to_dict() for pref in self.preferences]
+        }
+
+    def to_compact(self) -> Dict:
+        """The compact JSON form."""
+        table = {
+            "satellite": self.satellite_id,
+            "satellites": self.satellite_names,
+            "task_ids": self.task_ids,
+            "task_offsets": self.task_offsets.tolist(),
+            "coalition_offsets": self.coalition_offsets.tolist(),
+            "members": self.members.tolist()
+        }
+        if self.priorities is not None:
+            table["priorities"] = self.priorities.tolist()
+        return table
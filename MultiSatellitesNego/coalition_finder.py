@@ -0,0 +1,238 @@
+"""
+Title: Coalition Finder
+
+Enumerates the minimal coalitions of any size that cover every time window
+of a task, so tasks with 3+ windows can be allocated to more than one
+partner.
+
+A coalition is the initiator plus one or more partners. It covers a task
+when the OR of the members' window bitmasks (FeasibilityTable.window_masks)
+has every window set, and it is minimal when no partner can be dropped.
+Only the windows the initiator can't cover itself matter, so partners are
+grouped by the part of their bitmask that is still needed:
+
+- partners that add nothing are never part of a minimal coalition,
+- partners with the same needed bits are interchangeable, so the set cover
+  search runs over the few distinct bitmasks and is only expanded into
+  satellites at the end,
+- a bitmask that adds no new window to a partial cover is pruned.
+
+Coalitions are ranked like utils.generate_coalition_table ranks partners:
+fewer partners first, then by the partners' total memory capacity
+(descending), ties by satellite list order. When the initiator covers the
+task alone, every single partner is a coalition, as in the pairwise tables.
+
+Author: Zheng Wang
+Email: wanzy133@mymail.unisa.edu.au
+Supervisor: Dr. Jianglin Qiao
+
+Date Created: 17/10/2026
+"""
+
+import heapq
+from itertools import product
+
+import numpy as np
+
+
+def minimal_mask_sets(needed, masks, max_partners=None):
+    """
+    All minimal sets of distinct bitmasks whose OR is `needed`.
+
+    Args:
+        needed (int): The windows the partners have to cover
+        masks (list): Distinct non-zero bitmasks, each a subset of `needed`
+        max_partners (int): Largest set size (no limit by default)
+
+    Returns:
+        list: Tuples of bitmasks
+    """
+    masks = sorted(masks, key=lambda mask: (-bin(mask).count("1"), mask))
+    found = []
+
+    def is_minimal(chosen):
+        for i in range(len(chosen)):
+            rest = 0
+            for j, mask in enumerate(chosen):
+                if j != i:
+                    rest |= mask
+            if rest == needed:
+                return False
+        return True
+
+    def search(start, chosen, cover):
+        if cover == needed:
+            if is_minimal(chosen):
+                found.append(tuple(chosen))
+            return
+        if max_partners is not None and len(chosen) >= max_partners:
+            return
+        for i in range(start, len(masks)):
+            # Dominated: adds no window to the partial cover
+            if masks[i] & ~cover == 0:
+                continue
+            chosen.append(masks[i])
+            search(i + 1, chosen, cover | masks[i])
+            chosen.pop()
+
+    search(0, [], 0)
+    return found
+
+
+def _coalition_key(members, capacities):
+    return (len(members), -sum(capacities[m] for m in members), tuple(sorted(members)))
+
+
+def _best_combinations(groups, capacities, limit):
+    """
+    The `limit` best ways of picking one member from each group, best first.
+    Groups are sorted best member first, so the search starts at all zeros
+    and only ever moves to worse picks.
+    """
+    start = (0,) * len(groups)
+    members = tuple(group[0] for group in groups)
+    heap = [(_coalition_key(members, capacities), start, members)]
+    seen = {start}
+    best = []
+    while heap and len(best) < limit:
+        key, idx, members = heapq.heappop(heap)
+        best.append((key, members))
+        for g in range(len(groups)):
+            if idx[g] + 1 < len(groups[g]):
+                nxt = idx[:g] + (idx[g] + 1,) + idx[g + 1:]
+                if nxt not in seen:
+                    seen.add(nxt)
+                    next_members = tuple(groups[i][j] for i, j in enumerate(nxt))
+                    heapq.heappush(heap, (_coalition_key(next_members, capacities), nxt, next_members))
+    return best
+
+
+def task_coalitions(initiator_mask, partner_masks, full, capacities, max_partners=None, max_coalitions=None):
+    """
+    Ranked minimal coalitions of one initiator for one task.
+
+    Args:
+        initiator_mask (int): The initiator's window bitmask
+        partner_masks (dict): Partner rank position -> window bitmask
+        full (int): Bitmask with every window of the task set
+        capacities (dict): Rank position -> memory capacity
+        max_partners (int): Largest number of partners in a coalition
+        max_coalitions (int): Keep at most this many coalitions
+
+    Returns:
+        list: Tuples of partner rank positions, best coalition first
+    """
+    limit = float("inf") if max_coalitions is None else max_coalitions
+    needed = full & ~initiator_mask
+
+    if needed == 0:
+        ranked = sorted(partner_masks)
+        return [(p,) for p in ranked[:max_coalitions]]
+
+    # Partners grouped by the windows they add, best (lowest rank position) first
+    by_mask = {}
+    for p in sorted(partner_masks):
+        useful = partner_masks[p] & needed
+        if useful:
+            by_mask.setdefault(useful, []).append(p)
+
+    ranked = []
+    for mask_set in minimal_mask_sets(needed, list(by_mask), max_partners):
+        groups = [by_mask[mask] for mask in mask_set]
+        if max_coalitions is None:
+            ranked.extend((_coalition_key(m, capacities), m) for m in product(*groups))
+        else:
+            ranked.extend(_best_combinations(groups, capacities, limit))
+    ranked.sort()
+    if max_coalitions is not None:
+        ranked = ranked[:max_coalitions]
+    return [tuple(sorted(members)) for _, members in ranked]
+
+
+def find_coalitions(table, memory_capacities, initiator_idx, max_partners=None, max_coalitions=None):
+    """
+    Ranked minimal coalitions of one initiator for every task of a FeasibilityTable.
+
+    Args:
+        table (FeasibilityTable): Coverage of the tasks
+        memory_capacities (list): Memory capacity per satellite of the table
+        initiator_idx (int): The initiator's position in the table
+        max_partners (int): Largest number of partners in a coalition
+        max_coalitions (int): Keep at most this many coalitions per task
+
+    Returns:
+        list: Per task, a list of tuples of partner satellite indices, best first
+    """
+    return find_all_coalitions(table, memory_capacities, [initiator_idx], max_partners, max_coalitions)[initiator_idx]
+
+
+def find_all_coalitions(table, memory_capacities, initiators=None, max_partners=None, max_coalitions=None,
+                        task_indices=None):
+    """
+    find_coalitions for several initiators, sharing the work between them.
+
+    The initiator never adds a window it still needs, so it can't be part of
+    its own coalitions and they only depend on its bitmask: each task's
+    search runs once per distinct initiator bitmask. Only the "initiator
+    covers the task alone" case, where every other satellite is listed,
+    has to drop the initiator itself.
+
+    Args:
+        initiators (list): Satellite indices of the initiators (all by default)
+        task_indices (list): Only search these tasks (all by default)
+
+    Returns:
+        dict: initiator index -> find_coalitions output, one entry per task searched
+    """
+    masks = table.window_masks()
+    full = table.full_window_masks()
+    memory_capacities = np.asarray(memory_capacities)
+    # Stable sort keeps the satellite list order for equal capacities
+    rank_order = np.argsort(-memory_capacities, kind="stable").tolist()
+    capacities = {pos: memory_capacities[sat] for pos, sat in enumerate(rank_order)}
+    rank_of = {sat: pos for pos, sat in enumerate(rank_order)}
+    if initiators is None:
+        initiators = range(len(rank_order))
+    coalitions = {idx: [] for idx in initiators}
+
+    if task_indices is None:
+        task_indices = range(len(full))
+
+    for task_idx in task_indices:
+        task_full = int(full[task_idx])
+        partner_masks = {pos: int(masks[task_idx, sat]) for pos, sat in enumerate(rank_order)}
+        solo = None
+        by_initiator_mask = {}
+        for idx in coalitions:
+            initiator_mask = int(masks[task_idx, idx])
+            if task_full & ~initiator_mask == 0:
+                if solo is None:
+                    solo = [(sat,) for sat in rank_order]
+                pos = rank_of[idx]
+                ranked = (solo[:pos] + solo[pos + 1:])[:max_coalitions]
+            else:
+                ranked = by_initiator_mask.get(initiator_mask)
+                if ranked is None:
+                    ranked = [
+                        tuple(rank_order[pos] for pos in members)
+                        for members in task_coalitions(initiator_mask, partner_masks, task_full,
+                                                       capacities, max_partners, max_coalitions)
+                    ]
+                    by_initiator_mask[initiator_mask] = ranked
+            coalitions[idx].append(ranked)
+    return coalitions
+
+
+def coalition_table_from_coalitions(table, initiator_name, coalitions):
+    """
+    Turn find_coalitions output into a coalition table dict.
+    """
+    preferences = []
+    for task_idx, ranked in enumerate(coalitions):
+        for priority, members in enumerate(ranked, start=1):
+            preferences.append({
+                "task_id": table.task_ids[task_idx],
+                "preferred_satellites": [table.satellite_names[m] for m in members],
+                "priority": priority
+            })
+    return {"satellite": initiator_name, "preferences": preferences}
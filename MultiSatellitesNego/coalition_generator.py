@@ -0,0 +1,94 @@
+"""
+Title: Coalition Generator
+
+Builds every satellite's coalition table for a set of tasks.
+
+With availability information the tables are derived from the coverage
+(pairs that together cover every time window of a task, partners ranked by
+memory capacity, as utils.generate_coalition_table does). Without it, as
+for the API's freshly created satellites, every other satellite is a
+candidate partner in a seeded random order.
+
+Author: Zheng Wang
+Email: wanzy133@mymail.unisa.edu.au
+Supervisor: Dr. Jianglin Qiao
+
+Date Created: 17/10/2026
+"""
+
+import numpy as np
+
+from .coalition import CoalitionPreference, CoalitionTable, CompactCoalitionTable
+from .coverage import compute_feasibility
+from .feasibility_cache import build_coalition_tables, derive_coalition_candidates
+
+
+def _task_id(task):
+    return task["id"] if isinstance(task, dict) else task.id
+
+
+def generate_coalition_table_dicts(tasks, satellites):
+    """
+    Coverage-based coalition tables in the scenario JSON format.
+
+    Args:
+        tasks (list): Task dicts
+        satellites (list): Satellite dicts with availability
+
+    Returns:
+        dict: satellite name -> {"satellite": ..., "preferences": [...]}
+    """
+    table = compute_feasibility(tasks, satellites)
+    memory_capacities = [sat.get("memory_capacity", 0) for sat in satellites]
+    candidates = derive_coalition_candidates(table, memory_capacities)
+    return build_coalition_tables(table, candidates, memory_capacities)
+
+
+def generate_coalition_tables(tasks, all_satellites, satellites=None, seed=None, max_coalitions=None):
+    """
+    Generate a CoalitionTable for every satellite.
+
+    Args:
+        tasks (list): Task objects or dicts
+        all_satellites (list): Satellite names
+        satellites (list): Satellite dicts with availability; when given the
+                           tables are derived from the coverage
+        seed (int): Seed for the random partner order used without availability
+        max_coalitions (int): Keep at most this many coalitions per task (all by default)
+
+    Returns:
+        dict: satellite name -> CoalitionTable
+    """
+    if satellites is not None:
+        task_dicts = [task if isinstance(task, dict) else vars(task) for task in tasks]
+        tables = {
+            name: CoalitionTable.from_dict(table)
+            for name, table in generate_coalition_table_dicts(task_dicts, satellites).items()
+        }
+        if max_coalitions is not None:
+            for table in tables.values():
+                table.preferences = [pref for pref in table.preferences if pref.priority <= max_coalitions]
+        return tables
+
+    rng = np.random.default_rng(seed)
+    n_sats = len(all_satellites)
+    n_partners = n_sats - 1 if max_coalitions is None else min(max_coalitions, n_sats - 1)
+    task_ids = [_task_id(task) for task in tasks]
+
+    tables = {}
+    for initiator_idx, initiator in enumerate(all_satellites):
+        others = np.delete(np.arange(n_sats), initiator_idx)
+        # One random partner order per task, drawn in one call
+        orders = rng.permuted(np.tile(others, (len(task_ids), 1)), axis=1)[:, :n_partners]
+        table = CoalitionTable(initiator)
+        for task_id, order in zip(task_ids, orders.tolist()):
+            table.preferences.extend(
+                CoalitionPreference(task_id, [all_satellites[partner]], priority)
+                for priority, partner in enumerate(order, start=1)
+            )
+        tables[initiator] = table
+    return tables
+
+
+__all__ = ['generate_coalition_tables', 'generate_coalition_table_dicts', 'CoalitionTable', 'CoalitionPreference',
+           'CompactCoalitionTable']
@@ -0,0 +1,187 @@
+"""
+Title: Coalition Table Service
+
+Keeps every satellite's coalition table up to date as single satellites
+change, without rebuilding all tables.
+
+A task's preferences only depend on the window bitmasks of the satellites
+(coverage.FeasibilityTable.window_masks) and on the partners' memory
+capacity ranking. So:
+
+- an availability change only affects the tasks whose window bitmask of the
+  changed satellite differs,
+- a memory capacity change only reorders the partners of tasks the satellite
+  can be a partner in, i.e. tasks where it covers a window or where some
+  other satellite covers the task alone (then every satellite is listed).
+
+Only those tasks are searched again, for every initiator, and each update
+returns a diff of the preference entries that were added, removed or moved
+to another priority.
+
+Author: Zheng Wang
+Email: wanzy133@mymail.unisa.edu.au
+Supervisor: Dr. Jianglin Qiao
+
+Date Created: 17/10/2026
+"""
+
+import numpy as np
+
+from .coalition_finder import coalition_table_from_coalitions, find_all_coalitions
+from .coverage import compute_feasibility
+
+
+def preference_diff(initiator_name, task_id, old, new, names=None):
+    """
+    Difference between two ranked coalition lists of one initiator and task.
+
+    Args:
+        old (list): Coalitions before the change, best first (tuples of members)
+        new (list): Coalitions after the change
+        names (list): Satellite names, when the members are satellite indices
+
+    Returns:
+        dict: {"satellite", "task_id", "added", "removed", "reprioritised"},
+              or None if nothing changed
+    """
+    if old == new:
+        return None
+
+    def members_list(members):
+        return [names[m] for m in members] if names is not None else list(members)
+
+    old_priority = {members: priority for priority, members in enumerate(old, start=1)}
+    added, reprioritised = [], []
+    for priority, members in enumerate(new, start=1):
+        before = old_priority.pop(members, None)
+        if before is None:
+            added.append({"preferred_satellites": members_list(members), "priority": priority})
+        elif before != priority:
+            reprioritised.append({
+                "preferred_satellites": members_list(members),
+                "old_priority": before,
+                "new_priority": priority
+            })
+    # Whatever is left was not in the new list
+    removed = [
+        {"preferred_satellites": members_list(members), "priority": priority}
+        for members, priority in old_priority.items()
+    ]
+    return {
+        "satellite": initiator_name,
+        "task_id": task_id,
+        "added": added,
+        "removed": removed,
+        "reprioritised": reprioritised
+    }
+
+
+class CoalitionTableService:
+    """
+    Coalition tables of all satellites of a scenario, updated incrementally.
+    """
+
+    def __init__(self, tasks, satellites, max_partners=1, max_coalitions=None, feasibility=None):
+        """
+        Args:
+            tasks (list): Task dicts
+            satellites (list): Satellite dicts, updated in place by the service
+            max_partners (int): Largest number of partners per coalition (None for any)
+            max_coalitions (int): Keep at most this many coalitions per task
+            feasibility: FeasibilityTable or feasibility_cache.FeasibilityCache
+                         of the scenario (computed when not given)
+        """
+        self.tasks = tasks
+        self.satellites = satellites
+        self.max_partners = max_partners
+        self.max_coalitions = max_coalitions
+        if feasibility is None:
+            self.table = compute_feasibility(tasks, satellites)
+        else:
+            # The service changes the table, so never share a cache's copy
+            table = getattr(feasibility, "table", feasibility)
+            self.table = table.subset(tasks, satellites)
+        self._sat_pos = {sat["name"]: i for i, sat in enumerate(satellites)}
+        # initiator index -> per task, ranked tuples of partner indices
+        self._coalitions = self._search()
+
+    def _memory_capacities(self):
+        return [sat.get("memory_capacity", 0) for sat in self.satellites]
+
+    def _search(self, task_indices=None):
+        return find_all_coalitions(
+            self.table, self._memory_capacities(), None,
+            self.max_partners, self.max_coalitions, task_indices
+        )
+
+    def coalition_table(self, satellite_name):
+        """The satellite's coalition table in the scenario JSON format."""
+        return coalition_table_from_coalitions(
+            self.table, satellite_name, self._coalitions[self._sat_pos[satellite_name]]
+        )
+
+    def coalition_tables(self):
+        """satellite name -> coalition table, in satellite order."""
+        return {sat["name"]: self.coalition_table(sat["name"]) for sat in self.satellites}
+
+    def update_satellite(self, satellite_name, availability_matrix=None, memory_capacity=None):
+        """
+        Apply a change to one satellite and update the affected preferences.
+
+        Args:
+            satellite_name (str): The satellite that changed
+            availability_matrix (list): Its new availability, if it changed
+            memory_capacity (int): Its new memory capacity, if it changed
+
+        Returns:
+            list: preference_diff entries of every changed (initiator, task)
+
+        Raises:
+            KeyError: If the satellite is not part of the scenario
+        """
+        sat_idx = self._sat_pos[satellite_name]
+        satellite = self.satellites[sat_idx]
+        masks = self.table.window_masks()
+        affected = np.zeros(len(self.tasks), dtype=bool)
+
+        if memory_capacity is not None and memory_capacity != satellite.get("memory_capacity", 0):
+            satellite["memory_capacity"] = memory_capacity
+            full = self.table.full_window_masks()
+            others = np.delete(masks, sat_idx, axis=1)
+            covered_alone = (others == full[:, None]).any(axis=1)
+            affected |= (masks[:, sat_idx] != 0) | covered_alone
+
+        if availability_matrix is not None:
+            for key in ("availability_row", "availability_runs", "availability_slots"):
+                satellite.pop(key, None)
+            satellite["availability_matrix"] = availability_matrix
+            first_slot = compute_feasibility(self.tasks, [satellite]).first_slot[:, :, 0]
+            affected[self.table.update_satellite(sat_idx, first_slot)] = True
+
+        return self._refresh(np.flatnonzero(affected).tolist())
+
+    def update_availability(self, satellite_name, availability_matrix):
+        """update_satellite for an availability change."""
+        return self.update_satellite(satellite_name, availability_matrix=availability_matrix)
+
+    def update_memory_capacity(self, satellite_name, memory_capacity):
+        """update_satellite for a memory capacity change."""
+        return self.update_satellite(satellite_name, memory_capacity=memory_capacity)
+
+    def _refresh(self, task_indices):
+        if not task_indices:
+            return []
+        found = self._search(task_indices)
+        names = self.table.satellite_names
+        diff = []
+        for initiator_idx, per_task in found.items():
+            coalitions = self._coalitions[initiator_idx]
+            for task_idx, new in zip(task_indices, per_task):
+                old = coalitions[task_idx]
+                if old == new:
+                    continue
+                coalitions[task_idx] = new
+                diff.append(preference_diff(
+                    names[initiator_idx], self.table.task_ids[task_idx], old, new, names
+                ))
+        return diff
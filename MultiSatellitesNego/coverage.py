@@ -0,0 +1,290 @@
+"""
+Title: Coverage Kernel
+
+Vectorised backend for the coverage helpers in utils.py.
+
+All satellites' availability matrices are stacked into one
+(n_satellites, n_slots) integer array, so the question "which satellites see
+location L in slots [a, b)" is answered with array masks for every task
+window at once instead of Python loops over slots and satellites.
+
+Author: Zheng Wang
+Email: wanzy133@mymail.unisa.edu.au
+Supervisor: Dr. Jianglin Qiao
+
+Date Created: 17/10/2026
+"""
+
+import numpy as np
+
+# Each availability slot covers 15 minutes, i.e. 4 slots per hour
+SLOTS_PER_HOUR = 4
+
+# Marker used in the feasibility tensor for "no coverage"
+NO_COVERAGE = -1
+
+
+def window_slots(window):
+    """
+    Convert a task time window (in hours) into a half-open slot range.
+
+    Args:
+        window (dict): {"start_time": X, "end_time": Y}
+
+    Returns:
+        tuple: (start_slot, end_slot)
+    """
+    return window["start_time"] * SLOTS_PER_HOUR, window["end_time"] * SLOTS_PER_HOUR
+
+
+def group_windows_by_location(tasks):
+    """
+    Group every task time window by the task's location.
+
+    Returns:
+        dict: location -> ([task_idx], [window_idx], [start_slot], [end_slot])
+    """
+    windows_by_location = {}
+    for task_idx, task in enumerate(tasks):
+        entry = windows_by_location.setdefault(int(task["location_index"]), ([], [], [], []))
+        for window_idx, window in enumerate(task["time_window"]):
+            start_slot, end_slot = window_slots(window)
+            entry[0].append(task_idx)
+            entry[1].append(window_idx)
+            entry[2].append(start_slot)
+            entry[3].append(end_slot)
+    return windows_by_location
+
+
+class FeasibilityTable:
+    """
+    Satellite x task x time window feasibility.
+
+    first_slot[t, w, s] is the earliest slot of time window w of task t in
+    which satellite s sees the task's location, or NO_COVERAGE if it never
+    does. Windows beyond a task's own number of windows are NO_COVERAGE.
+    """
+
+    def __init__(self, task_ids, satellite_names, num_windows, first_slot):
+        self.task_ids = list(task_ids)
+        self.satellite_names = list(satellite_names)
+        self.num_windows = np.asarray(num_windows, dtype=np.int32)
+        self.first_slot = first_slot
+        # Positions by task id (the first of duplicates, as list.index) and satellite name
+        self.task_pos = {}
+        for i, task_id in enumerate(self.task_ids):
+            self.task_pos.setdefault(task_id, i)
+        self.sat_pos = {name: i for i, name in enumerate(self.satellite_names)}
+
+    @property
+    def covered(self):
+        """Boolean (n_tasks, max_windows, n_satellites) coverage tensor."""
+        return self.first_slot >= 0
+
+    def __contains__(self, satellite_name):
+        return satellite_name in self.sat_pos
+
+    def window_masks(self):
+        """
+        Bitmask of the windows each satellite covers, bit w set for window w.
+
+        Returns:
+            np.ndarray: (n_tasks, n_satellites) uint64 (Python ints beyond 63 windows)
+        """
+        if getattr(self, "_window_masks", None) is None:
+            max_windows = self.first_slot.shape[1]
+            if max_windows < 64:
+                bits = np.left_shift(np.uint64(1), np.arange(max_windows, dtype=np.uint64))
+            else:
+                bits = np.array([1 << w for w in range(max_windows)], dtype=object)
+            self._window_masks = (self.covered * bits[None, :, None]).sum(axis=1)
+        return self._window_masks
+
+    def update_satellite(self, sat_idx, first_slot):
+        """
+        Replace one satellite's coverage, e.g. after its availability changed.
+
+        Args:
+            sat_idx (int): The satellite's position in the table
+            first_slot (np.ndarray): (n_tasks, max_windows) earliest covered slots
+
+        Returns:
+            np.ndarray: Indices of the tasks whose window bitmask changed
+        """
+        old_masks = self.window_masks()[:, sat_idx].copy()
+        self.first_slot[:, :, sat_idx] = first_slot
+        self._window_masks = None
+        return np.flatnonzero(self.window_masks()[:, sat_idx] != old_masks)
+
+    def full_window_masks(self):
+        """
+        The mask with every window of each task set; a group of satellites
+        fully covers task t when the OR of their masks equals full[t].
+
+        Returns:
+            np.ndarray: (n_tasks,) masks, same dtype as window_masks
+        """
+        masks = self.window_masks()
+        if masks.dtype == object:
+            return np.array([(1 << int(n)) - 1 for n in self.num_windows], dtype=object)
+        return np.left_shift(np.uint64(1), self.num_windows.astype(np.uint64)) - np.uint64(1)
+
+    def subset(self, tasks, satellites):
+        """
+        Restrict the table to `tasks` and `satellites`, in their order.
+
+        Raises:
+            KeyError: If a task or satellite is not in the table, or a task's
+                number of time windows does not match
+        """
+        task_idx = [self.task_pos[task["id"]] for task in tasks]
+        sat_idx = [self.sat_pos[sat["name"]] for sat in satellites]
+        num_windows = [len(task["time_window"]) for task in tasks]
+        if any(self.num_windows[i] != n for i, n in zip(task_idx, num_windows)):
+            raise KeyError("time windows differ from the cached table")
+
+        max_windows = max(num_windows, default=0)
+        first_slot = self.first_slot[np.ix_(task_idx, range(max_windows), sat_idx)]
+        return FeasibilityTable([t["id"] for t in tasks], [s["name"] for s in satellites], num_windows, first_slot)
+
+    @staticmethod
+    def _position(positions, key):
+        """Position of a task id or satellite name; ValueError if missing, as list.index."""
+        try:
+            return positions[key]
+        except KeyError:
+            raise ValueError(f"{key!r} is not in the table") from None
+
+    def is_available(self, satellite_name, task):
+        """
+        Index of the first time window of `task` the satellite covers, or -1.
+        Same contract as utils.is_satellite_available_for_task.
+        """
+        task_idx = self._position(self.task_pos, task["id"])
+        sat_idx = self._position(self.sat_pos, satellite_name)
+        covered = np.flatnonzero(self.first_slot[task_idx, :, sat_idx] >= 0)
+        return int(covered[0]) if covered.size else -1
+
+    def coalition_covers(self, task, satellite_names):
+        """
+        Whether the satellites together cover every time window of `task`.
+
+        Raises:
+            ValueError: If the task or a satellite is not in the table
+        """
+        task_idx = self._position(self.task_pos, task["id"])
+        sat_idx = [self._position(self.sat_pos, name) for name in satellite_names]
+        covered = self.covered[task_idx, :self.num_windows[task_idx]][:, sat_idx]
+        return bool(covered.any(axis=1).all())
+
+    def covering_satellites(self, task_idx, window_idx):
+        """Names of the satellites covering one window of one task."""
+        mask = self.first_slot[task_idx, window_idx] >= 0
+        return [self.satellite_names[i] for i in np.flatnonzero(mask)]
+
+    def earliest_coverage(self, task_idx, window_idx):
+        """
+        Find the earliest covered slot of a window and the first satellite
+        (in satellite list order) covering it.
+
+        Returns:
+            tuple: (slot, satellite_name), or (None, None) if not covered
+        """
+        slots = self.first_slot[task_idx, window_idx]
+        covered = slots >= 0
+        if not covered.any():
+            return None, None
+        first = slots[covered].min()
+        sat_idx = int(np.argmax(slots == first))
+        return int(first), self.satellite_names[sat_idx]
+
+
+class CoverageKernel:
+    """
+    Stacks the availability matrices of a list of satellites into one
+    (n_satellites, n_slots) array and answers coverage queries with masks.
+    """
+
+    def __init__(self, satellites):
+        self.satellite_names = [sat["name"] for sat in satellites]
+        rows = [np.asarray(sat["availability_matrix"], dtype=np.int32) for sat in satellites]
+        n_slots = max((len(row) for row in rows), default=0)
+
+        # Shorter matrices are padded with 0 (no coverage)
+        self.matrix = np.zeros((len(rows), n_slots), dtype=np.int32)
+        for i, row in enumerate(rows):
+            self.matrix[i, :len(row)] = row
+
+    @property
+    def n_slots(self):
+        return self.matrix.shape[1]
+
+    def window_mask(self, location, start_slot, end_slot):
+        """
+        Boolean mask over satellites that see `location` in slots [start_slot, end_slot).
+        """
+        return (self.matrix[:, start_slot:end_slot] == location).any(axis=1)
+
+    def _next_hit(self, location):
+        """
+        For every satellite and slot, the index of the next slot (inclusive)
+        in which the satellite sees `location`, or n_slots if there is none.
+
+        The extra last column lets windows starting at n_slots be looked up.
+        """
+        n_sats, n_slots = self.matrix.shape
+        slot_idx = np.where(self.matrix == location, np.arange(n_slots), n_slots)
+        next_hit = np.full((n_sats, n_slots + 1), n_slots, dtype=np.int64)
+        if n_slots:
+            next_hit[:, :n_slots] = np.minimum.accumulate(slot_idx[:, ::-1], axis=1)[:, ::-1]
+        return next_hit
+
+    def feasibility(self, tasks):
+        """
+        Compute the feasibility tensor for a list of tasks.
+
+        Windows are grouped by location so each distinct location costs one
+        pass over the stacked matrix, and all windows at that location are
+        resolved with a single fancy-indexing lookup.
+
+        Args:
+            tasks (list): Task dicts with 'id', 'location_index' and 'time_window'
+
+        Returns:
+            FeasibilityTable
+        """
+        n_sats, n_slots = self.matrix.shape
+        num_windows = [len(task["time_window"]) for task in tasks]
+        max_windows = max(num_windows, default=0)
+        first_slot = np.full((len(tasks), max_windows, n_sats), NO_COVERAGE, dtype=np.int32)
+
+        windows_by_location = group_windows_by_location(tasks)
+
+        if n_sats == 0:
+            return FeasibilityTable([t["id"] for t in tasks], self.satellite_names, num_windows, first_slot)
+
+        for location, (task_idx, window_idx, starts, ends) in windows_by_location.items():
+            if not task_idx:
+                continue
+            next_hit = self._next_hit(location)
+            starts = np.clip(np.asarray(starts), 0, n_slots)
+            ends = np.minimum(np.asarray(ends), n_slots)
+            # (n_sats, n_windows_at_location)
+            hits = next_hit[:, starts]
+            hits = np.where(hits < ends, hits, NO_COVERAGE)
+            first_slot[task_idx, window_idx, :] = hits.T
+
+        return FeasibilityTable([t["id"] for t in tasks], self.satellite_names, num_windows, first_slot)
+
+
+def compute_feasibility(tasks, satellites):
+    """
+    Convenience wrapper: build a kernel for `satellites` and evaluate `tasks`.
+    Satellites stored as availability runs are evaluated on the runs directly.
+    """
+    # Imported here as availability_runs builds on this module
+    from .availability_runs import RunCoverageKernel, has_dense_availability
+
+    if all(has_dense_availability(sat) for sat in satellites):
+        return CoverageKernel(satellites).feasibility(tasks)
+    return RunCoverageKernel(satellites).feasibility(tasks)
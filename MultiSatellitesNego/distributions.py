@@ -0,0 +1,72 @@
+"""
+Title: Scenario Distributions
+
+Configurable value distributions for the scenario generators. A
+distribution is a small dict, e.g.
+
+    {"dist": "uniform", "low": 300, "high": 1700}
+    {"dist": "normal", "mean": 1000, "std": 300, "low": 150, "high": 3000}
+    {"dist": "choice", "values": [2, 3], "p": [0.7, 0.3]}
+    {"dist": "constant", "value": 2}
+
+and is sampled for a whole scenario at once. Uniform bounds are inclusive
+and normal samples are clipped to [low, high] when given. All samples are
+rounded to integers.
+
+Author: Zheng Wang
+Email: wanzy133@mymail.unisa.edu.au
+Supervisor: Dr. Jianglin Qiao
+
+Date Created: 17/10/2026
+"""
+
+import numpy as np
+
+# Defaults match the ranges of the hand-made setups in saved_data/
+DEFAULT_DISTRIBUTIONS = {
+    "reward_points": {"dist": "uniform", "low": 300, "high": 1700},
+    "memory_required": {"dist": "uniform", "low": 150, "high": 3000},
+    "memory_capacity": {"dist": "uniform", "low": 800, "high": 3500},
+    # Number of time windows per task
+    "windows_per_task": {"dist": "choice", "values": [2, 3], "p": [0.8, 0.2]},
+    # Length of each time window in hours
+    "window_length": {"dist": "choice", "values": [1, 2, 3]}
+}
+
+
+def sample_values(rng, spec, size):
+    """
+    Draw `size` integer samples from a distribution spec.
+
+    Args:
+        rng (np.random.Generator): Random generator
+        spec (dict): Distribution spec (see module docstring)
+        size (int): Number of samples
+
+    Returns:
+        np.ndarray: int64 samples
+
+    Raises:
+        ValueError: If the distribution is unknown
+    """
+    dist = spec.get("dist", "uniform")
+    if dist == "uniform":
+        values = rng.integers(spec["low"], spec["high"], size=size, endpoint=True)
+    elif dist == "normal":
+        values = np.rint(rng.normal(spec["mean"], spec["std"], size=size))
+        if "low" in spec or "high" in spec:
+            values = np.clip(values, spec.get("low"), spec.get("high"))
+    elif dist == "choice":
+        values = rng.choice(np.asarray(spec["values"]), size=size, p=spec.get("p"))
+    elif dist == "constant":
+        values = np.full(size, spec["value"])
+    else:
+        raise ValueError(f"Unknown distribution: {dist}")
+    return np.asarray(values, dtype=np.int64)
+
+
+def merge_distributions(distributions=None):
+    """DEFAULT_DISTRIBUTIONS overridden by `distributions`."""
+    merged = dict(DEFAULT_DISTRIBUTIONS)
+    merged.update(distributions or {})
+    return merged
@@ -0,0 +1,393 @@
+"""
+Title: Feasibility Cache
+
+Persists the satellite x task x time window feasibility tensor and the
+derived pairwise coalition candidates of a scenario in a sidecar file next
+to it, e.g. saved_data/20t20s.json -> saved_data/20t20s.feas.npz.
+
+The sidecar is keyed by a content hash of the parts of the scenario the
+coverage depends on (tasks' locations and windows, satellites' names,
+memory capacities and availability matrices). A stale sidecar is rebuilt
+automatically, and nothing is loaded or computed until it is first needed,
+so repeated runs on the same setup skip the coverage phase entirely.
+
+Author: Zheng Wang
+Email: wanzy133@mymail.unisa.edu.au
+Supervisor: Dr. Jianglin Qiao
+
+Date Created: 17/10/2026
+"""
+
+import hashlib
+import json
+import os
+from multiprocessing import Pool
+
+import numpy as np
+
+from .availability_runs import satellite_runs
+from .availability_store import is_store_backed
+from .coalition import CompactCoalitionTable
+from .coalition_finder import coalition_table_from_coalitions, find_all_coalitions
+from .coverage import FeasibilityTable, NO_COVERAGE, compute_feasibility
+
+# Bump when the sidecar layout changes so old files are rebuilt
+CACHE_VERSION = 2
+
+
+def sidecar_path(json_file):
+    """saved_data/20t20s.json -> saved_data/20t20s.feas.npz"""
+    root, _ = os.path.splitext(json_file)
+    return f"{root}.feas.npz"
+
+
+def scenario_hash(data):
+    """
+    Content hash of everything the feasibility tensor and the coalition
+    candidates depend on. Availability is hashed as runs, so dense and
+    run-length-encoded copies of the same scenario share a sidecar.
+    Satellites backed by a binary store are keyed by the store's digest and
+    their row, so hashing never reads the store.
+    """
+    store = data.get("availability_store")
+
+    def availability_key(sat):
+        if store is not None and is_store_backed(sat):
+            return [store["sha256"], sat["availability_row"]]
+        return satellite_runs(sat).tolist()
+
+    content = {
+        "version": CACHE_VERSION,
+        "tasks": [
+            [task["id"], int(task["location_index"]), task["time_window"]]
+            for task in data["tasks"]
+        ],
+        "satellites": [
+            [sat["name"], sat.get("memory_capacity", 0), availability_key(sat)]
+            for sat in data["satellites"]
+        ]
+    }
+    encoded = json.dumps(content, sort_keys=True, separators=(",", ":")).encode()
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def derive_coalition_candidates(table, memory_capacities):
+    """
+    Find every (initiator, task, partner) triple where the pair fully covers
+    all time windows of the task, with partners ranked by memory capacity
+    (descending) as generate_coalition_table does.
+
+    A pair covers a task when the OR of their window bitmasks has every
+    window set. Satellites with the same bitmask are interchangeable, so
+    each task only compares its few distinct bitmasks and expands the
+    compatible groups.
+
+    Returns:
+        np.ndarray: (n_candidates, 3) array of (initiator_idx, task_idx, partner_idx),
+                    sorted by initiator, then task, then partner rank
+    """
+    masks = table.window_masks()
+    full = table.full_window_masks()
+    memory_capacities = np.asarray(memory_capacities)
+    # Stable sort keeps the satellite list order for equal capacities
+    rank_order = np.argsort(-memory_capacities, kind="stable")
+    rank_of = np.empty_like(rank_order)
+    rank_of[rank_order] = np.arange(len(rank_order))
+
+    candidates = []
+    for task_idx in range(len(full)):
+        values, groups = np.unique(masks[task_idx, rank_order], return_inverse=True)
+        # compatible[a, b]: a satellite with bitmask values[a] and one with values[b] cover the task
+        compatible = (values[:, None] | values[None, :]) == full[task_idx]
+        for group in np.flatnonzero(compatible.any(axis=1)):
+            # Rank positions of the initiators in this group and of their possible partners
+            initiators = np.flatnonzero(groups == group)
+            partners = np.flatnonzero(compatible[group][groups])
+            init_pos = np.repeat(initiators, len(partners))
+            partner_pos = np.tile(partners, len(initiators))
+            keep = init_pos != partner_pos
+            candidates.append(np.stack([
+                rank_order[init_pos[keep]],
+                np.full(keep.sum(), task_idx),
+                rank_order[partner_pos[keep]]
+            ], axis=1))
+
+    if not candidates:
+        return np.zeros((0, 3), dtype=np.int32)
+    candidates = np.concatenate(candidates)
+    order = np.lexsort((rank_of[candidates[:, 2]], candidates[:, 1], candidates[:, 0]))
+    return candidates[order].astype(np.int32)
+
+
+def candidate_coalition_table(table, candidates, initiator_name):
+    """
+    Turn the initiator's coalition candidates into its coalition table.
+
+    Args:
+        table (FeasibilityTable): The table the candidates were derived from
+        candidates (np.ndarray): Output of derive_coalition_candidates
+        initiator_name (str): The initiator satellite
+
+    Returns:
+        dict: {"satellite": ..., "preferences": [...]} as in the scenario files
+    """
+    initiator_idx = table.satellite_names.index(initiator_name)
+    # Candidates are sorted by initiator
+    lo, hi = np.searchsorted(candidates[:, 0], [initiator_idx, initiator_idx + 1])
+    mine = candidates[lo:hi]
+
+    preferences = []
+    priority = 0
+    last_task = None
+    for _, task_idx, partner_idx in mine.tolist():
+        priority = priority + 1 if task_idx == last_task else 1
+        last_task = task_idx
+        preferences.append({
+            "task_id": table.task_ids[task_idx],
+            "preferred_satellites": [table.satellite_names[partner_idx]],
+            "priority": priority
+        })
+    return {"satellite": initiator_name, "preferences": preferences}
+
+
+def compact_candidate_table(table, candidates, initiator_name):
+    """
+    candidate_coalition_table as a CompactCoalitionTable, built straight
+    from the candidate arrays.
+    """
+    initiator_idx = table.satellite_names.index(initiator_name)
+    lo, hi = np.searchsorted(candidates[:, 0], [initiator_idx, initiator_idx + 1])
+    mine = candidates[lo:hi]
+    # Candidates are sorted by task within an initiator, so each task is one run
+    task_idx, starts = np.unique(mine[:, 1], return_index=True)
+    return CompactCoalitionTable._with_used_names(
+        initiator_name,
+        table.satellite_names,
+        [table.task_ids[t] for t in task_idx.tolist()],
+        np.append(starts, len(mine)),
+        np.arange(len(mine) + 1),
+        mine[:, 2]
+    )
+
+
+def initiator_coalition_tables(table, candidates, memory_capacities, initiators, max_partners=1,
+                               max_coalitions=None, compact=False):
+    """
+    Coalition tables of some initiators: read off the pairwise candidates
+    when max_partners is 1 and nothing is capped, enumerated with
+    coalition_finder.find_all_coalitions otherwise.
+
+    Returns:
+        list: One table per initiator index in `initiators`, a dict or with
+              `compact` a CompactCoalitionTable
+    """
+    names = table.satellite_names
+    if max_partners == 1 and max_coalitions is None:
+        to_table = compact_candidate_table if compact else candidate_coalition_table
+        return [to_table(table, candidates, names[idx]) for idx in initiators]
+    coalitions = find_all_coalitions(table, memory_capacities, initiators, max_partners, max_coalitions)
+    if compact:
+        return [
+            CompactCoalitionTable.from_coalitions(names[idx], names, table.task_ids, coalitions[idx])
+            for idx in initiators
+        ]
+    return [coalition_table_from_coalitions(table, names[idx], coalitions[idx]) for idx in initiators]
+
+
+# Per-worker state for build_coalition_tables, sent once when the pool starts
+_coalition_worker_args = None
+
+def _init_coalition_worker(table, candidates, memory_capacities, max_partners, max_coalitions, compact):
+    global _coalition_worker_args
+    _coalition_worker_args = (table, candidates, memory_capacities, max_partners, max_coalitions, compact)
+
+def _coalition_worker(initiators):
+    table, candidates, memory_capacities, max_partners, max_coalitions, compact = _coalition_worker_args
+    return initiator_coalition_tables(table, candidates, memory_capacities, initiators,
+                                      max_partners, max_coalitions, compact)
+
+
+def build_coalition_tables(table, candidates, memory_capacities, max_partners=1, max_coalitions=None,
+                           processes=None, shard_size=None, compact=False):
+    """
+    Every satellite's coalition table in one pass over the shared coverage.
+
+    The window bitmasks and pairwise candidates are computed once for all
+    initiators, and coalitions of more partners are searched once per
+    distinct initiator bitmask rather than once per initiator. With `processes` > 1 the initiators are sharded over a
+    process pool; each worker receives the coverage once.
+
+    Args:
+        table (FeasibilityTable): Coverage of the tasks
+        candidates (np.ndarray): Output of derive_coalition_candidates
+        memory_capacities (list): Memory capacity per satellite of the table
+        max_partners (int): Largest number of partners per coalition (None for any)
+        max_coalitions (int): Keep at most this many coalitions per task
+        processes (int): Worker processes (in this process by default)
+        shard_size (int): Initiators per shard (about four shards per worker by default)
+        compact (bool): Build CompactCoalitionTables instead of dicts
+
+    Returns:
+        dict: satellite name -> {"satellite": ..., "preferences": [...]}
+              (or CompactCoalitionTable), in satellite order
+    """
+    n_sats = len(table.satellite_names)
+    # Filled here so the workers inherit the bitmasks instead of recomputing them
+    table.window_masks()
+
+    if processes is not None and processes > 1 and n_sats > 1:
+        if shard_size is None:
+            shard_size = max(1, -(-n_sats // (processes * 4)))
+        shards = [range(i, min(i + shard_size, n_sats)) for i in range(0, n_sats, shard_size)]
+        with Pool(processes, initializer=_init_coalition_worker,
+                  initargs=(table, candidates, memory_capacities, max_partners, max_coalitions, compact)) as pool:
+            tables = [t for shard in pool.imap(_coalition_worker, shards) for t in shard]
+    else:
+        tables = initiator_coalition_tables(table, candidates, memory_capacities, range(n_sats),
+                                            max_partners, max_coalitions, compact)
+    return {name: t for name, t in zip(table.satellite_names, tables)}
+
+
+class FeasibilityCache:
+    """
+    Lazily loaded feasibility data for one scenario file.
+    """
+
+    def __init__(self, json_file, data):
+        self.json_file = json_file
+        self.path = sidecar_path(json_file)
+        self.data = data
+        self._table = None
+        self._candidates = None
+
+    @property
+    def table(self):
+        """The scenario's FeasibilityTable, loaded or built on first access."""
+        if self._table is None:
+            self._load_or_build()
+        return self._table
+
+    @property
+    def candidates(self):
+        """(initiator_idx, task_idx, partner_idx) coalition candidate triples."""
+        if self._candidates is None:
+            self._load_or_build()
+        return self._candidates
+
+    def __contains__(self, satellite_name):
+        return satellite_name in self.table
+
+    def subset(self, tasks, satellites):
+        return self.table.subset(tasks, satellites)
+
+    def is_available(self, satellite_name, task):
+        return self.table.is_available(satellite_name, task)
+
+    def coalition_covers(self, task, satellite_names):
+        return self.table.coalition_covers(task, satellite_names)
+
+    def _load_or_build(self):
+        digest = scenario_hash(self.data)
+        if not self._load(digest):
+            self._build()
+            self._save(digest)
+
+    def _load(self, digest):
+        if not os.path.exists(self.path):
+            return False
+        try:
+            with np.load(self.path) as npz:
+                meta = json.loads(str(npz["meta"]))
+                if meta["hash"] != digest:
+                    return False
+                first_slot = np.full(
+                    (len(meta["task_ids"]), meta["max_windows"], len(meta["satellite_names"])),
+                    NO_COVERAGE,
+                    dtype=np.int32
+                )
+                coords = npz["coords"]
+                first_slot[coords[:, 0], coords[:, 1], coords[:, 2]] = npz["first_slot"]
+                self._table = FeasibilityTable(
+                    meta["task_ids"], meta["satellite_names"], npz["num_windows"], first_slot
+                )
+                self._candidates = npz["candidates"]
+        except (OSError, KeyError, ValueError) as e:
+            print(f"Warning: Ignoring unreadable feasibility cache {self.path} - {str(e)}")
+            return False
+        return True
+
+    def _build(self):
+        tasks = self.data["tasks"]
+        satellites = self.data["satellites"]
+        self._table = compute_feasibility(tasks, satellites)
+        self._candidates = derive_coalition_candidates(
+            self._table, [sat.get("memory_capacity", 0) for sat in satellites]
+        )
+
+    def _save(self, digest):
+        table = self._table
+        coords = np.argwhere(table.first_slot >= 0).astype(np.int32)
+        meta = {
+            "hash": digest,
+            "task_ids": table.task_ids,
+            "satellite_names": table.satellite_names,
+            "max_windows": table.first_slot.shape[1]
+        }
+        try:
+            # Write to a temporary file first so readers never see a partial sidecar
+            tmp_path = f"{self.path}.tmp.npz"
+            np.savez_compressed(
+                tmp_path,
+                meta=np.array(json.dumps(meta)),
+                num_windows=table.num_windows,
+                coords=coords,
+                first_slot=table.first_slot[coords[:, 0], coords[:, 1], coords[:, 2]],
+                candidates=self._candidates
+            )
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Warning: Failed to write feasibility cache {self.path} - {str(e)}")
+
+    def memory_capacities(self):
+        return [sat.get("memory_capacity", 0) for sat in self.data["satellites"]]
+
+    def coalition_table(self, initiator_name, max_partners=1, max_coalitions=None, compact=False):
+        """
+        The initiator's coalition table, in the same format as
+        utils.generate_coalition_table.
+
+        Args:
+            initiator_name (str): The initiator satellite
+            max_partners (int): Largest number of partners per coalition; 1
+                                gives the pairwise table, None any size
+            max_coalitions (int): Keep at most this many coalitions per task
+            compact (bool): Return a CompactCoalitionTable instead of a dict
+        """
+        table = self.table
+        return initiator_coalition_tables(
+            table, self.candidates, self.memory_capacities(),
+            [table.satellite_names.index(initiator_name)], max_partners, max_coalitions, compact
+        )[0]
+
+    def coalition_tables(self, max_partners=1, max_coalitions=None, processes=None, compact=False):
+        """
+        Every satellite's coalition table, see build_coalition_tables.
+        """
+        return build_coalition_tables(
+            self.table, self.candidates, self.memory_capacities(),
+            max_partners, max_coalitions, processes, compact=compact
+        )
+
+
+def load_feasibility(json_file, data):
+    """
+    Get the (lazily loaded) feasibility cache for a scenario file.
+
+    Args:
+        json_file (str): Path of the scenario JSON file
+        data (dict): The loaded scenario
+
+    Returns:
+        FeasibilityCache
+    """
+    return FeasibilityCache(json_file, data)
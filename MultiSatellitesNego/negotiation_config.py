@@ -0,0 +1,55 @@
+"""
+Title: Negotiation Config
+
+Shared negotiation settings used by the apps: the negotiation issues, the
+default initiator/partner utility functions and the cities tasks are
+located at.
+
+Author: Zheng Wang
+Email: wanzy133@mymail.unisa.edu.au
+Supervisor: Dr. Jianglin Qiao
+
+Date Created: 17/10/2026
+"""
+
+from negmas import make_issue
+from negmas.preferences import LinearAdditiveUtilityFunction, IdentityFun
+
+# The share (in %) of the task reward and memory the initiator takes
+ISSUES = [
+    make_issue(name="initiator_reward", values=101),
+    make_issue(name="initiator_memory", values=101)
+]
+
+INITIATOR_UTILITY = LinearAdditiveUtilityFunction(
+    values={
+        "initiator_reward": IdentityFun(),
+        "initiator_memory": lambda x: (100.0 - float(x)) / 100.0,
+    },
+    weights={"reward": 1.2, "memory": 0.8},
+    issues=ISSUES
+)
+
+PARTNER_UTILITY = LinearAdditiveUtilityFunction(
+    values={
+        "initiator_reward": lambda x: (100.0 - float(x)) / 100.0,
+        "initiator_memory": lambda x: float(x) / 100.0
+    },
+    weights={"reward": 1.2, "memory": 0.8},
+    issues=ISSUES
+)
+
+# Task locations. A task at SIMPLE_CITIES[i] has location_index i + 1
+# (0 is reserved for "sees nothing" in the availability matrices).
+SIMPLE_CITIES = [
+    {"name": "Adelaide", "lat": -34.93, "lon": 138.60},
+    {"name": "Sydney", "lat": -33.87, "lon": 151.21},
+    {"name": "Melbourne", "lat": -37.81, "lon": 144.96},
+    {"name": "Perth", "lat": -31.95, "lon": 115.86},
+    {"name": "Brisbane", "lat": -27.47, "lon": 153.03},
+    {"name": "Darwin", "lat": -12.46, "lon": 130.84},
+    {"name": "Hobart", "lat": -42.88, "lon": 147.33},
+    {"name": "Singapore", "lat": 1.35, "lon": 103.82},
+    {"name": "Tokyo", "lat": 35.68, "lon": 139.69},
+    {"name": "London", "lat": 51.51, "lon": -0.13}
+]
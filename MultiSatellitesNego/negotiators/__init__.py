@@ -10,6 +10,7 @@ Supervisor: Dr. Jianglin Qiao
 Date: 14/04/2025
 """
 from .base import BaseNegotiator
+from .recorder import NegotiationRecorder, RECORDING_LEVELS
 from .v02 import NegotiatorV02
 from .v03 import NegotiatorV03
 from .v03_1 import NegotiatorV03_1
@@ -46,4 +47,4 @@ def get_negotiator(version: str) -> type[BaseNegotiator]:
         raise ValueError(f"Unknown negotiator version: {version}. Available versions: {list(NEGOTIATOR_REGISTRY.keys())}")
     return NEGOTIATOR_REGISTRY[version]
 
-__all__ = ['BaseNegotiator', 'get_negotiator', 'NEGOTIATOR_REGISTRY']
\ No newline at end of file
+__all__ = ['BaseNegotiator', 'NegotiationRecorder', 'RECORDING_LEVELS', 'get_negotiator', 'NEGOTIATOR_REGISTRY']
\ No newline at end of file
@@ -15,30 +15,188 @@ import sys
 # Add the project root to sys.path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from negmas import SAONegotiator, ResponseType, Contract, UtilityFunction
+from negmas import SAONegotiator, ResponseType, Contract, UtilityFunction, PresortingInverseUtilityFunction
 from negmas import SAOState, Outcome
 from negmas.common import MechanismState, NegotiatorMechanismInterface
 from typing import Optional, Dict, Any
 import logging
+import numpy as np
+from .recorder import NegotiationRecorder, DEFAULT_CAPACITY
+from .outcome_grid import grid_level, grid_outcomes
 from task import Task
 from satellite import Satellite
 
+
+class UtilityTable:
+    """
+    Utility of every outcome of an outcome space (or of the given outcomes)
+    under one ufun. The negotiators' ufuns and issues are class-level
+    constants, so one table per (ufun, outcome space) serves every session of
+    the process.
+    """
+
+    # Bound on the memoised selections per table
+    MAX_SELECTIONS = 4096
+
+    def __init__(self, ufun: UtilityFunction, outcome_space=None, outcomes=None):
+        self.ufun = ufun
+        self.outcomes = list(outcomes) if outcomes is not None else list(outcome_space.enumerate_or_sample())
+        self.utilities = np.array([float(ufun(outcome)) for outcome in self.outcomes])
+        self._selections = {}
+
+    def __len__(self):
+        return len(self.outcomes)
+
+    def adjusted(self, idx: int, weight: float):
+        """
+        The outcome at position idx when ranking by the adjusted utility
+        utility * weight / 4, best first with ties in enumeration order, i.e.
+        the pick of a stable sort of all outcomes, found with np.partition.
+
+        Returns:
+            tuple: (outcome, utility, adjusted utility)
+        """
+        key = (idx, weight)
+        selection = self._selections.get(key)
+        if selection is None:
+            adjusted = self.utilities * weight / 4
+            value = -np.partition(-adjusted, idx)[idx]
+            ties = np.flatnonzero(adjusted == value)
+            outcome_idx = ties[idx - np.count_nonzero(adjusted > value)]
+            selection = (self.outcomes[outcome_idx], float(self.utilities[outcome_idx]),
+                         float(adjusted[outcome_idx]))
+            if len(self._selections) >= self.MAX_SELECTIONS:
+                self._selections.clear()
+            self._selections[key] = selection
+        return selection
+
+    def _memoised(self, key, compute):
+        value = self._selections.get(key)
+        if value is None:
+            value = compute()
+            if len(self._selections) >= self.MAX_SELECTIONS:
+                self._selections.clear()
+            self._selections[key] = value
+        return value
+
+    def quantile(self, fraction: float, weight: float) -> float:
+        """The adjusted utility ranked at fraction of the table, best first, interpolated between ranks."""
+        return self._memoised(("quantile", fraction, weight), lambda: float(
+            np.quantile(self.utilities * weight / 4, 1 - fraction)
+        ))
+
+    def closest(self, target: float, weight: float):
+        """
+        The outcome whose adjusted utility is closest to target, first in
+        table order on ties, and its rank in the table.
+
+        Returns:
+            tuple: ((outcome, utility, adjusted utility), rank)
+        """
+        def compute():
+            adjusted = self.utilities * weight / 4
+            idx = int(np.argmin(np.abs(adjusted - target)))
+            rank = int(np.count_nonzero(adjusted > adjusted[idx]))
+            return (self.outcomes[idx], float(self.utilities[idx]), float(adjusted[idx])), rank
+        return self._memoised(("closest", target, weight), compute)
+
+    def above(self, threshold: float) -> list:
+        """The outcomes with a utility of at least threshold, in table order."""
+        return [self.outcomes[idx] for idx in np.flatnonzero(self.utilities >= threshold)]
+
+
+class InverseUtility:
+    """
+    A ufun's initialised PresortingInverseUtilityFunction and extreme
+    outcomes. Negotiators only read them (the inverter's some()), so every
+    negotiator using the ufun shares one instance.
+    """
+
+    def __init__(self, ufun: UtilityFunction):
+        self.ufun = ufun
+        self.inverter = PresortingInverseUtilityFunction(ufun)
+        self.inverter.init()
+        self.worst, self.best = ufun.extreme_outcomes()
+        self.min, self.max = ufun(self.worst), ufun(self.best)
+
+
+_UTILITY_TABLES = {}
+_INVERSE_UTILITIES = {}
+_GRID_TABLES = {}
+
+# Bound on the cached grid tables, one per ufun, step and region
+MAX_GRID_TABLES = 4096
+
+
+def _shared(cache: dict, ufun: UtilityFunction, outcome_space, build):
+    """The entry of a per-process cache keyed by ufun identity and outcome space."""
+    key = (id(ufun), outcome_space)
+    entry = cache.get(key)
+    # The ufun is kept in the entry, so a matching id can't be a reused one
+    if entry is None or entry.ufun is not ufun:
+        entry = build()
+        cache[key] = entry
+    return entry
+
+
+def utility_table(ufun: UtilityFunction, outcome_space) -> UtilityTable:
+    """
+    The cached UtilityTable of a ufun over an outcome space, built on first use.
+    """
+    return _shared(_UTILITY_TABLES, ufun, outcome_space, lambda: UtilityTable(ufun, outcome_space))
+
+
+def grid_table(ufun: UtilityFunction, outcome_space, steps: tuple[int, ...], centre=None) -> UtilityTable:
+    """
+    The cached UtilityTable of a ufun over grid levels of an outcome space's
+    issues (see outcome_grid.grid_outcomes), built on first use.
+    """
+    if len(_GRID_TABLES) >= MAX_GRID_TABLES:
+        _GRID_TABLES.clear()
+    grid = (outcome_space, steps, centre)
+    return _shared(_GRID_TABLES, ufun, grid, lambda: UtilityTable(
+        ufun, outcomes=grid_outcomes(outcome_space.issues, steps, centre)
+    ))
+
+
+def inverse_utility(ufun: UtilityFunction) -> InverseUtility:
+    """
+    The cached InverseUtility of a ufun over its outcome space, built on first use.
+    """
+    return _shared(_INVERSE_UTILITIES, ufun, ufun.outcome_space, lambda: InverseUtility(ufun))
+
+
 class BaseNegotiator(SAONegotiator):
     """Base class for all negotiators with common functionality."""
 
     LOGGING_ENABLED = True
 
+    # Never proposes and rejects everything while available_memory < memory_required,
+    # so strategies can skip sessions such a member is part of
+    MEMORY_GATED = True
+
+    # A session's outcome only depends on the task, the members' memory and
+    # n_steps (no randomness), so strategies may reuse it (see session_cache.py)
+    DETERMINISTIC = False
+
+    # Level and ring buffer size of the negotiation details (see recorder.py)
+    RECORDING_LEVEL = "summary"
+    RECORDING_CAPACITY = DEFAULT_CAPACITY
+
+    # Grid steps of the multi-resolution mode, coarsest first, e.g. (10, 1);
+    # None negotiates over every outcome (see outcome_grid.py)
+    OUTCOME_GRID = None
+
     def __init__(self, satellite: Satellite, task: Task, ufun: UtilityFunction | None = None):
         super().__init__(name=f"Negotiator_{satellite.name}")
         self.ufun = ufun if ufun is not None else self.ufun
         self.satellite = satellite
         self.task = task
-        self.negotiation_details = {
-            "proposals": [],
-            "responses": [],
-            "utility_calculations": [],
-            "memory_checks": []
-        }
+        self.recorder = NegotiationRecorder(self.RECORDING_LEVEL, self.RECORDING_CAPACITY)
+        self.negotiation_details = self.recorder.details
+        # Finest grid step of the latest negotiation_table(), None for every outcome
+        self.grid_step = None
+        self._last_proposal = None
         if self.LOGGING_ENABLED:
             logging.info(f"Initialized negotiator for {self.name} on task {task.id}")
             logging.info(f"Memory: {satellite.available_memory}/{satellite.memory_capacity}")
@@ -48,6 +206,7 @@ class BaseNegotiator(SAONegotiator):
 
     def on_negotiation_start(self, state: SAOState):
         """Called when negotiation starts"""
+        self._last_proposal = None
         if self.LOGGING_ENABLED:
             logging.info(f"\n===== Negotiation Start! {self.name} =====")
             logging.info(f"Task {self.task.id} - Reward: {self.task.reward_points}, Memory: {self.task.memory_required}")
@@ -75,6 +234,78 @@ class BaseNegotiator(SAONegotiator):
             logging.info(f"Task {self.task.id} - Reward: {self.task.reward_points}, Memory: {self.task.memory_required}")
             logging.info(f"Satellite memory: {self.satellite.available_memory}/{self.satellite.memory_capacity}")
 
+    def utility_table(self) -> UtilityTable:
+        """The cached UtilityTable of this negotiator's ufun in the current session."""
+        return utility_table(self.ufun, self.nmi.outcome_space)
+
+    def negotiation_table(self, state: SAOState, centre: Outcome | None = None) -> UtilityTable:
+        """
+        The cached UtilityTable of the outcomes to negotiate over at this point
+        of the session: every outcome, or with OUTCOME_GRID the coarsest grid,
+        from the second level on with the finer grids of the levels so far
+        around centre (see outcome_grid.py). Sets grid_step to the finest step.
+        """
+        if not self.OUTCOME_GRID:
+            self.grid_step = None
+            return self.utility_table()
+        level = grid_level(state.relative_time, len(self.OUTCOME_GRID)) if centre is not None else 0
+        self.grid_step = self.OUTCOME_GRID[level]
+        return grid_table(self.ufun, self.nmi.outcome_space, self.OUTCOME_GRID[:level + 1], centre)
+
+    def ranked_outcome(self, state: SAOState, fraction: float, weight: float):
+        """
+        The outcome ranked at fraction of the outcomes by adjusted utility
+        (utility * weight / 4, best first). With OUTCOME_GRID it's ranked on
+        the coarsest grid, and from the second level on refined to the outcome
+        around it whose adjusted utility is closest to the rank's value
+        interpolated on that grid.
+
+        Returns:
+            tuple: (table, selected index, (outcome, utility, adjusted utility))
+        """
+        table = self.negotiation_table(state)
+        selected_idx = int(len(table) * fraction)
+        selection = table.adjusted(selected_idx, weight)
+        if self.OUTCOME_GRID and grid_level(state.relative_time, len(self.OUTCOME_GRID)) > 0:
+            target = table.quantile(fraction, weight)
+            table = self.negotiation_table(state, centre=selection[0])
+            selection, selected_idx = table.closest(target, weight)
+        return table, selected_idx, selection
+
+    def proposed(self, outcome: Outcome | None) -> Outcome | None:
+        """Note an outcome this negotiator proposes, the centre of its finer grids."""
+        if outcome is not None:
+            self._last_proposal = outcome
+        return outcome
+
+    def record(self, kind: str, entry: dict):
+        """Record a negotiation detail (memory check, utility calculation, proposal or response)."""
+        self.recorder.record(kind, entry)
+
+    def record_utility_calculations(self, time: float, table: UtilityTable, reward_factor: float,
+                                    memory_factor: float, memory_availability_factor: float, weight: float):
+        """
+        Record the utility calculations of a proposal: of every outcome at the
+        "full" level, otherwise of the last outcome only.
+        """
+        if not self.recorder.enabled:
+            return
+        if self.recorder.full:
+            indices = range(len(table))
+        else:
+            indices = [len(table) - 1]
+        for idx in indices:
+            base_utility = float(table.utilities[idx])
+            self.record("utility_calculations", {
+                "time": time,
+                "outcome": str(table.outcomes[idx]),
+                "base_utility": base_utility,
+                "reward_factor": reward_factor,
+                "memory_factor": memory_factor,
+                "memory_availability_factor": memory_availability_factor,
+                "adjusted_utility": base_utility * weight / 4
+            })
+
     def get_negotiation_details(self):
         """Return the detailed negotiation information"""
-        return self.negotiation_details
\ No newline at end of file
+        return self.recorder.get_details()
\ No newline at end of file
@@ -0,0 +1,79 @@
+"""
+Title: Outcome grid
+
+Coarse-to-fine views of an outcome space for the multi-resolution
+negotiation mode (BaseNegotiator.OUTCOME_GRID).
+
+The mode is a sequence of grid steps, coarsest first, e.g. (10, 1). The
+session's relative time is split evenly between them: with (10, 1) the first
+half is negotiated on an 11 x 11 grid of the two 101-value issues (0, 10, ...,
+100), the second half on that grid plus the outcomes within 10 of the
+negotiator's current best region (e.g. its last proposal) at full precision,
+at most 121 + 441 outcomes instead of 10,201. Each further level adds a finer
+grid within one step of the previous level around the same centre.
+
+Only integer issues are gridded; any other issue keeps all its values.
+
+Author: Zheng Wang
+Email: wanzy133@mymail.unisa.edu.au
+Supervisor: Dr. Jianglin Qiao
+
+Date: 17/10/2026
+"""
+from itertools import product
+
+
+def parse_grid(text: str) -> tuple[int, ...]:
+    """
+    Grid steps from their command line form, e.g. "10,1".
+
+    Raises:
+        ValueError: If the steps aren't positive integers, coarsest first
+    """
+    steps = tuple(int(step) for step in text.split(","))
+    if any(step < 1 for step in steps) or list(steps) != sorted(steps, reverse=True):
+        raise ValueError(f"Grid steps must be positive integers, coarsest first: {text}")
+    return steps
+
+
+def grid_level(relative_time: float, n_levels: int) -> int:
+    """The grid level at a relative time, the session being split evenly between the levels."""
+    return min(int(relative_time * n_levels), n_levels - 1)
+
+
+def grid_values(issue, step: int, centre=None, radius: int | None = None) -> list:
+    """
+    Values of an issue on a grid: every step-th value from its minimum (and
+    its maximum), or with a centre, those within radius of it.
+    """
+    if not issue.is_integer():
+        return list(issue.all)
+    low, high = issue.min_value, issue.max_value
+    if centre is None:
+        values = list(range(low, high + 1, step))
+        if values[-1] != high:
+            values.append(high)
+        return values
+    span = radius // step
+    return sorted({min(high, max(low, centre + k * step)) for k in range(-span, span + 1)})
+
+
+def grid_outcomes(issues, steps: tuple[int, ...], centre=None) -> list[tuple]:
+    """
+    Outcomes of the first grid levels, in the outcome space's enumeration
+    order: the whole grid of the coarsest step, and for every further step
+    the grid within the previous step of the centre outcome.
+
+    Args:
+        issues (list): Issues of the outcome space
+        steps (tuple): Grid steps of the levels, coarsest first
+        centre (tuple): The outcome the finer grids are centred on
+    """
+    outcomes = set(product(*(grid_values(issue, steps[0]) for issue in issues)))
+    if centre is not None:
+        for radius, step in zip(steps, steps[1:]):
+            outcomes.update(product(*(
+                grid_values(issue, step, value, radius) for issue, value in zip(issues, centre)
+            )))
+    positions = [{value: idx for idx, value in enumerate(issue.all)} for issue in issues]
+    return sorted(outcomes, key=lambda outcome: [pos[value] for pos, value in zip(positions, outcome)])
@@ -0,0 +1,95 @@
+"""
+Title: Negotiation recorder module
+
+Records the details of a negotiator's session (memory checks, utility
+calculations, proposals and responses) at a configurable level, so the cost
+of recording stays flat per session.
+
+Levels:
+- "off": nothing is recorded
+- "summary": what the results schema needs, i.e. every memory check,
+  proposal and response, but only the last utility calculation per phase
+- "per-step": one utility calculation per proposal or response
+- "full": in addition, the utility calculation of every outcome on each
+  proposal
+
+"per-step" and "full" keep the most recent `capacity` entries of each kind
+in a ring buffer.
+
+Author: Zheng Wang
+Email: wanzy133@mymail.unisa.edu.au
+Supervisor: Dr. Jianglin Qiao
+
+Date: 17/10/2026
+"""
+from collections import deque
+
+RECORDING_LEVELS = ("off", "summary", "per-step", "full")
+
+DETAIL_KINDS = ("memory_checks", "utility_calculations", "proposals", "responses")
+
+# Entries of each kind kept by the ring buffers of "per-step" and "full"
+DEFAULT_CAPACITY = 10_000
+
+
+def phase_of(relative_time: float) -> str:
+    """The negotiation phase the negotiators use at a relative time."""
+    if relative_time < 0.3:
+        return "early"
+    elif relative_time < 0.7:
+        return "middle"
+    return "late"
+
+
+class NegotiationRecorder:
+    """Negotiation details of one negotiator, recorded at a level."""
+
+    def __init__(self, level: str = "summary", capacity: int = DEFAULT_CAPACITY):
+        """
+        Args:
+            level: One of RECORDING_LEVELS
+            capacity: Ring buffer size per kind for "per-step" and "full"
+
+        Raises:
+            ValueError: If the level is unknown
+        """
+        if level not in RECORDING_LEVELS:
+            raise ValueError(f"Unknown recording level: {level}. Available levels: {list(RECORDING_LEVELS)}")
+        self.level = level
+        self.capacity = capacity
+        self.details = {kind: self._buffer() for kind in DETAIL_KINDS}
+
+    def _buffer(self):
+        if self.level == "off":
+            return deque(maxlen=0)
+        if self.level == "summary":
+            return []
+        return deque(maxlen=self.capacity)
+
+    @property
+    def enabled(self) -> bool:
+        return self.level != "off"
+
+    @property
+    def full(self) -> bool:
+        return self.level == "full"
+
+    def record(self, kind: str, entry: dict):
+        """
+        Record one entry of a kind of detail.
+
+        Args:
+            kind: One of DETAIL_KINDS
+            entry: The detail, with its relative "time"
+        """
+        entries = self.details[kind]
+        if (self.level == "summary" and kind == "utility_calculations" and entries
+                and phase_of(entries[-1]["time"]) == phase_of(entry["time"])):
+            # Only the last calculation of each phase is kept
+            entries[-1] = entry
+            return
+        entries.append(entry)
+
+    def get_details(self) -> dict:
+        """The recorded details, kind -> list of entries in recording order."""
+        return {kind: list(entries) for kind, entries in self.details.items()}
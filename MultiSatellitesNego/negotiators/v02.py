@@ -17,6 +17,9 @@ class NegotiatorV02(BaseNegotiator):
     This version uses a simpler approach to negotiation without step requirements.
     """
 
+    # No randomness in proposals or responses
+    DETERMINISTIC = True
+
     def propose(self, state: SAOState, dest: str | None = None) -> Outcome | None:
         """
         Propose an outcome based on the current task's memory and reward requirements,
@@ -35,59 +38,42 @@ class NegotiatorV02(BaseNegotiator):
             "required_memory": self.task.memory_required,
             "has_enough_memory": self.satellite.available_memory >= self.task.memory_required
         }
-        self.negotiation_details["memory_checks"].append(memory_check)
+        self.record("memory_checks", memory_check)
 
         if self.satellite.available_memory < self.task.memory_required:
             if self.LOGGING_ENABLED:
                 logging.info("  Not enough memory available for task")
             return None
 
-        # Get all possible outcomes
-        outcomes = list(self.nmi.outcome_space.enumerate_or_sample())
+        # Utilities of all possible outcomes, computed once per process
+        table = self.utility_table()
         if self.LOGGING_ENABLED:
-            logging.info(f"  Considering {len(outcomes)} possible outcomes")
-
-        # Calculate utilities for each outcome, considering task requirements and memory
-        utilities = []
-        for outcome in outcomes:
-            # Calculate base utility from the utility function
-            base_utility = self.ufun(outcome)
-
-            # Adjust utility based on task requirements and memory availability
-            reward_factor = self.task.reward_points / 1000.0
-            memory_factor = self.task.memory_required / self.satellite.memory_capacity
-            memory_availability_factor = self.satellite.available_memory / self.satellite.memory_capacity
-
-            # Higher utility when more memory is available
-            adjusted_utility = base_utility * (1 + reward_factor + (1 - memory_factor) + memory_availability_factor) / 4
+            logging.info(f"  Considering {len(table)} possible outcomes")
 
-            utility_calc = {
-                "time": relative_time,
-                "outcome": str(outcome),
-                "base_utility": base_utility,
-                "reward_factor": reward_factor,
-                "memory_factor": memory_factor,
-                "memory_availability_factor": memory_availability_factor,
-                "adjusted_utility": adjusted_utility
-            }
-            self.negotiation_details["utility_calculations"].append(utility_calc)
+        # Adjust utility based on task requirements and memory availability
+        reward_factor = self.task.reward_points / 1000.0
+        memory_factor = self.task.memory_required / self.satellite.memory_capacity
+        memory_availability_factor = self.satellite.available_memory / self.satellite.memory_capacity
 
-            utilities.append((outcome, base_utility, adjusted_utility))
+        # Higher utility when more memory is available
+        weight = 1 + reward_factor + (1 - memory_factor) + memory_availability_factor
 
-        utilities.sort(key=lambda x: x[2], reverse=True)  # Sort by adjusted utility
+        self.record_utility_calculations(relative_time, table, reward_factor, memory_factor,
+                                         memory_availability_factor, weight)
 
         # Time-based strategy
         if relative_time < 0.3:  # Early phase
-            selected_idx = int(len(utilities) * 0.2)
+            selected_idx = int(len(table) * 0.2)
             phase = "early"
         elif relative_time < 0.7:  # Middle phase
-            selected_idx = int(len(utilities) * 0.4)
+            selected_idx = int(len(table) * 0.4)
             phase = "middle"
         else:  # Late phase
-            selected_idx = int(len(utilities) * 0.6)
+            selected_idx = int(len(table) * 0.6)
             phase = "late"
 
-        selected_outcome, base_utility, adjusted_utility = utilities[selected_idx]
+        # Ranked by adjusted utility
+        selected_outcome, base_utility, adjusted_utility = table.adjusted(selected_idx, weight)
 
         proposal_details = {
             "time": relative_time,
@@ -97,9 +83,9 @@ class NegotiatorV02(BaseNegotiator):
             "base_utility": base_utility,
             "adjusted_utility": adjusted_utility,
             "selected_index": selected_idx,
-            "total_outcomes": len(outcomes)
+            "total_outcomes": len(table)
         }
-        self.negotiation_details["proposals"].append(proposal_details)
+        self.record("proposals", proposal_details)
 
         return selected_outcome
 
@@ -127,7 +113,7 @@ class NegotiatorV02(BaseNegotiator):
             "required_memory": self.task.memory_required,
             "has_enough_memory": self.satellite.available_memory >= self.task.memory_required
         }
-        self.negotiation_details["memory_checks"].append(memory_check)
+        self.record("memory_checks", memory_check)
 
         if self.satellite.available_memory < self.task.memory_required:
             if self.LOGGING_ENABLED:
@@ -153,7 +139,7 @@ class NegotiatorV02(BaseNegotiator):
             "memory_availability_factor": memory_availability_factor,
             "adjusted_utility": adjusted_utility
         }
-        self.negotiation_details["utility_calculations"].append(utility_calc)
+        self.record("utility_calculations", utility_calc)
 
         # Time-based acceptance threshold
         if relative_time < 0.3:  # Early phase
@@ -181,6 +167,6 @@ class NegotiatorV02(BaseNegotiator):
             "adjusted_threshold": threshold,
             "response": response.name
         }
-        self.negotiation_details["responses"].append(response_details)
+        self.record("responses", response_details)
 
         return response
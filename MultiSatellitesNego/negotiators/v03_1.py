@@ -25,6 +25,10 @@ class NegotiatorV03_1(BaseNegotiator):
     This version uses the same strategy as v0.3 but with different issues and utility functions.
     The issues are "confilict" issues, which was first used in v0.4.
     """
+
+    # No randomness in proposals or responses
+    DETERMINISTIC = True
+
     negotiator_issues = [
         make_issue(name="initiator_reward", values=101),
         make_issue(name="initiator_memory", values=101)
@@ -67,59 +71,44 @@ class NegotiatorV03_1(BaseNegotiator):
             "required_memory": self.task.memory_required,
             "has_enough_memory": self.satellite.available_memory >= self.task.memory_required
         }
-        self.negotiation_details["memory_checks"].append(memory_check)
+        self.record("memory_checks", memory_check)
 
         if self.satellite.available_memory < self.task.memory_required:
             if self.LOGGING_ENABLED:
                 logging.info("  Not enough memory available for task")
             return None
 
-        # Get all possible outcomes
-        outcomes = list(self.nmi.outcome_space.enumerate_or_sample())
+        # Utilities of all possible outcomes (or of the coarsest grid's), computed once per process
+        table = self.negotiation_table(state)
         if self.LOGGING_ENABLED:
-            logging.info(f"  Considering {len(outcomes)} possible outcomes")
-
-        # Calculate utilities for each outcome, considering task requirements and memory
-        utilities = []
-        for outcome in outcomes:
-            # Calculate base utility from the utility function
-            base_utility = self.ufun(outcome)
-
-            # Adjust utility based on task requirements and memory availability
-            reward_factor = self.task.reward_points / 1000.0
-            memory_factor = self.task.memory_required / self.satellite.memory_capacity
-            memory_availability_factor = self.satellite.available_memory / self.satellite.memory_capacity
+            logging.info(f"  Considering {len(table)} possible outcomes")
 
-            # Higher utility when more memory is available
-            adjusted_utility = base_utility * (1 + reward_factor + (1 - memory_factor) + memory_availability_factor) / 4
-
-            utility_calc = {
-                "time": relative_time,
-                "outcome": str(outcome),
-                "base_utility": base_utility,
-                "reward_factor": reward_factor,
-                "memory_factor": memory_factor,
-                "memory_availability_factor": memory_availability_factor,
-                "adjusted_utility": adjusted_utility
-            }
-            self.negotiation_details["utility_calculations"].append(utility_calc)
+        # Adjust utility based on task requirements and memory availability
+        reward_factor = self.task.reward_points / 1000.0
+        memory_factor = self.task.memory_required / self.satellite.memory_capacity
+        memory_availability_factor = self.satellite.available_memory / self.satellite.memory_capacity
 
-            utilities.append((outcome, base_utility, adjusted_utility))
+        # Higher utility when more memory is available
+        weight = 1 + reward_factor + (1 - memory_factor) + memory_availability_factor
 
-        utilities.sort(key=lambda x: x[2], reverse=True)  # Sort by adjusted utility
+        self.record_utility_calculations(relative_time, table, reward_factor, memory_factor,
+                                         memory_availability_factor, weight)
 
         # Time-based strategy
         if relative_time < 0.3:  # Early phase
-            selected_idx = int(len(utilities) * 0.2)
+            selected_fraction = 0.2
             phase = "early"
         elif relative_time < 0.7:  # Middle phase
-            selected_idx = int(len(utilities) * 0.4)
+            selected_fraction = 0.4
             phase = "middle"
         else:  # Late phase
-            selected_idx = int(len(utilities) * 0.6)
+            selected_fraction = 0.6
             phase = "late"
 
-        selected_outcome, base_utility, adjusted_utility = utilities[selected_idx]
+        # Ranked by adjusted utility, refined around the coarse grid's pick in the grid mode
+        table, selected_idx, (selected_outcome, base_utility, adjusted_utility) = self.ranked_outcome(
+            state, selected_fraction, weight
+        )
 
         proposal_details = {
             "time": relative_time,
@@ -129,9 +118,10 @@ class NegotiatorV03_1(BaseNegotiator):
             "base_utility": base_utility,
             "adjusted_utility": adjusted_utility,
             "selected_index": selected_idx,
-            "total_outcomes": len(outcomes)
+            "total_outcomes": len(table),
+            "grid_step": self.grid_step
         }
-        self.negotiation_details["proposals"].append(proposal_details)
+        self.record("proposals", proposal_details)
 
         return selected_outcome
 
@@ -160,7 +150,7 @@ class NegotiatorV03_1(BaseNegotiator):
             "required_memory": self.task.memory_required,
             "has_enough_memory": self.satellite.available_memory >= self.task.memory_required
         }
-        self.negotiation_details["memory_checks"].append(memory_check)
+        self.record("memory_checks", memory_check)
 
         if self.satellite.available_memory < self.task.memory_required:
             if self.LOGGING_ENABLED:
@@ -186,7 +176,7 @@ class NegotiatorV03_1(BaseNegotiator):
             "memory_availability_factor": memory_availability_factor,
             "adjusted_utility": adjusted_utility
         }
-        self.negotiation_details["utility_calculations"].append(utility_calc)
+        self.record("utility_calculations", utility_calc)
 
         # Get current step number and total steps from the mechanism
         current_step = state.step
@@ -225,6 +215,6 @@ class NegotiatorV03_1(BaseNegotiator):
             "current_step": current_step,
             "total_steps": total_steps
         }
-        self.negotiation_details["responses"].append(response_details)
+        self.record("responses", response_details)
 
         return response
\ No newline at end of file
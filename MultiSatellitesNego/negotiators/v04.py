@@ -13,7 +13,6 @@ from negmas import (
     SAONegotiator,
     AspirationNegotiator,
     PolyAspiration,
-    PresortingInverseUtilityFunction,
     PreferencesChangeType,
     ResponseType,
     Outcome,
@@ -21,7 +20,7 @@ from negmas import (
     make_issue
 )
 from negmas.preferences import LinearAdditiveUtilityFunction, LinearFun, IdentityFun, AffineFun
-from .base import BaseNegotiator
+from .base import BaseNegotiator, inverse_utility
 from random import choice
 import logging
 
@@ -73,14 +72,15 @@ class NegotiatorV04(BaseNegotiator):
         if not changes:
             return
 
-        self._inv = PresortingInverseUtilityFunction(self.ufun)
-        self._inv.init()
+        # The invertor and extremes of a ufun are shared by all its negotiators
+        shared = inverse_utility(self.ufun)
+        self._inv = shared.inverter
 
-        # find worst and best outcomes for me
-        worest, self._best = self.ufun.extreme_outcomes()
+        # find my best outcome
+        self._best = shared.best
 
         # and the corresponding utility values
-        self._min, self._max = self.ufun(worest), self.ufun(self._best)
+        self._min, self._max = shared.min, shared.max
 
         # MUST call parent to avoid being called again for no reason
         super().on_preferences_changed(changes)
@@ -103,59 +103,44 @@ class NegotiatorV04(BaseNegotiator):
             "required_memory": self.task.memory_required,
             "has_enough_memory": self.satellite.available_memory >= self.task.memory_required
         }
-        self.negotiation_details["memory_checks"].append(memory_check)
+        self.record("memory_checks", memory_check)
 
         if self.satellite.available_memory < self.task.memory_required:
             if self.LOGGING_ENABLED:
                 logging.info("  Not enough memory available for task")
             return None
 
-        # Get all possible outcomes
-        outcomes = list(self.nmi.outcome_space.enumerate_or_sample())
+        # Utilities of all possible outcomes (or of the coarsest grid's), computed once per process
+        table = self.negotiation_table(state)
         if self.LOGGING_ENABLED:
-            logging.info(f"  Considering {len(outcomes)} possible outcomes")
+            logging.info(f"  Considering {len(table)} possible outcomes")
 
-        # Calculate utilities for each outcome, considering task requirements and memory
-        utilities = []
-        for outcome in outcomes:
-            # Calculate base utility from the utility function
-            base_utility = self.ufun(outcome)
-
-            # Adjust utility based on task requirements and memory availability
-            reward_factor = self.task.reward_points / 1000.0
-            memory_factor = self.task.memory_required / self.satellite.memory_capacity
-            memory_availability_factor = self.satellite.available_memory / self.satellite.memory_capacity
-
-            # Higher utility when more memory is available
-            adjusted_utility = base_utility * (1 + reward_factor + (1 - memory_factor) + memory_availability_factor) / 4
-
-            utility_calc = {
-                "time": state.relative_time,
-                "outcome": str(outcome),
-                "base_utility": base_utility,
-                "reward_factor": reward_factor,
-                "memory_factor": memory_factor,
-                "memory_availability_factor": memory_availability_factor,
-                "adjusted_utility": adjusted_utility
-            }
-            self.negotiation_details["utility_calculations"].append(utility_calc)
+        # Adjust utility based on task requirements and memory availability
+        reward_factor = self.task.reward_points / 1000.0
+        memory_factor = self.task.memory_required / self.satellite.memory_capacity
+        memory_availability_factor = self.satellite.available_memory / self.satellite.memory_capacity
 
-            utilities.append((outcome, base_utility, adjusted_utility))
+        # Higher utility when more memory is available
+        weight = 1 + reward_factor + (1 - memory_factor) + memory_availability_factor
 
-        utilities.sort(key=lambda x: x[2], reverse=True)  # Sort by adjusted utility
+        self.record_utility_calculations(state.relative_time, table, reward_factor, memory_factor,
+                                         memory_availability_factor, weight)
 
         # Time-based strategy
         if state.relative_time < 0.3:  # Early phase
-            selected_idx = int(len(utilities) * 0.2)
+            selected_fraction = 0.2
             phase = "early"
         elif state.relative_time < 0.7:  # Middle phase
-            selected_idx = int(len(utilities) * 0.4)
+            selected_fraction = 0.4
             phase = "middle"
         else:  # Late phase
-            selected_idx = int(len(utilities) * 0.6)
+            selected_fraction = 0.6
             phase = "late"
 
-        selected_outcome, base_utility, adjusted_utility = utilities[selected_idx]
+        # Ranked by adjusted utility, refined around the coarse grid's pick in the grid mode
+        table, selected_idx, (selected_outcome, base_utility, adjusted_utility) = self.ranked_outcome(
+            state, selected_fraction, weight
+        )
 
         proposal_details = {
             "time": state.relative_time,
@@ -165,9 +150,10 @@ class NegotiatorV04(BaseNegotiator):
             "base_utility": base_utility,
             "adjusted_utility": adjusted_utility,
             "selected_index": selected_idx,
-            "total_outcomes": len(outcomes)
+            "total_outcomes": len(table),
+            "grid_step": self.grid_step
         }
-        self.negotiation_details["proposals"].append(proposal_details)
+        self.record("proposals", proposal_details)
 
         # Old return
         # return selected_outcome
@@ -178,14 +164,18 @@ class NegotiatorV04(BaseNegotiator):
         ) + (self._min or 0)
 
         # find some outcomes (all if the outcome space is  discrete) above the aspiration level
-        outcomes = self._inv.some((a - 1e-6, self._max + 1e-6), False)
+        if self.OUTCOME_GRID:
+            # only those of the grids, the finer ones around my last proposal
+            outcomes = self.negotiation_table(state, centre=self._last_proposal).above(a - 1e-6)
+        else:
+            outcomes = self._inv.some((a - 1e-6, self._max + 1e-6), False)
         # If there are no outcomes above the aspiration level, offer my best outcome
         if not outcomes:
-            return self._best
+            return self.proposed(self._best)
 
         # else if I did not  receive anything from the partner, offer any outcome above the aspiration level
         if not self._partner_first:
-            return choice(outcomes)
+            return self.proposed(choice(outcomes))
 
         # otherwise, offer the outcome most similar to the partner's first offer (above the aspiration level)
         nearest, ndist = None, float("inf")
@@ -193,7 +183,7 @@ class NegotiatorV04(BaseNegotiator):
             d = sum((a - b) * (a - b) for a, b in zip(o, self._partner_first))
             if d < ndist:
                 nearest, ndist = o, d
-        return nearest
+        return self.proposed(nearest)
 
     def respond(self, state: SAOState, source: str | None = None) -> ResponseType:
         """
@@ -220,7 +210,7 @@ class NegotiatorV04(BaseNegotiator):
             "required_memory": self.task.memory_required,
             "has_enough_memory": self.satellite.available_memory >= self.task.memory_required
         }
-        self.negotiation_details["memory_checks"].append(memory_check)
+        self.record("memory_checks", memory_check)
 
         if self.satellite.available_memory < self.task.memory_required:
             if self.LOGGING_ENABLED:
@@ -246,7 +236,7 @@ class NegotiatorV04(BaseNegotiator):
             "memory_availability_factor": memory_availability_factor,
             "adjusted_utility": adjusted_utility
         }
-        self.negotiation_details["utility_calculations"].append(utility_calc)
+        self.record("utility_calculations", utility_calc)
 
         # Get current step number and total steps from the mechanism
         current_step = state.step
@@ -279,7 +269,7 @@ class NegotiatorV04(BaseNegotiator):
             "current_step": current_step,
             "total_steps": total_steps
         }
-        self.negotiation_details["responses"].append(response_details)
+        self.record("responses", response_details)
 
         # set the partner's first offer when I receive it
         if not self._partner_first:
@@ -18,7 +18,6 @@ from negmas import (
     SAONegotiator,
     AspirationNegotiator,
     PolyAspiration,
-    PresortingInverseUtilityFunction,
     PreferencesChangeType,
     ResponseType,
     Outcome,
@@ -26,7 +25,7 @@ from negmas import (
     make_issue
 )
 from negmas.preferences import LinearAdditiveUtilityFunction, LinearFun, IdentityFun, AffineFun
-from .base import BaseNegotiator
+from .base import BaseNegotiator, inverse_utility
 from random import choice
 
 class NegotiatorV04_1(BaseNegotiator):
@@ -36,6 +35,9 @@ class NegotiatorV04_1(BaseNegotiator):
     _max = None  # The maximum of my utility function
     _best = None  # The best outcome for me
 
+    # Aspiration-based; never looks at the satellite's memory
+    MEMORY_GATED = False
+
     negotiator_issues = [
         make_issue(name="initiator_reward", values=101),
         make_issue(name="initiator_memory", values=101)
@@ -71,15 +73,15 @@ class NegotiatorV04_1(BaseNegotiator):
         # create an initialize an invertor for my ufun
         changes = [_ for _ in changes if _.type not in (PreferencesChangeType.Scale,)]
 
-        self._inv = PresortingInverseUtilityFunction(self.ufun)
-        self._inv.init()
-
+        # The invertor and extremes of a ufun are shared by all its negotiators
+        shared = inverse_utility(self.ufun)
+        self._inv = shared.inverter
 
-        # find worst and best outcomes for me
-        worest, self._best = self.ufun.extreme_outcomes()
+        # find my best outcome
+        self._best = shared.best
 
         # and the corresponding utility values
-        self._min, self._max = self.ufun(worest), self.ufun(self._best)
+        self._min, self._max = shared.min, shared.max
         print(f"self._min: {self._min}, self._max: {self._max}")
         # MUST call parent to avoid being called again for no reason
         super().on_preferences_changed(changes)
@@ -110,16 +112,20 @@ class NegotiatorV04_1(BaseNegotiator):
         print(f"self._max={self._max}, self._min={self._min}, a={a}")
 
         # find some outcomes (all if the outcome space is  discrete) above the aspiration level
-        outcomes = self._inv.some((a - 1e-6, self._max + 1e-6), False)
+        if self.OUTCOME_GRID:
+            # only those of the grids, the finer ones around my last proposal
+            outcomes = self.negotiation_table(state, centre=self._last_proposal).above(a - 1e-6)
+        else:
+            outcomes = self._inv.some((a - 1e-6, self._max + 1e-6), False)
         # If there are no outcomes above the aspiration level, offer my best outcome
 
         if not outcomes:
-            return self._best
+            return self.proposed(self._best)
 
         # else if I did not  receive anything from the partner, offer any outcome above the aspiration level
         if not self._partner_first:
             print(f"choice(outcomes)={choice(outcomes)}")
-            return choice(outcomes)
+            return self.proposed(choice(outcomes))
 
         # otherwise, offer the outcome most similar to the partner's first offer (above the aspiration level)
         nearest, ndist = None, float("inf")
@@ -128,4 +134,4 @@ class NegotiatorV04_1(BaseNegotiator):
             if d < ndist:
                 nearest, ndist = o, d
         print(f"nearest={nearest}")
-        return nearest
\ No newline at end of file
+        return self.proposed(nearest)
\ No newline at end of file
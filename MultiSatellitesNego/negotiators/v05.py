@@ -26,6 +26,10 @@ class NegotiatorV05(BaseNegotiator):
     """
     Version 0.5 of the satellite negotiator.
     """
+
+    # No randomness in proposals or responses
+    DETERMINISTIC = True
+
     negotiator_issues = [
         make_issue(name="initiator_reward", values=101),
         make_issue(name="initiator_memory", values=101)
@@ -68,7 +72,7 @@ class NegotiatorV05(BaseNegotiator):
             "required_memory": self.task.memory_required,
             "has_enough_memory": self.satellite.available_memory >= self.task.memory_required
         }
-        self.negotiation_details["memory_checks"].append(memory_check)
+        self.record("memory_checks", memory_check)
 
         if self.satellite.available_memory < self.task.memory_required:
             if self.LOGGING_ENABLED:
@@ -80,52 +84,37 @@ class NegotiatorV05(BaseNegotiator):
         # According the current task creating process, this value rage is 0.1 ~
         task_reward_cost = float(self.task.memory_required / self.task.reward_points)
 
-        # Get all possible outcomes
-        outcomes = list(self.nmi.outcome_space.enumerate_or_sample())
+        # Utilities of all possible outcomes (or of the coarsest grid's), computed once per process
+        table = self.negotiation_table(state)
         if self.LOGGING_ENABLED:
-            logging.info(f"  Considering {len(outcomes)} possible outcomes")
-
-        # Calculate utilities for each outcome, considering task requirements and memory
-        utilities = []
-        for outcome in outcomes:
-            # Calculate base utility from the utility function
-            base_utility = self.ufun(outcome)
-
-            # Adjust utility based on task requirements and memory availability
-            reward_factor = self.task.reward_points / 1000.0
-            memory_factor = self.task.memory_required / self.satellite.memory_capacity
-            memory_availability_factor = self.satellite.available_memory / self.satellite.memory_capacity
+            logging.info(f"  Considering {len(table)} possible outcomes")
 
-            # Higher utility when more memory is available
-            adjusted_utility = base_utility * (1 + reward_factor + (1 - memory_factor) + memory_availability_factor) / 4
-
-            utility_calc = {
-                "time": relative_time,
-                "outcome": str(outcome),
-                "base_utility": base_utility,
-                "reward_factor": reward_factor,
-                "memory_factor": memory_factor,
-                "memory_availability_factor": memory_availability_factor,
-                "adjusted_utility": adjusted_utility
-            }
-            self.negotiation_details["utility_calculations"].append(utility_calc)
+        # Adjust utility based on task requirements and memory availability
+        reward_factor = self.task.reward_points / 1000.0
+        memory_factor = self.task.memory_required / self.satellite.memory_capacity
+        memory_availability_factor = self.satellite.available_memory / self.satellite.memory_capacity
 
-            utilities.append((outcome, base_utility, adjusted_utility))
+        # Higher utility when more memory is available
+        weight = 1 + reward_factor + (1 - memory_factor) + memory_availability_factor
 
-        utilities.sort(key=lambda x: x[2], reverse=True)  # Sort by adjusted utility
+        self.record_utility_calculations(relative_time, table, reward_factor, memory_factor,
+                                         memory_availability_factor, weight)
 
         # Time-based strategy
         if relative_time < 0.3:  # Early phase
-            selected_idx = int(len(utilities) * 0.2)
+            selected_fraction = 0.2
             phase = "early"
         elif relative_time < 0.7:  # Middle phase
-            selected_idx = int(len(utilities) * 0.4)
+            selected_fraction = 0.4
             phase = "middle"
         else:  # Late phase
-            selected_idx = int(len(utilities) * 0.6)
+            selected_fraction = 0.6
             phase = "late"
 
-        selected_outcome, base_utility, adjusted_utility = utilities[selected_idx]
+        # Ranked by adjusted utility, refined around the coarse grid's pick in the grid mode
+        table, selected_idx, (selected_outcome, base_utility, adjusted_utility) = self.ranked_outcome(
+            state, selected_fraction, weight
+        )
 
         proposal_details = {
             "time": relative_time,
@@ -135,9 +124,10 @@ class NegotiatorV05(BaseNegotiator):
             "base_utility": base_utility,
             "adjusted_utility": adjusted_utility,
             "selected_index": selected_idx,
-            "total_outcomes": len(outcomes)
+            "total_outcomes": len(table),
+            "grid_step": self.grid_step
         }
-        self.negotiation_details["proposals"].append(proposal_details)
+        self.record("proposals", proposal_details)
 
         return selected_outcome
 
@@ -166,7 +156,7 @@ class NegotiatorV05(BaseNegotiator):
             "required_memory": self.task.memory_required,
             "has_enough_memory": self.satellite.available_memory >= self.task.memory_required
         }
-        self.negotiation_details["memory_checks"].append(memory_check)
+        self.record("memory_checks", memory_check)
 
         if self.satellite.available_memory < self.task.memory_required:
             if self.LOGGING_ENABLED:
@@ -192,7 +182,7 @@ class NegotiatorV05(BaseNegotiator):
             "memory_availability_factor": memory_availability_factor,
             "adjusted_utility": adjusted_utility
         }
-        self.negotiation_details["utility_calculations"].append(utility_calc)
+        self.record("utility_calculations", utility_calc)
 
         current_step = state.step
         total_steps = self.nmi.n_steps
@@ -230,6 +220,6 @@ class NegotiatorV05(BaseNegotiator):
             "current_step": current_step,
             "total_steps": total_steps
         }
-        self.negotiation_details["responses"].append(response_details)
+        self.record("responses", response_details)
 
         return response
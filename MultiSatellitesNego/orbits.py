@@ -0,0 +1,250 @@
+"""
+Title: Orbit Tracks
+
+Dependency-light orbit-based availability generation, so realistic
+scenarios don't need a Basilisk installation.
+
+Satellites fly circular orbits (a Walker-delta constellation or any list of
+circular orbits) around a spherical, rotating Earth. For every time slot
+the positions of all satellites and all sites (task targets or ground
+stations) are computed in one batched NumPy evaluation, and a satellite
+sees a site when the site's elevation angle to it is above a minimum.
+
+The result is emitted in the scenario's availability format: per satellite
+one location index per slot, i.e. the visible site with the highest
+elevation (site i has location index i + 1; 0 means nothing is visible).
+Long horizons are evaluated in time chunks and can be cached on disk.
+
+Author: Zheng Wang
+Email: wanzy133@mymail.unisa.edu.au
+Supervisor: Dr. Jianglin Qiao
+
+Date Created: 17/10/2026
+"""
+
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from .coverage import SLOTS_PER_HOUR
+
+EARTH_RADIUS_KM = 6378.137
+EARTH_MU_KM3_S2 = 398600.4418
+EARTH_ROTATION_RAD_S = 7.2921159e-5
+
+# Upper bound on the (satellites x sites x samples) elements evaluated at once
+CHUNK_ELEMENTS = 4_000_000
+
+
+class Constellation:
+    """
+    Circular orbits, one entry per satellite (angles in degrees, altitude in km).
+
+    raan: right ascension of the ascending node
+    arg_latitude: argument of latitude at t = 0
+    """
+
+    def __init__(self, raan, arg_latitude, inclination, altitude):
+        self.raan = np.atleast_1d(np.asarray(raan, dtype=np.float64))
+        n = len(self.raan)
+        self.arg_latitude = np.broadcast_to(np.asarray(arg_latitude, dtype=np.float64), (n,)).copy()
+        self.inclination = np.broadcast_to(np.asarray(inclination, dtype=np.float64), (n,)).copy()
+        self.altitude = np.broadcast_to(np.asarray(altitude, dtype=np.float64), (n,)).copy()
+
+    @classmethod
+    def from_orbits(cls, orbits):
+        """
+        Build from a list of {"raan": .., "arg_latitude": .., "inclination": .., "altitude": ..}.
+        """
+        return cls(
+            [orbit["raan"] for orbit in orbits],
+            [orbit.get("arg_latitude", 0.0) for orbit in orbits],
+            [orbit["inclination"] for orbit in orbits],
+            [orbit["altitude"] for orbit in orbits]
+        )
+
+    def __len__(self):
+        return len(self.raan)
+
+    def to_dict(self):
+        return {
+            "raan": self.raan.tolist(),
+            "arg_latitude": self.arg_latitude.tolist(),
+            "inclination": self.inclination.tolist(),
+            "altitude": self.altitude.tolist()
+        }
+
+    def positions(self, times):
+        """
+        Inertial positions at `times` (seconds from t = 0).
+
+        Returns:
+            np.ndarray: (n_satellites, n_times, 3) in km
+        """
+        radius = EARTH_RADIUS_KM + self.altitude
+        mean_motion = np.sqrt(EARTH_MU_KM3_S2 / radius ** 3)
+        u = np.radians(self.arg_latitude)[:, None] + mean_motion[:, None] * np.asarray(times)[None, :]
+        raan = np.radians(self.raan)[:, None]
+        inc = np.radians(self.inclination)[:, None]
+
+        cos_u, sin_u = np.cos(u), np.sin(u)
+        cos_raan, sin_raan = np.cos(raan), np.sin(raan)
+        return radius[:, None, None] * np.stack([
+            cos_raan * cos_u - sin_raan * sin_u * np.cos(inc),
+            sin_raan * cos_u + cos_raan * sin_u * np.cos(inc),
+            sin_u * np.sin(inc)
+        ], axis=-1)
+
+
+def walker_delta(num_satellites, num_planes, phasing=1, inclination=53.0, altitude=550.0):
+    """
+    Walker-delta constellation i:T/P/F.
+
+    Args:
+        num_satellites (int): T, total number of satellites
+        num_planes (int): P, number of equally spaced orbital planes
+        phasing (int): F, relative phasing between adjacent planes
+        inclination (float): Inclination in degrees
+        altitude (float): Altitude in km
+
+    Returns:
+        Constellation: Satellites ordered plane by plane
+
+    Raises:
+        ValueError: If the satellites can't be split evenly over the planes
+    """
+    if num_planes <= 0 or num_satellites % num_planes:
+        raise ValueError(f"{num_satellites} satellites can't be split evenly over {num_planes} planes")
+    per_plane = num_satellites // num_planes
+    plane = np.repeat(np.arange(num_planes), per_plane)
+    index = np.tile(np.arange(per_plane), num_planes)
+    raan = 360.0 * plane / num_planes
+    arg_latitude = 360.0 * index / per_plane + 360.0 * phasing * plane / num_satellites
+    return Constellation(raan, arg_latitude, inclination, altitude)
+
+
+def site_positions(sites, times):
+    """
+    Inertial positions of ground sites at `times`, on a spherical rotating Earth.
+
+    Args:
+        sites (list): Dicts with 'lat' and 'lon' in degrees
+
+    Returns:
+        np.ndarray: (n_sites, n_times, 3) in km
+    """
+    lat = np.radians([site["lat"] for site in sites])[:, None]
+    lon = np.radians([site["lon"] for site in sites])[:, None] + EARTH_ROTATION_RAD_S * np.asarray(times)[None, :]
+    return EARTH_RADIUS_KM * np.stack([
+        np.cos(lat) * np.cos(lon),
+        np.cos(lat) * np.sin(lon),
+        np.sin(lat) * np.ones_like(lon)
+    ], axis=-1)
+
+
+def sin_elevation(sat_pos, site_pos):
+    """
+    Sine of the elevation of every satellite seen from every site.
+
+    Args:
+        sat_pos (np.ndarray): (n_satellites, n_times, 3)
+        site_pos (np.ndarray): (n_sites, n_times, 3)
+
+    Returns:
+        np.ndarray: (n_satellites, n_sites, n_times)
+    """
+    up = site_pos / EARTH_RADIUS_KM
+    rho = sat_pos[:, None, :, :] - site_pos[None, :, :, :]
+    return np.einsum("sltk,ltk->slt", rho, up) / np.linalg.norm(rho, axis=-1)
+
+
+def visibility_matrix(constellation, sites, n_slots, min_elevation=10.0, samples_per_slot=3,
+                      slots_per_hour=SLOTS_PER_HOUR, start_time=0.0):
+    """
+    Per-slot visibility of `sites` for every satellite, in availability matrix form.
+
+    A slot is sampled `samples_per_slot` times; a site counts as seen in the
+    slot if it is above `min_elevation` at any sample, and when several are
+    seen the one with the highest elevation wins.
+
+    Args:
+        constellation (Constellation): The satellites
+        sites (list): Targets or ground stations, dicts with 'lat' and 'lon'
+        n_slots (int): Length of the horizon in slots
+        min_elevation (float): Minimum elevation in degrees
+        samples_per_slot (int): Time samples per slot
+        slots_per_hour (int): Slot resolution
+        start_time (float): Horizon start in seconds from the constellation epoch
+
+    Returns:
+        np.ndarray: (n_satellites, n_slots) int32, site index + 1 or 0
+    """
+    n_sats, n_sites = len(constellation), len(sites)
+    matrix = np.zeros((n_sats, n_slots), dtype=np.int32)
+    if n_sats == 0 or n_sites == 0:
+        return matrix
+
+    slot_seconds = 3600.0 / slots_per_hour
+    offsets = (np.arange(samples_per_slot) + 0.5) / samples_per_slot * slot_seconds
+    min_sin = np.sin(np.radians(min_elevation))
+    chunk = max(1, CHUNK_ELEMENTS // (n_sats * n_sites * samples_per_slot))
+
+    for first in range(0, n_slots, chunk):
+        slots = np.arange(first, min(first + chunk, n_slots))
+        times = (start_time + slots[:, None] * slot_seconds + offsets[None, :]).ravel()
+        elevation = sin_elevation(constellation.positions(times), site_positions(sites, times))
+        # Best elevation of each site within each slot: (n_sats, n_sites, n_chunk_slots)
+        elevation = elevation.reshape(n_sats, n_sites, len(slots), samples_per_slot).max(axis=-1)
+        best_site = elevation.argmax(axis=1)
+        seen = np.take_along_axis(elevation, best_site[:, None, :], axis=1)[:, 0, :] >= min_sin
+        matrix[:, slots] = np.where(seen, best_site + 1, 0)
+
+    return matrix
+
+
+def orbit_cache_key(constellation, sites, n_slots, **options):
+    """Content hash of everything a visibility matrix depends on."""
+    content = {
+        "constellation": constellation.to_dict(),
+        "sites": [[site["lat"], site["lon"]] for site in sites],
+        "n_slots": n_slots,
+        "options": options
+    }
+    return hashlib.sha256(json.dumps(content, sort_keys=True).encode()).hexdigest()
+
+
+def cached_visibility_matrix(constellation, sites, n_slots, cache_dir, **options):
+    """
+    visibility_matrix, computed once per (constellation, sites, horizon,
+    options) and kept in `cache_dir` as a .npy file that later calls
+    memory-map instead of recomputing.
+    """
+    path = os.path.join(cache_dir, f"orbit_{orbit_cache_key(constellation, sites, n_slots, **options)[:16]}.npy")
+    if os.path.exists(path):
+        return np.load(path, mmap_mode="r")
+
+    matrix = visibility_matrix(constellation, sites, n_slots, **options)
+    os.makedirs(cache_dir, exist_ok=True)
+    # Write to a temporary file first so readers never see a partial cache entry
+    tmp_path = f"{path}.tmp.npy"
+    np.save(tmp_path, matrix)
+    os.replace(tmp_path, path)
+    return matrix
+
+
+def location_sites(num_locations, cities=None, seed=0):
+    """
+    Sites for location indices 1..num_locations: the given cities first,
+    then seeded random points between 60S and 60N.
+    """
+    sites = [{"lat": city["lat"], "lon": city["lon"]} for city in (cities or [])][:num_locations]
+    extra = num_locations - len(sites)
+    if extra > 0:
+        rng = np.random.default_rng(seed)
+        # Uniform on the sphere's band, not in latitude
+        lat = np.degrees(np.arcsin(rng.uniform(-np.sin(np.radians(60)), np.sin(np.radians(60)), extra)))
+        lon = rng.uniform(-180.0, 180.0, extra)
+        sites.extend({"lat": float(a), "lon": float(b)} for a, b in zip(lat, lon))
+    return sites
@@ -0,0 +1,222 @@
+"""
+Title: Partner Ranking
+
+Live ranking of the coalitions in the satellites' coalition tables.
+
+Coalition tables rank partners once, by their static memory capacity. As
+agreements are reached, partners' available memory drains and that order
+goes stale. PartnerRanking keeps, for every (initiator, task), an indexed
+max-heap of the table's coalitions scored by the partners' current
+available memory, so a strategy always tries the coalition most likely to
+succeed next. A memory change repositions only the coalitions containing
+that satellite, in O(log S) each.
+
+Coalitions are scored (fewer partners first, more available memory among
+the partners, then the table's own order). While available memory equals
+memory capacity this is exactly the order of the coalition tables.
+
+Author: Zheng Wang
+Email: wanzy133@mymail.unisa.edu.au
+Supervisor: Dr. Jianglin Qiao
+
+Date Created: 17/10/2026
+"""
+
+
+class IndexedMaxHeap:
+    """
+    Binary max-heap of keys with priorities, where any key's priority can be
+    changed or the key removed in O(log n).
+    """
+
+    def __init__(self, items=None):
+        """
+        Args:
+            items (iterable): (key, priority) pairs to start with
+        """
+        self._heap = []
+        self._pos = {}
+        self._priority = {}
+        for key, priority in (items or []):
+            self._priority[key] = priority
+            self._pos[key] = len(self._heap)
+            self._heap.append(key)
+        # Heapify bottom-up
+        for i in reversed(range(len(self._heap) // 2)):
+            self._sift_down(i)
+
+    def __len__(self):
+        return len(self._heap)
+
+    def __contains__(self, key):
+        return key in self._pos
+
+    def priority(self, key):
+        return self._priority[key]
+
+    def push(self, key, priority):
+        """Add a key, or change its priority if it is already in the heap."""
+        if key in self._pos:
+            self.update(key, priority)
+            return
+        self._priority[key] = priority
+        self._pos[key] = len(self._heap)
+        self._heap.append(key)
+        self._sift_up(len(self._heap) - 1)
+
+    def update(self, key, priority):
+        """Change the priority of a key in the heap."""
+        old = self._priority[key]
+        self._priority[key] = priority
+        if priority > old:
+            self._sift_up(self._pos[key])
+        elif priority < old:
+            self._sift_down(self._pos[key])
+
+    def peek(self):
+        """(key, priority) with the highest priority, or None if empty."""
+        if not self._heap:
+            return None
+        key = self._heap[0]
+        return key, self._priority[key]
+
+    def pop(self):
+        """
+        Remove and return the (key, priority) with the highest priority.
+
+        Raises:
+            IndexError: If the heap is empty
+        """
+        if not self._heap:
+            raise IndexError("pop from an empty heap")
+        key = self._heap[0]
+        priority = self._priority[key]
+        self.remove(key)
+        return key, priority
+
+    def remove(self, key):
+        """Remove a key from the heap."""
+        i = self._pos.pop(key)
+        del self._priority[key]
+        last = self._heap.pop()
+        if i < len(self._heap):
+            self._heap[i] = last
+            self._pos[last] = i
+            self._sift_up(i)
+            self._sift_down(self._pos[last])
+
+    def _higher(self, a, b):
+        return self._priority[self._heap[a]] > self._priority[self._heap[b]]
+
+    def _swap(self, a, b):
+        heap = self._heap
+        heap[a], heap[b] = heap[b], heap[a]
+        self._pos[heap[a]] = a
+        self._pos[heap[b]] = b
+
+    def _sift_up(self, i):
+        while i > 0:
+            parent = (i - 1) // 2
+            if not self._higher(i, parent):
+                break
+            self._swap(i, parent)
+            i = parent
+
+    def _sift_down(self, i):
+        n = len(self._heap)
+        while True:
+            best = i
+            for child in (2 * i + 1, 2 * i + 2):
+                if child < n and self._higher(child, best):
+                    best = child
+            if best == i:
+                break
+            self._swap(i, best)
+            i = best
+
+
+class PartnerRanking:
+    """
+    Coalitions of every initiator and task, ranked by the partners' current
+    available memory.
+    """
+
+    def __init__(self, available_memory):
+        """
+        Args:
+            available_memory (dict): Satellite name -> available memory
+        """
+        self.available_memory = dict(available_memory)
+        self._heaps = {}        # (initiator, task_id) -> IndexedMaxHeap of coalition ranks
+        self._coalitions = {}   # (initiator, task_id) -> coalitions (lists of partner names)
+        self._containing = {}   # satellite name -> [((initiator, task_id), rank)]
+        self._task_keys = {}    # task_id -> [(initiator, task_id)]
+
+    def _score(self, members, rank):
+        memory = sum(self.available_memory.get(name, 0) for name in members)
+        return (-len(members), memory, -rank)
+
+    def add_table(self, table):
+        """
+        Add an initiator's coalition table.
+
+        Args:
+            table (CompactCoalitionTable): The initiator's table
+        """
+        for task_id in table.task_ids:
+            key = (table.satellite_id, task_id)
+            coalitions = list(table.candidates(task_id))
+            self._coalitions[key] = coalitions
+            self._task_keys.setdefault(task_id, []).append(key)
+            self._heaps[key] = IndexedMaxHeap(
+                (rank, self._score(members, rank)) for rank, members in enumerate(coalitions)
+            )
+            for rank, members in enumerate(coalitions):
+                for name in set(members):
+                    self._containing.setdefault(name, []).append((key, rank))
+
+    def update_memory(self, satellite_name, available_memory):
+        """
+        Record a satellite's new available memory and reposition the
+        coalitions it is a partner in.
+        """
+        self.available_memory[satellite_name] = available_memory
+        entries = self._containing.get(satellite_name, [])
+        live = []
+        for key, rank in entries:
+            heap = self._heaps.get(key)
+            if heap is None or rank not in heap:
+                continue
+            heap.update(rank, self._score(self._coalitions[key][rank], rank))
+            live.append((key, rank))
+        # Forget coalitions that were tried or whose task was discarded
+        self._containing[satellite_name] = live
+
+    def next_coalition(self, initiator, task_id):
+        """
+        Take the best untried coalition of the initiator for the task.
+
+        Returns:
+            list: Partner names, or None when every coalition was tried
+        """
+        heap = self._heaps.get((initiator, task_id))
+        if not heap:
+            return None
+        rank, _ = heap.pop()
+        return self._coalitions[(initiator, task_id)][rank]
+
+    def candidates(self, initiator, task_id):
+        """
+        Iterate the initiator's coalitions for the task, each time the best
+        untried one given the memory at that moment.
+        """
+        coalition = self.next_coalition(initiator, task_id)
+        while coalition is not None:
+            yield coalition
+            coalition = self.next_coalition(initiator, task_id)
+
+    def discard_task(self, task_id):
+        """Drop every initiator's coalitions for a task, e.g. once it is allocated."""
+        for key in self._task_keys.pop(task_id, []):
+            del self._heaps[key]
+            del self._coalitions[key]
@@ -49,6 +49,7 @@ from random import random
 from random import sample, randint
 from abc import ABC, abstractmethod
 from MultiSatellitesNego.coalition import CoalitionTable
+from MultiSatellitesNego.availability_runs import decode_runs
 
 class SatellliteAgent(Agent, ABC):
     @abstractmethod
@@ -128,18 +129,35 @@ class Satellite(SatellliteAgent):
                  accumulated_reward: int = 0,
                  availability_matrix: Dict[str, List[bool]] = {},
                  coalition_table: CoalitionTable = {},
-                 ufun: UtilityFunction | None = None):
+                 ufun: UtilityFunction | None = None,
+                 availability_runs: List[List[int]] | None = None,
+                 availability_slots: int | None = None,
+                 availability_row: int | None = None):
         super().__init__()
         self.name = name if name is not None else f"sat{randint(0, 1000)}"
         self.memory_capacity = memory_capacity
         self.available_memory = available_memory
         self.accumulated_reward = accumulated_reward
         self.availability_matrix = availability_matrix
+        # Run-length-encoded availability: [[start_slot, length, location_index], ...]
+        self.availability_runs = availability_runs
+        self.availability_slots = availability_slots
+        # Row of the scenario's availability store, if availability_matrix is a view into it
+        self.availability_row = availability_row
         self.task_commitments: Dict[int, int] = {}
         self.coalition_table = coalition_table if coalition_table else CoalitionTable(self.name)
         self.current_negotiations: Dict[int, List[str]] = {}
         self.task_assignments = []  # [(task_id, location, start_time, duration)]
 
+    def get_availability_matrix(self) -> List[int]:
+        """Dense availability, decoded from the runs if that's how it was stored."""
+        if self.availability_runs is not None and len(self.availability_matrix) == 0:
+            n_slots = self.availability_slots
+            if n_slots is None:
+                n_slots = max((start + length for start, length, _ in self.availability_runs), default=0)
+            return decode_runs(self.availability_runs, n_slots)
+        return self.availability_matrix
+
     def init(self):
         pass
 
@@ -0,0 +1,77 @@
+"""
+Title: Satellite Generator
+
+Seeded generation of random satellites: memory capacities are drawn from a
+configurable distribution and availability matrices from a per-window
+coverage probability, both for the whole constellation at once.
+
+Author: Zheng Wang
+Email: wanzy133@mymail.unisa.edu.au
+Supervisor: Dr. Jianglin Qiao
+
+Date Created: 17/10/2026
+"""
+
+import numpy as np
+
+from .availability_generator import generate_random_availability
+from .distributions import merge_distributions, sample_values
+from .satellite import Satellite
+
+
+def generate_satellite_dicts(num_satellites, tasks=None, seed=None, distributions=None,
+                             coverage_probability=0.3, rng=None):
+    """
+    Generate satellites in the scenario JSON format.
+
+    Args:
+        num_satellites (int): Number of satellites, named sat1, sat2, ...
+        tasks (list): Task dicts; when given every satellite gets an
+                      'availability_matrix' covering each task time window
+                      with `coverage_probability`
+        seed (int): Seed for reproducible satellites
+        distributions (dict): Overrides of DEFAULT_DISTRIBUTIONS
+        coverage_probability (float): Chance a satellite sees a given time window
+        rng (np.random.Generator): Use this generator instead of seeding a new one
+
+    Returns:
+        list: Satellite dicts
+    """
+    rng = np.random.default_rng(seed) if rng is None else rng
+    distributions = merge_distributions(distributions)
+    capacities = sample_values(rng, distributions["memory_capacity"], num_satellites).tolist()
+
+    satellites = [
+        {
+            "name": f"sat{i + 1}",
+            "memory_capacity": capacity,
+            "available_memory": capacity,
+            "accumulated_reward": 0
+        }
+        for i, capacity in enumerate(capacities)
+    ]
+
+    if tasks is not None:
+        matrix = generate_random_availability(tasks, num_satellites, coverage_probability,
+                                              seed=rng.integers(2**32))
+        for sat, row in zip(satellites, matrix.tolist()):
+            sat["availability_matrix"] = row
+
+    return satellites
+
+
+def create_satellites(num_satellites, cities=None, seed=None, distributions=None, tasks=None):
+    """
+    Create random Satellite objects.
+
+    Args:
+        num_satellites (int): Number of satellites
+        cities (list): The task locations (kept for the API's signature)
+        seed (int): Seed for reproducible satellites
+        distributions (dict): Overrides of DEFAULT_DISTRIBUTIONS
+        tasks (list): Task dicts to generate availability matrices for
+
+    Returns:
+        list: Satellite objects
+    """
+    return [Satellite(**sat) for sat in generate_satellite_dicts(num_satellites, tasks, seed, distributions)]
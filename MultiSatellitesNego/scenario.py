@@ -0,0 +1,72 @@
+"""
+Title: Scenario Loader
+
+Reads and writes the scenario JSON files in saved_data/. Scenarios whose
+availability lives in a binary store (see availability_store.py) get each
+satellite's 'availability_matrix' attached as a memory-mapped view on load,
+so callers see the same dicts whichever way the scenario was stored.
+
+Author: Zheng Wang
+Email: wanzy133@mymail.unisa.edu.au
+Supervisor: Dr. Jianglin Qiao
+
+Date Created: 17/10/2026
+"""
+
+import json
+import re
+
+from .availability_store import attach_availability_store, detach_availability_store
+
+
+def load_scenario(json_file):
+    """
+    Load a scenario JSON file.
+
+    Args:
+        json_file (str): Path of the scenario JSON file
+
+    Returns:
+        dict: The scenario with 'tasks' and 'satellites'
+    """
+    with open(json_file, 'r') as file:
+        data = json.load(file)
+    attach_availability_store(json_file, data)
+    return data
+
+
+def _compact_matrix(match):
+    numbers = re.findall(r'\d+', match.group(0))
+    return f'"availability_matrix": [{", ".join(numbers)}]'
+
+
+# Arrays of the compact coalition table form (see coalition.py)
+_COMPACT_TABLE_ARRAYS = re.compile(
+    r'"(satellites|task_ids|task_offsets|coalition_offsets|members|priorities)":\s*\[([^\[\]{}]*)\]'
+)
+
+
+def _compact_table_array(match):
+    items = [item.strip() for item in match.group(2).split(",") if item.strip()]
+    return f'"{match.group(1)}": [{", ".join(items)}]'
+
+
+def scenario_to_json(data):
+    """
+    Serialise a scenario, keeping each availability matrix, each
+    [start_slot, length, location_index] run and each array of a compact
+    coalition table on a single line.
+    """
+    json_str = json.dumps(detach_availability_store(data), indent=4)
+    json_str = re.sub(r'"availability_matrix":\s*\[[^\]]*\]', _compact_matrix, json_str)
+    json_str = _COMPACT_TABLE_ARRAYS.sub(_compact_table_array, json_str)
+    json_str = re.sub(r'\[\s*(\d+),\s*(\d+),\s*(\d+)\s*\]', r'[\1, \2, \3]', json_str)
+    return json_str
+
+
+def save_scenario(json_file, data):
+    """
+    Write a scenario JSON file. Store-backed availability stays in its store.
+    """
+    with open(json_file, 'w') as f:
+        f.write(scenario_to_json(data))
@@ -0,0 +1,77 @@
+"""
+Title: Scenario Generator
+
+Generates complete, valid scenario files of any size - tasks, satellites
+with availability matrices and coverage-based coalition tables - in the
+same format as the hand-made setups in saved_data/.
+
+Everything is drawn from one seeded generator, so a (size, seed,
+distributions) triple always produces the same scenario.
+
+Author: Zheng Wang
+Email: wanzy133@mymail.unisa.edu.au
+Supervisor: Dr. Jianglin Qiao
+
+Date Created: 17/10/2026
+"""
+
+import numpy as np
+
+from .availability_runs import encode_runs
+from .availability_store import write_availability_store
+from .coalition_generator import generate_coalition_table_dicts
+from .satellite_generator import generate_satellite_dicts
+from .scenario import save_scenario
+from .task_generator import generate_task_dicts
+
+
+def generate_scenario(num_tasks, num_satellites, seed=None, distributions=None, num_locations=None,
+                      coverage_probability=0.3, coalition_tables=True):
+    """
+    Generate a scenario.
+
+    Args:
+        num_tasks (int): Number of tasks
+        num_satellites (int): Number of satellites
+        seed (int): Seed for a reproducible scenario
+        distributions (dict): Overrides of distributions.DEFAULT_DISTRIBUTIONS
+        num_locations (int): Number of distinct task locations (one per task by default)
+        coverage_probability (float): Chance a satellite sees a given task time window
+        coalition_tables (bool): Add each satellite's coalition table
+
+    Returns:
+        dict: {"satellites": [...], "tasks": [...]}
+    """
+    rng = np.random.default_rng(seed)
+    tasks = generate_task_dicts(num_tasks, num_locations, distributions=distributions, rng=rng)
+    satellites = generate_satellite_dicts(num_satellites, tasks, distributions=distributions,
+                                          coverage_probability=coverage_probability, rng=rng)
+
+    if coalition_tables:
+        tables = generate_coalition_table_dicts(tasks, satellites)
+        for sat in satellites:
+            sat["coalition_table"] = tables[sat["name"]]
+
+    return {"satellites": satellites, "tasks": tasks}
+
+
+def write_scenario(json_file, data, availability="matrix"):
+    """
+    Write a generated scenario.
+
+    Args:
+        json_file (str): Output path
+        data (dict): The scenario
+        availability (str): "matrix" - inline availability matrices,
+                            "rle" - inline availability runs,
+                            "npy" - memory-mapped .npy store next to the JSON
+    """
+    if availability == "rle":
+        for sat in data["satellites"]:
+            matrix = sat.pop("availability_matrix", None)
+            if matrix is not None:
+                sat["availability_runs"] = encode_runs(matrix)
+                sat["availability_slots"] = len(matrix)
+    elif availability == "npy":
+        write_availability_store(json_file, data)
+    save_scenario(json_file, data)
@@ -0,0 +1,238 @@
+"""
+Title: Session Cache
+
+Memoises the outcome of negotiation sessions between deterministic
+negotiators, so a session that was already run is never run again.
+
+A deterministic negotiator (BaseNegotiator.DETERMINISTIC) only looks at the
+task's reward and memory requirement, its satellite's memory figures, the
+offers and the number of steps. A session of such negotiators always ends
+the same way for the same:
+
+- negotiator class (and the code of its modules, and its OUTCOME_GRID),
+- task reward_points and memory_required,
+- memory_capacity and available_memory of every member, initiator first,
+- n_steps.
+
+That is the session signature. Outcomes (agreement and number of steps) are
+kept in an in-process LRU and, optionally, in a JSON store on disk that is
+shared across runs. Sessions of random negotiators are never cached.
+
+Author: Zheng Wang
+Email: wanzy133@mymail.unisa.edu.au
+Supervisor: Dr. Jianglin Qiao
+
+Date Created: 17/10/2026
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import sys
+from collections import OrderedDict
+
+# Bump when the signature or the stored format changes
+CACHE_VERSION = 1
+
+_CLASS_FINGERPRINTS = {}
+
+
+def _field(obj, name):
+    return obj[name] if isinstance(obj, dict) else getattr(obj, name)
+
+
+def _code_modules(negotiator_class):
+    """
+    The modules whose code a negotiator class runs: those defining it and its
+    base classes (negmas' aside), and the modules of its own package they use,
+    e.g. base.py's outcome_grid.py, recursively.
+    """
+    modules = {}
+    pending = []
+    for klass in negotiator_class.__mro__:
+        if klass.__module__.split(".")[0] not in ("negmas", "builtins") and klass.__module__ in sys.modules:
+            pending.append(sys.modules[klass.__module__])
+    if not pending:
+        return modules
+    package = sys.modules.get(negotiator_class.__module__.split(".")[0], pending[0])
+    root = os.path.dirname(os.path.abspath(getattr(package, "__file__", None) or pending[0].__file__))
+    while pending:
+        module = pending.pop()
+        path = getattr(module, "__file__", None)
+        if module.__name__ in modules or path is None or not os.path.abspath(path).startswith(root + os.sep):
+            continue
+        modules[module.__name__] = module
+        for value in vars(module).values():
+            used = value if inspect.ismodule(value) else sys.modules.get(getattr(value, "__module__", None) or "")
+            if used is not None:
+                pending.append(used)
+    return modules
+
+
+def class_fingerprint(negotiator_class):
+    """
+    Hash of the source of the modules a negotiator class runs (see
+    _code_modules), so stored outcomes are not reused once any of that code
+    changes.
+    """
+    fingerprint = _CLASS_FINGERPRINTS.get(negotiator_class)
+    if fingerprint is None:
+        digest = hashlib.sha256()
+        modules = _code_modules(negotiator_class)
+        for name in sorted(modules):
+            digest.update(name.encode())
+            try:
+                digest.update(inspect.getsource(modules[name]).encode())
+            except (OSError, TypeError):
+                pass
+        if not modules:
+            digest.update(negotiator_class.__qualname__.encode())
+        fingerprint = digest.hexdigest()[:16]
+        _CLASS_FINGERPRINTS[negotiator_class] = fingerprint
+    return fingerprint
+
+
+def session_signature(negotiator_class, task, members, n_steps):
+    """
+    Canonical signature of a session.
+
+    Args:
+        negotiator_class: The negotiator class of every member
+        task: Task dict or Task object
+        members: Satellite dicts or Satellite objects, initiator first
+        n_steps (int): Steps of the session
+
+    Returns:
+        str: Content hash of everything the session's outcome depends on
+    """
+    content = [
+        CACHE_VERSION,
+        f"{negotiator_class.__module__}.{negotiator_class.__qualname__}",
+        class_fingerprint(negotiator_class),
+        n_steps,
+        [float(_field(task, "reward_points")), float(_field(task, "memory_required"))],
+        [[float(_field(sat, "memory_capacity")), float(_field(sat, "available_memory"))] for sat in members]
+    ]
+    # Set at run time rather than in the class source; left out when unset so
+    # stored signatures stay valid
+    grid = getattr(negotiator_class, "OUTCOME_GRID", None)
+    if grid:
+        content.append(list(grid))
+    return hashlib.sha256(json.dumps(content).encode()).hexdigest()
+
+
+class SessionOutcome:
+    """
+    How a session ended: the agreement (None without one) and the step it
+    ended at.
+    """
+
+    def __init__(self, agreement, step):
+        self.agreement = tuple(agreement) if agreement is not None else None
+        self.step = step
+
+    @classmethod
+    def from_state(cls, state):
+        return cls(state.agreement, state.step)
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["agreement"], data["step"])
+
+    def to_dict(self):
+        return {"agreement": list(self.agreement) if self.agreement is not None else None, "step": self.step}
+
+
+class SessionCache:
+    """
+    LRU of session outcomes by signature, optionally backed by a JSON store.
+    """
+
+    def __init__(self, maxsize=100_000, path=None):
+        """
+        Args:
+            maxsize (int): Outcomes kept in memory
+            path (str): JSON store shared across runs (in memory only by default)
+        """
+        self.maxsize = maxsize
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._outcomes = OrderedDict()
+        self._stored = {}
+        self._unsaved = False
+        if path is not None and os.path.exists(path):
+            with open(path) as f:
+                data = json.load(f)
+            if data.get("version") == CACHE_VERSION:
+                self._stored = data["outcomes"]
+
+    def __len__(self):
+        return len(self._outcomes)
+
+    def get(self, signature):
+        """The cached SessionOutcome of a signature, or None."""
+        outcome = self._outcomes.get(signature)
+        if outcome is not None:
+            self._outcomes.move_to_end(signature)
+        elif signature in self._stored:
+            outcome = SessionOutcome.from_dict(self._stored[signature])
+            self._remember(signature, outcome)
+        if outcome is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return outcome
+
+    def put(self, signature, outcome):
+        """Cache the SessionOutcome of a signature."""
+        self._remember(signature, outcome)
+        if self.path is not None:
+            self._stored[signature] = outcome.to_dict()
+            self._unsaved = True
+
+    def _remember(self, signature, outcome):
+        self._outcomes[signature] = outcome
+        self._outcomes.move_to_end(signature)
+        if len(self._outcomes) > self.maxsize:
+            self._outcomes.popitem(last=False)
+
+    def save(self):
+        """Write the store to disk, if there is one and it changed."""
+        if self.path is None or not self._unsaved:
+            return
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        # Write to a temporary file first so readers never see a partial store
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"version": CACHE_VERSION, "outcomes": self._stored}, f)
+        os.replace(tmp_path, self.path)
+        self._unsaved = False
+
+
+def run_cached_session(cache, negotiator_class, task, members, n_steps, run):
+    """
+    The outcome of a session, run only when it is not cached.
+
+    Args:
+        cache (SessionCache): The cache, or None to always run
+        negotiator_class: The negotiator class of every member
+        task: Task dict or Task object
+        members: Satellite dicts or Satellite objects, initiator first
+        n_steps (int): Steps of the session
+        run: Callable that runs the session and returns its final state
+
+    Returns:
+        SessionOutcome: How the session ended
+    """
+    if cache is None or not getattr(negotiator_class, "DETERMINISTIC", False):
+        return SessionOutcome.from_state(run())
+
+    signature = session_signature(negotiator_class, task, members, n_steps)
+    outcome = cache.get(signature)
+    if outcome is None:
+        outcome = SessionOutcome.from_state(run())
+        cache.put(signature, outcome)
+    return outcome
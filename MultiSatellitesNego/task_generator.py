@@ -0,0 +1,109 @@
+"""
+Title: Task Generator
+
+Seeded generation of random tasks. All task attributes are drawn for the
+whole batch at once, so thousands of tasks take a handful of array
+operations.
+
+Each task gets `windows_per_task` non-overlapping time windows: the day is
+split into that many equal segments and one window of `window_length`
+hours is placed at a random start inside each segment.
+
+Author: Zheng Wang
+Email: wanzy133@mymail.unisa.edu.au
+Supervisor: Dr. Jianglin Qiao
+
+Date Created: 17/10/2026
+"""
+
+import numpy as np
+
+from .distributions import merge_distributions, sample_values
+from .task import Task
+
+HOURS_PER_DAY = 24
+
+
+def generate_time_windows(rng, num_tasks, distributions=None):
+    """
+    Draw the time windows of `num_tasks` tasks.
+
+    Returns:
+        list: One list of {"start_time": X, "end_time": Y} per task, in hours
+    """
+    distributions = merge_distributions(distributions)
+    counts = np.clip(sample_values(rng, distributions["windows_per_task"], num_tasks), 1, HOURS_PER_DAY)
+    n_windows = int(counts.sum())
+
+    # Flattened (task, window) arrays
+    task_idx = np.repeat(np.arange(num_tasks), counts)
+    window_idx = np.arange(n_windows) - np.repeat(np.cumsum(counts) - counts, counts)
+    segment = HOURS_PER_DAY // counts[task_idx]
+
+    lengths = np.clip(sample_values(rng, distributions["window_length"], n_windows), 1, segment)
+    slack = segment - lengths
+    starts = window_idx * segment + (rng.random(n_windows) * (slack + 1)).astype(np.int64)
+    ends = starts + lengths
+
+    windows = [[] for _ in range(num_tasks)]
+    for t, start, end in zip(task_idx.tolist(), starts.tolist(), ends.tolist()):
+        windows[t].append({"start_time": start, "end_time": end})
+    return windows
+
+
+def generate_task_dicts(num_tasks, num_locations=None, seed=None, distributions=None, rng=None):
+    """
+    Generate tasks in the scenario JSON format.
+
+    Args:
+        num_tasks (int): Number of tasks
+        num_locations (int): Tasks are spread over locations 1..num_locations.
+                             By default every task has its own location.
+        seed (int): Seed for reproducible tasks
+        distributions (dict): Overrides of DEFAULT_DISTRIBUTIONS
+        rng (np.random.Generator): Use this generator instead of seeding a new one
+
+    Returns:
+        list: Task dicts with 'id', 'location_index', 'time_window',
+              'reward_points' and 'memory_required'
+    """
+    rng = np.random.default_rng(seed) if rng is None else rng
+    distributions = merge_distributions(distributions)
+
+    if num_locations is None:
+        locations = np.arange(1, num_tasks + 1)
+    else:
+        locations = rng.integers(1, num_locations, size=num_tasks, endpoint=True)
+    rewards = sample_values(rng, distributions["reward_points"], num_tasks)
+    memory = sample_values(rng, distributions["memory_required"], num_tasks)
+    windows = generate_time_windows(rng, num_tasks, distributions)
+
+    return [
+        {
+            "id": i + 1,
+            "location_index": str(location),
+            "time_window": time_window,
+            "reward_points": reward,
+            "memory_required": memory_required
+        }
+        for i, (location, time_window, reward, memory_required)
+        in enumerate(zip(locations.tolist(), windows, rewards.tolist(), memory.tolist()))
+    ]
+
+
+def create_tasks(num_tasks, cities=None, seed=None, distributions=None):
+    """
+    Create random Task objects located at `cities`.
+
+    Args:
+        num_tasks (int): Number of tasks
+        cities (list): Candidate locations; a task at cities[i] has location_index i + 1.
+                       Without cities every task has its own location.
+        seed (int): Seed for reproducible tasks
+        distributions (dict): Overrides of DEFAULT_DISTRIBUTIONS
+
+    Returns:
+        list: Task objects
+    """
+    num_locations = len(cities) if cities else None
+    return [Task(**task) for task in generate_task_dicts(num_tasks, num_locations, seed, distributions)]
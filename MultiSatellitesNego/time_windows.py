@@ -0,0 +1,206 @@
+"""
+Title: Time Window Engine
+
+Stores satellite visibility intervals and answers task time window overlap
+queries on real start/end times (in hours) instead of fixed 15-minute slots,
+so windows can be minute-level or span several days.
+
+Visibility intervals are kept per location in a static augmented interval
+tree, which answers "which intervals overlap [start, end)" in O(log n + k)
+whatever the time resolution.
+
+Author: Zheng Wang
+Email: wanzy133@mymail.unisa.edu.au
+Supervisor: Dr. Jianglin Qiao
+
+Date Created: 17/10/2026
+"""
+
+import math
+
+import numpy as np
+
+from .availability_runs import satellite_runs
+from .coverage import SLOTS_PER_HOUR, NO_COVERAGE, FeasibilityTable
+
+
+class IntervalTree:
+    """
+    Static interval tree over half-open intervals [start, end).
+
+    Intervals are sorted by start and laid out as an implicit balanced binary
+    tree (the root of a range is its middle element). Each node stores the
+    largest end in its subtree, which lets a query skip every subtree that
+    ends before the query starts.
+    """
+
+    def __init__(self, intervals=()):
+        self._pending = list(intervals)
+        self._dirty = True
+
+    def add(self, start, end, payload=None):
+        """Add an interval; the tree is rebuilt lazily on the next query."""
+        self._pending.append((start, end, payload))
+        self._dirty = True
+
+    def __len__(self):
+        return len(self._pending)
+
+    def _build(self):
+        self._pending.sort(key=lambda interval: (interval[0], interval[1]))
+        self._starts = [interval[0] for interval in self._pending]
+        self._ends = [interval[1] for interval in self._pending]
+        self._max_end = [0.0] * len(self._pending)
+
+        # Post-order pass over the implicit tree
+        stack = [(0, len(self._pending), False)]
+        while stack:
+            lo, hi, children_done = stack.pop()
+            if lo >= hi:
+                continue
+            mid = (lo + hi) // 2
+            if not children_done:
+                stack.append((lo, hi, True))
+                stack.append((lo, mid, False))
+                stack.append((mid + 1, hi, False))
+                continue
+            max_end = self._ends[mid]
+            if lo < mid:
+                max_end = max(max_end, self._max_end[(lo + mid) // 2])
+            if mid + 1 < hi:
+                max_end = max(max_end, self._max_end[(mid + 1 + hi) // 2])
+            self._max_end[mid] = max_end
+
+        self._dirty = False
+
+    def overlapping(self, start, end):
+        """
+        All intervals overlapping [start, end), in start order.
+
+        Returns:
+            list: [(start, end, payload), ...]
+        """
+        if self._dirty:
+            self._build()
+
+        found = []
+
+        def visit(lo, hi):
+            while lo < hi:
+                mid = (lo + hi) // 2
+                # Nothing in this subtree ends after the query starts
+                if self._max_end[mid] <= start:
+                    return
+                visit(lo, mid)
+                # The node and its right subtree start too late
+                if self._starts[mid] >= end:
+                    return
+                if self._ends[mid] > start:
+                    found.append(self._pending[mid])
+                # Continue into the right subtree without recursing
+                lo = mid + 1
+
+        visit(0, len(self._pending))
+        return found
+
+
+class TimeWindowEngine:
+    """
+    Visibility intervals per location, queried with task time windows.
+
+    Times are in hours from the start of the planning horizon and can have
+    any resolution, e.g. 9.25 for 09:15 or 30.5 for 06:30 on the second day.
+    """
+
+    def __init__(self):
+        self._trees = {}
+        self.satellite_names = []
+        # Name -> position in satellite_names
+        self._sat_pos = {}
+
+    @classmethod
+    def from_satellites(cls, satellites, slots_per_hour=SLOTS_PER_HOUR):
+        """
+        Build the engine from satellite dicts with an 'availability_matrix'
+        or 'availability_runs'. Each run of consecutive slots seeing the same
+        location becomes one interval.
+        """
+        engine = cls()
+        slot_hours = 1.0 / slots_per_hour
+        for sat in satellites:
+            engine.add_satellite(sat["name"])
+            for start, length, location in satellite_runs(sat).tolist():
+                engine.add_visibility(sat["name"], location, start * slot_hours, (start + length) * slot_hours)
+        return engine
+
+    def add_satellite(self, name):
+        if name not in self._sat_pos:
+            self._sat_pos[name] = len(self.satellite_names)
+            self.satellite_names.append(name)
+
+    def add_visibility(self, satellite_name, location, start, end):
+        """
+        Record that `satellite_name` sees `location` during [start, end) hours.
+        """
+        self.add_satellite(satellite_name)
+        self._trees.setdefault(int(location), IntervalTree()).add(start, end, satellite_name)
+
+    def __contains__(self, satellite_name):
+        return satellite_name in self._sat_pos
+
+    def first_visibility(self, location, start, end):
+        """
+        Earliest time in [start, end) at which each satellite sees `location`.
+
+        Returns:
+            dict: {satellite_name: first_time} for the satellites that see it
+        """
+        tree = self._trees.get(int(location))
+        # An empty window can't be covered
+        if tree is None or end <= start:
+            return {}
+        first = {}
+        for vis_start, _, name in tree.overlapping(start, end):
+            time = max(vis_start, start)
+            if name not in first or time < first[name]:
+                first[name] = time
+        return first
+
+    def visible_satellites(self, location, start, end):
+        """Names of the satellites that see `location` during [start, end)."""
+        first = self.first_visibility(location, start, end)
+        return [name for name in self.satellite_names if name in first]
+
+    def feasibility(self, tasks, satellite_names=None, slots_per_hour=SLOTS_PER_HOUR):
+        """
+        Feasibility tensor for `tasks`, so the coverage helpers in utils can
+        run on intervals instead of slot arrays. First visibility times are
+        reported as slot indices at `slots_per_hour`.
+        """
+        names = list(self.satellite_names if satellite_names is None else satellite_names)
+        sat_pos = {name: i for i, name in enumerate(names)}
+        num_windows = [len(task["time_window"]) for task in tasks]
+        first_slot = np.full((len(tasks), max(num_windows, default=0), len(names)), NO_COVERAGE, dtype=np.int32)
+
+        for task_idx, task in enumerate(tasks):
+            location = int(task["location_index"])
+            for window_idx, window in enumerate(task["time_window"]):
+                first = self.first_visibility(location, window["start_time"], window["end_time"])
+                for name, time in first.items():
+                    if name in sat_pos:
+                        first_slot[task_idx, window_idx, sat_pos[name]] = math.floor(time * slots_per_hour)
+
+        return FeasibilityTable([t["id"] for t in tasks], names, num_windows, first_slot)
+
+    def subset(self, tasks, satellites):
+        """
+        Feasibility for `tasks` x `satellites`; lets the engine be passed as
+        the `feasibility` argument of the coverage helpers in utils.
+
+        Raises:
+            KeyError: If a satellite is not known to the engine
+        """
+        for sat in satellites:
+            if sat["name"] not in self:
+                raise KeyError(sat["name"])
+        return self.feasibility(tasks, [sat["name"] for sat in satellites])
@@ -10,8 +10,14 @@ Supervisor: Dr. Jianglin Qiao
 Date Created: 26/05/2025
 """
 
-import random
 import json
+import sys
+from multiprocessing import Pool
+
+import numpy as np
+
+from .availability_generator import generate_availability
+from .coverage import compute_feasibility
 
 def calculate_average_memory_utilisation(satellites):
     """
@@ -107,13 +113,36 @@ def calculate_negotiation_success_rate(stage1_results, stage2_results=None):
     if stage2_results and 'availability_checks' in stage2_results:
         total_negotiations += stage2_results['availability_checks']
 
+    # Sessions skipped by check_coalition_feasibility count as failed attempts,
+    # as they did when they were run
+    total_negotiations += stage1_results.get('prefiltered_sessions', 0)
+    if stage2_results:
+        total_negotiations += stage2_results.get('prefiltered_sessions', 0)
+
     if total_negotiations == 0:
         return 0, 0, 0
 
     success_rate = (successful_negotiations / total_negotiations) * 100
     return success_rate, successful_negotiations, total_negotiations
 
-def is_satellite_available_for_task(satellite, task):
+def _feasibility_for(tasks, satellites, feasibility=None):
+    """
+    Feasibility table for `tasks` x `satellites`, taken from a precomputed
+    source (a cached table or a TimeWindowEngine) when it covers them,
+    computed from the availability matrices otherwise.
+    """
+    if feasibility is not None:
+        try:
+            return feasibility.subset(tasks, satellites)
+        except KeyError:
+            pass
+    return compute_feasibility(tasks, satellites)
+
+def is_satellite_available_for_task(satellite, task, index=None):
+    # Answer from the scenario's inverted index when one is provided
+    if index is not None and satellite["name"] in index:
+        return index.is_available(satellite["name"], task)
+
     # Check coverage for this task and satellite
     coverage_details = check_task_coverage([task], [satellite])
     task_id = task["id"]
@@ -124,49 +153,69 @@ def is_satellite_available_for_task(satellite, task):
             return window_info["window_index"]
     return -1
 
+def check_coalition_feasibility(task, members, memory_gated=True, feasibility=None):
+    """
+    Pre-negotiation check of a coalition, so doomed sessions are never run.
+
+    Memory-gated negotiators never propose and reject every offer while their
+    satellite's available memory is below the task's memory requirement, so
+    no session with such a member can reach an agreement. With `feasibility`
+    (a FeasibilityTable or feasibility cache) the members must also cover
+    every time window of the task together.
 
-def check_task_coverage(tasks, satellites):
+    Args:
+        task: Task dict or Task object
+        members: Satellite dicts or Satellite objects, initiator first
+        memory_gated (bool): Whether the negotiators check memory (see
+                             BaseNegotiator.MEMORY_GATED)
+        feasibility: Coverage of the scenario
+
+    Returns:
+        str: "memory" or "coverage" if the session can't succeed, None otherwise
+    """
+    def field(obj, name):
+        return obj[name] if isinstance(obj, dict) else getattr(obj, name)
+
+    memory_required = field(task, "memory_required")
+    if memory_gated and any(field(sat, "available_memory") < memory_required for sat in members):
+        return "memory"
+
+    if feasibility is not None:
+        names = [field(sat, "name") for sat in members]
+        if all(name in feasibility for name in names):
+            task_dict = task if isinstance(task, dict) else {"id": task.id}
+            if not feasibility.coalition_covers(task_dict, names):
+                return "coverage"
+    return None
+
+
+def check_task_coverage(tasks, satellites, feasibility=None):
+    table = _feasibility_for(tasks, satellites, feasibility)
     results = {}
-    for task in tasks:
-        task_id = task["id"]
-        task_loc = int(task["location_index"])
+    for task_idx, task in enumerate(tasks):
         task_result = {
             "time_windows_coverage": [],
             "fully_covered": True
         }
 
         for window_index, window in enumerate(task["time_window"]):
-            start = window["start_time"]
-            end = window["end_time"]
-            start_slot = start * 4
-            end_slot = end * 4
-            window_covered = False
-            covered_slots = []
-            covered_satellites = []
-
-            for slot in range(start_slot, end_slot):
-                for satellite in satellites:
-                    if satellite["availability_matrix"][slot] == task_loc:
-                        window_covered = True
-                        covered_slots.append(slot)
-                        covered_satellites.append(satellite["name"])
-                        break  # Stop checking satellites for this slot
-                if window_covered:
-                    break  # Stop checking slots if coverage found
+            # Earliest covered slot and the first satellite covering it
+            slot, sat_name = table.earliest_coverage(task_idx, window_index)
+            window_covered = slot is not None
 
             if not window_covered:
                 task_result["fully_covered"] = False
 
             task_result["time_windows_coverage"].append({
                 "window_index": window_index,
-                "start_time": start,
-                "end_time": end,
+                "start_time": window["start_time"],
+                "end_time": window["end_time"],
                 "covered": window_covered,
-                "covered_slots": covered_slots,
-                "covered_satellites": covered_satellites
+                "covered_slots": [slot] if window_covered else [],
+                "covered_satellites": [sat_name] if window_covered else []
             })
 
-        results[task_id] = task_result
+        results[task["id"]] = task_result
     return results
 
 def format_coverage_array(coverage):
@@ -189,7 +238,7 @@ def format_coverage_array(coverage):
             rows.append(",".join(map(str, row)))
     return "\n".join(rows)
 
-def generate_coverage_array(tasks, assignments_list):
+def generate_coverage_array(tasks, assignments_list, seed=None, quiet=False):
     """
     Generates multiple 96-slot coverage arrays by placing task locations in random slots
     within their specified time windows.
@@ -199,134 +248,196 @@ def generate_coverage_array(tasks, assignments_list):
         assignments_list (list): List of assignment lists, where each assignment list contains
                                dictionaries of {"task_id": X, "tw_id": Y} specifying which
                                time window indices to use for each task
+        seed (int): Seed for reproducible arrays
+        quiet (bool): Don't print the generated arrays
 
     Returns:
         list: List of 96-element arrays, each representing coverage for one assignment list
     """
-    task_dict = {task["id"]: task for task in tasks}  # Faster lookup
-    coverage_arrays = []
-
-    for assignments in assignments_list:
-        coverage = [0] * 96  # Initialize all slots to 0 (no coverage)
+    coverage_arrays = generate_availability(tasks, assignments_list, seed).tolist()
 
-        for assignment in assignments:
-            task = task_dict.get(assignment["task_id"])
-            if not task:
-                continue
-
-            try:
-                window = task["time_window"][assignment["tw_id"]]
-            except IndexError:
-                continue  # Skip invalid time window indices
-
-            start_slot = window["start_time"] * 4
-            end_slot = window["end_time"] * 4
-
-            # Validate slot range
-            if 0 <= start_slot < end_slot <= 96:
-                # Pick a random 15-minute slot in this window
-                chosen_slot = random.randint(start_slot, end_slot - 1)
-                coverage[chosen_slot] = int(task["location_index"])
-
-        coverage_arrays.append(coverage)
-
-        # Print formatted coverage array
-        print(f"\nCoverage Array {len(coverage_arrays)}:")
-        print(format_coverage_array(coverage))
+    if not quiet:
+        for i, coverage in enumerate(coverage_arrays):
+            # Print formatted coverage array
+            print(f"\nCoverage Array {i + 1}:")
+            print(format_coverage_array(coverage))
 
     return coverage_arrays
 
-def interpret_satellite_availability(satellite, tasks):
+def interpret_satellite_availability(satellite, tasks, feasibility=None):
     """
     For a given satellite and list of tasks, outputs which task's which time window(s)
     this satellite is available for, including location and time window indices.
     """
+    table = _feasibility_for(tasks, [satellite], feasibility)
+    covered = table.covered[:, :, 0]
     results = {}
-    availability = satellite["availability_matrix"]
 
-    for task in tasks:
-        task_id = task["id"]
+    for task_idx, task in enumerate(tasks):
         location_index = int(task["location_index"])
-        results[task_id] = []
-
-        for tw_idx, window in enumerate(task["time_window"]):
-            start_slot = window["start_time"] * 4
-            end_slot = window["end_time"] * 4
-            # Check if any slot in this window matches the task's location
-            for slot in range(start_slot, end_slot):
-                if availability[slot] == location_index:
-                    results[task_id].append({
-                        "time_window_index": tw_idx,
-                        "location_index": location_index,
-                        "time_window": {"start_time": window["start_time"], "end_time": window["end_time"]}
-                    })
-                    break  # Only need to report the window once if any slot matches
-
-        # Remove empty entries for tasks with no available windows
-        if not results[task_id]:
-            results.pop(task_id)
+        windows = [
+            {
+                "time_window_index": tw_idx,
+                "location_index": location_index,
+                "time_window": {"start_time": window["start_time"], "end_time": window["end_time"]}
+            }
+            for tw_idx, window in enumerate(task["time_window"])
+            if covered[task_idx, tw_idx]
+        ]
+
+        # Tasks with no available windows are left out
+        if windows:
+            results[task["id"]] = windows
 
     return results
 
-def generate_coverage_markdown_table(satellites, tasks):
+def format_coverage_cell(sat_indices, satellite_names, cell_format="names"):
     """
-    Generates a Markdown table showing which satellites cover each time window of each task.
-    Each row: task id | satellites for time_window[0] | satellites for time_window[1] | ...
+    Format the satellites covering one time window.
+
+    Args:
+        sat_indices (list): Sorted indices (into the satellite list) of the covering satellites
+        satellite_names (list): All satellite names
+        cell_format (str): "names" - comma-separated names,
+                           "count" - number of covering satellites,
+                           "ranges" - satellite index ranges, e.g. "0-3,7,9-12"
+
+    Returns:
+        str: The cell, "-" if no satellite covers the window
     """
-    max_windows = max(len(task["time_window"]) for task in tasks)
-    header = ["Task ID"] + [f"Time Window {i}" for i in range(max_windows)]
-    md_lines = [" | ".join(header), " | ".join(["---"] * len(header))]
+    if not sat_indices:
+        return "-"
+    if cell_format == "count":
+        return str(len(sat_indices))
+    if cell_format == "ranges":
+        ranges = []
+        start = prev = sat_indices[0]
+        for idx in sat_indices[1:] + [None]:
+            if idx is not None and idx == prev + 1:
+                prev = idx
+                continue
+            ranges.append(str(start) if start == prev else f"{start}-{prev}")
+            start = prev = idx
+        return ",".join(ranges)
+    return ", ".join(satellite_names[idx] for idx in sat_indices)
 
-    for task in tasks:
+def _coverage_rows_chunk(satellites, tasks, max_windows, feasibility=None, cell_format="names"):
+    """
+    Coverage table rows for one chunk of tasks.
+    """
+    table = _feasibility_for(tasks, satellites, feasibility)
+    satellite_names = [sat["name"] for sat in satellites]
+    covered = table.covered
+    rows = []
+    for task_idx, task in enumerate(tasks):
         row = [str(task["id"])]
-        task_loc = int(task["location_index"])
-        num_windows = len(task["time_window"])
-
         for tw_idx in range(max_windows):
-            if tw_idx < num_windows:
-                window = task["time_window"][tw_idx]
-                start_slot = window["start_time"] * 4
-                end_slot = window["end_time"] * 4
-                covering_sats = [
-                    sat["name"]
-                    for sat in satellites
-                    if any(sat["availability_matrix"][slot] == task_loc for slot in range(start_slot, end_slot))
-                ]
-                row.append(", ".join(covering_sats) if covering_sats else "-")
+            if tw_idx < covered.shape[1]:
+                sat_indices = np.flatnonzero(covered[task_idx, tw_idx]).tolist()
             else:
-                row.append("-")
-        md_lines.append(" | ".join(row))
+                sat_indices = []
+            row.append(format_coverage_cell(sat_indices, satellite_names, cell_format))
+        rows.append(row)
+    return rows
+
+# Per-process state of the coverage table workers, set once by the pool initializer
+_coverage_worker_args = None
+
+def _init_coverage_worker(satellites, max_windows, cell_format):
+    global _coverage_worker_args
+    _coverage_worker_args = (satellites, max_windows, cell_format)
+
+def _coverage_worker(tasks):
+    satellites, max_windows, cell_format = _coverage_worker_args
+    return _coverage_rows_chunk(satellites, tasks, max_windows, cell_format=cell_format)
+
+def coverage_table_headers(tasks):
+    """Task ID | Time Window 0 | Time Window 1 | ..."""
+    max_windows = max(len(task["time_window"]) for task in tasks)
+    return ["Task ID"] + [f"Time Window {i}" for i in range(max_windows)]
+
+def iter_coverage_rows(satellites, tasks, feasibility=None, cell_format="names", chunk_size=256, processes=None):
+    """
+    Yield the coverage table rows one at a time, in task order.
+
+    Tasks are processed in chunks of `chunk_size`, so only one chunk's
+    feasibility is held in memory at a time. With `processes` > 1 the chunks
+    are sharded over a process pool (each worker receives the satellites
+    once); a precomputed `feasibility` is always read in this process.
+
+    Yields:
+        list: task id | cell for time_window[0] | cell for time_window[1] | ...
+    """
+    max_windows = len(coverage_table_headers(tasks)) - 1
+    chunks = [tasks[i:i + chunk_size] for i in range(0, len(tasks), chunk_size)]
+
+    if processes is not None and processes > 1 and feasibility is None and len(chunks) > 1:
+        with Pool(processes, initializer=_init_coverage_worker,
+                  initargs=(satellites, max_windows, cell_format)) as pool:
+            for rows in pool.imap(_coverage_worker, chunks):
+                yield from rows
+        return
+
+    for chunk in chunks:
+        yield from _coverage_rows_chunk(satellites, chunk, max_windows, feasibility, cell_format)
+
+def write_coverage_table(satellites, tasks, out=None, table_format="markdown", feasibility=None,
+                         cell_format="names", chunk_size=256, processes=None):
+    """
+    Stream the coverage table to `out` (stdout by default) as rows are computed.
+
+    Args:
+        table_format (str): "markdown", or "console" for space-padded columns.
+            Column widths can't be known before the last row, so streamed
+            console columns are padded to the header width only.
+        cell_format (str): See format_coverage_cell
+
+    Returns:
+        int: Number of rows written
+    """
+    out = sys.stdout if out is None else out
+    headers = coverage_table_headers(tasks)
+    rows = iter_coverage_rows(satellites, tasks, feasibility, cell_format, chunk_size, processes)
+
+    out.write(" | ".join(headers) + "\n")
+    if table_format == "console":
+        widths = [len(header) for header in headers]
+        out.write("-+-".join("-" * width for width in widths) + "\n")
+    else:
+        widths = [0] * len(headers)
+        out.write(" | ".join(["---"] * len(headers)) + "\n")
+
+    count = 0
+    for row in rows:
+        out.write(" | ".join(cell.ljust(width) for cell, width in zip(row, widths)) + "\n")
+        count += 1
+    out.flush()
+    return count
+
+def _coverage_table_rows(satellites, tasks, feasibility=None):
+    """
+    Build the header and rows shared by the coverage table generators.
+    Each row: task id | satellites for time_window[0] | satellites for time_window[1] | ...
+    """
+    return coverage_table_headers(tasks), list(iter_coverage_rows(satellites, tasks, feasibility))
+
+def generate_coverage_markdown_table(satellites, tasks, feasibility=None):
+    """
+    Generates a Markdown table showing which satellites cover each time window of each task.
+    Each row: task id | satellites for time_window[0] | satellites for time_window[1] | ...
+    """
+    header, rows = _coverage_table_rows(satellites, tasks, feasibility)
+    md_lines = [" | ".join(header), " | ".join(["---"] * len(header))]
+    md_lines.extend(" | ".join(row) for row in rows)
 
     return "\n".join(md_lines)
 
-def generate_coverage_console_table(satellites, tasks):
+def generate_coverage_console_table(satellites, tasks, feasibility=None):
     """
     Prints a console-friendly table showing which satellites cover each time window of each task.
     Each row: task id | satellites for time_window[0] | satellites for time_window[1] | ...
     """
-    max_windows = max(len(task["time_window"]) for task in tasks)
-    headers = ["Task ID"] + [f"Time Window {i}" for i in range(max_windows)]
-
-    data = []
-    for task in tasks:
-        row = [str(task["id"])]
-        task_loc = int(task["location_index"])
-        num_windows = len(task["time_window"])
-        for tw_idx in range(max_windows):
-            if tw_idx < num_windows:
-                window = task["time_window"][tw_idx]
-                start_slot = window["start_time"] * 4
-                end_slot = window["end_time"] * 4
-                covering_sats = [
-                    sat["name"]
-                    for sat in satellites
-                    if any(sat["availability_matrix"][slot] == task_loc for slot in range(start_slot, end_slot))
-                ]
-                cell = ", ".join(covering_sats) if covering_sats else "-"
-                row.append(cell)
-            else:
-                row.append("-")
-        data.append(row)
+    headers, data = _coverage_table_rows(satellites, tasks, feasibility)
 
     col_widths = [max(len(str(cell)) for cell in col) for col in zip(headers, *data)]
 
@@ -338,42 +449,28 @@ def generate_coverage_console_table(satellites, tasks):
     for row in data:
         print(format_row(row))
 
-def check_task_coverage_detailed(tasks, satellites):
+def check_task_coverage_detailed(tasks, satellites, feasibility=None):
+    covered = _feasibility_for(tasks, satellites, feasibility).covered.any(axis=2)
     results = {}
-    for task in tasks:
-        task_id = task["id"]
-        task_loc = int(task["location_index"])
+    for task_idx, task in enumerate(tasks):
         task_result = {
             "time_windows_coverage": [],
             "fully_covered": True
         }
         for window_index, window in enumerate(task["time_window"]):
-            start = window["start_time"]
-            end = window["end_time"]
-            start_slot = start * 4
-            end_slot = end * 4
-            window_covered = False
-            for slot in range(start_slot, end_slot):
-                slot_covered = False
-                for satellite in satellites:
-                    if satellite["availability_matrix"][slot] == task_loc:
-                        slot_covered = True
-                        break
-                if slot_covered:
-                    window_covered = True
-                    break
+            window_covered = bool(covered[task_idx, window_index])
             if not window_covered:
                 task_result["fully_covered"] = False
             task_result["time_windows_coverage"].append({
                 "window_index": window_index,
-                "start_time": start,
-                "end_time": end,
+                "start_time": window["start_time"],
+                "end_time": window["end_time"],
                 "covered": window_covered
             })
-        results[task_id] = task_result
+        results[task["id"]] = task_result
     return results
 
-def generate_coalition_table(initiator_name, satellites, tasks):
+def generate_coalition_table(initiator_name, satellites, tasks, feasibility=None):
     """
     For each task, find all satellites (excluding initiator) that, together with the initiator,
     can fully cover all time windows. Rank partners by memory_capacity (descending).
@@ -388,21 +485,23 @@ def generate_coalition_table(initiator_name, satellites, tasks):
         "satellite": initiator_name,
         "preferences": []
     }
-    # Exclude initiator from partners
-    partners = [sat for sat in satellites if sat["name"] != initiator_name]
-    for task in tasks:
-        partner_candidates = []
-        for partner in partners:
-            sats_for_check = [initiator, partner]
-            coverage = check_task_coverage_detailed([task], sats_for_check)
-            if coverage[task["id"]]["fully_covered"]:
-                partner_candidates.append(partner)
-        # Sort by memory_capacity descending
-        partner_candidates.sort(key=lambda s: s["memory_capacity"], reverse=True)
-        for priority, partner in enumerate(partner_candidates, start=1):
+    # A pair fully covers a task when the OR of their window bitmasks has every window set
+    table = _feasibility_for(tasks, satellites, feasibility)
+    masks = table.window_masks()
+    full = table.full_window_masks()
+    initiator_idx = next(i for i, sat in enumerate(satellites) if sat["name"] == initiator_name)
+
+    # Exclude initiator from partners, rank by memory_capacity descending (stable)
+    partners = [i for i, sat in enumerate(satellites) if sat["name"] != initiator_name]
+    partners.sort(key=lambda i: satellites[i]["memory_capacity"], reverse=True)
+    partners = np.asarray(partners, dtype=np.int64)
+
+    covers = (masks[:, [initiator_idx]] | masks[:, partners]) == full[:, None]
+    for task_idx, task in enumerate(tasks):
+        for priority, partner_idx in enumerate(partners[covers[task_idx]].tolist(), start=1):
             coalition_table["preferences"].append({
                 "task_id": task["id"],
-                "preferred_satellites": [partner["name"]],
+                "preferred_satellites": [satellites[partner_idx]["name"]],
                 "priority": priority
             })
     # Print with double quotes using json
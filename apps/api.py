@@ -21,7 +21,9 @@ import os
 from nego_app import create_results_dict, write_negotiation_results
 from MultiSatellitesNego.task_generator import create_tasks, Task
 from MultiSatellitesNego.satellite_generator import create_satellites, Satellite
-from MultiSatellitesNego.coalition_generator import generate_coalition_tables, CoalitionTable, CoalitionPreference
+from MultiSatellitesNego.coalition_generator import (
+    generate_coalition_tables, CoalitionTable, CoalitionPreference, CompactCoalitionTable
+)
 from MultiSatellitesNego.negotiators import get_negotiator, NEGOTIATOR_REGISTRY
 from MultiSatellitesNego.negotiation_config import SIMPLE_CITIES
 
@@ -72,6 +74,16 @@ class SaveDataRequest(BaseModel):
 class LoadDataRequest(BaseModel):
     filename: str
 
+def task_dict(task):
+    """A Task in the scenario JSON format, as the front end and saved data use it."""
+    return {
+        "id": task.id,
+        "location_index": task.location_index,
+        "time_window": task.time_window,
+        "reward_points": task.reward_points,
+        "memory_required": task.memory_required
+    }
+
 @app.get("/")
 async def root():
     return {"message": "Welcome to the Satellite Negotiation API"}
@@ -122,16 +134,7 @@ async def create_tasks_endpoint(request: NegotiationRequest):
         tasks = create_tasks(num_tasks=request.num_tasks, cities=SIMPLE_CITIES)
         app.tasks = tasks
 
-        tasks_dict = [
-            {
-                "id": task.id,
-                "location_index": task.location_index,
-                "time_window": task.time_window,
-                "reward_points": task.reward_points,
-                "memory_required": task.memory_required
-            }
-            for task in tasks
-        ]
+        tasks_dict = [task_dict(task) for task in tasks]
 
         return TaskResponse(
             message="Tasks created successfully",
@@ -272,17 +275,7 @@ async def save_data(request: SaveDataRequest):
                 }
                 for sat in app.satellites
             ],
-            "tasks": [
-                {
-                    "id": task.id,
-                    "location": task.location,
-                    "start_time": task.start_time,
-                    "duration": task.duration,
-                    "reward_points": task.reward_points,
-                    "memory_required": task.memory_required
-                }
-                for task in app.tasks
-            ]
+            "tasks": [task_dict(task) for task in app.tasks]
         }
 
         # Ensure the data directory exists
@@ -310,9 +303,8 @@ async def load_data(request: LoadDataRequest):
         for task_data in data["tasks"]:
             task = Task(
                 id=task_data["id"],
-                location=task_data["location"],
-                start_time=task_data["start_time"],
-                duration=task_data["duration"],
+                location_index=task_data["location_index"],
+                time_window=task_data["time_window"],
                 reward_points=task_data["reward_points"],
                 memory_required=task_data["memory_required"]
             )
@@ -323,13 +315,17 @@ async def load_data(request: LoadDataRequest):
         for sat_data in data["satellites"]:
             satellite = Satellite(
                 name=sat_data["name"],
-                memory_capacity=sat_data["memory_capacity"]
+                memory_capacity=sat_data["memory_capacity"],
+                available_memory=sat_data.get("available_memory", sat_data["memory_capacity"])
             )
             satellites.append(satellite)
         app.satellites = satellites
 
         coalition_tables = {}
         for sat_data in data["satellites"]:
+            # The front end works with the dict view of compact tables
+            if "members" in sat_data["coalition_table"]:
+                sat_data["coalition_table"] = CompactCoalitionTable.from_dict(sat_data["coalition_table"]).to_dict()
             preferences = []
             for pref_data in sat_data["coalition_table"]["preferences"]:
                 preference = CoalitionPreference(
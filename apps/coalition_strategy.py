@@ -15,7 +15,7 @@ import sys
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from negmas import SAOMechanism, TimeBasedConcedingNegotiator, AspirationNegotiator, SAONegotiator, ResponseType
+from negmas import TimeBasedConcedingNegotiator, AspirationNegotiator, SAONegotiator, ResponseType
 from negmas.preferences import LinearAdditiveUtilityFunction as LUFun
 from negmas.preferences.value_fun import LinearFun, IdentityFun, AffineFun
 from negmas.preferences.crisp.mapping import MappingUtilityFunction
@@ -27,12 +27,20 @@ from negmas import PolyAspiration, PresortingInverseUtilityFunction, Preferences
 from MultiSatellitesNego.negotiators.v05 import NegotiatorV05
 from MultiSatellitesNego.satellite import Satellite
 from MultiSatellitesNego.task import Task
+from MultiSatellitesNego.coalition import CompactCoalitionTable
+from MultiSatellitesNego.partner_ranking import PartnerRanking
 from MultiSatellitesNego.negotiators import get_negotiator, NEGOTIATOR_REGISTRY
+from MultiSatellitesNego.feasibility_cache import load_feasibility
+from MultiSatellitesNego.scenario import load_scenario
+from MultiSatellitesNego.session_cache import SessionCache, run_cached_session
+from MultiSatellitesNego.bilateral_mechanism import make_session
+from MultiSatellitesNego.cli import flag_value
 from MultiSatellitesNego.utils import (
     calculate_average_memory_utilisation,
     calculate_average_reward,
     calculate_average_negotiation_rounds,
     calculate_negotiation_success_rate,
+    check_coalition_feasibility,
     calculate_task_allocation_success_rate
 )
 
@@ -41,7 +49,22 @@ import sys
 
 PRINT_DEBUG = False
 
-def run_negotiations(negotiator_version, satellites, tasks, plot=False, n_steps=20):
+def run_negotiations(negotiator_version, satellites, tasks, plot=False, n_steps=20, live_ranking=False,
+                     feasibility=None, session_cache=None, mechanism="sao"):
+    """
+    Run every initiator's coalition negotiations.
+
+    The coalitions of a task are tried in the coalition table's order, or
+    with live_ranking in order of the partners' current available memory
+    (see partner_ranking.py). Coalitions with a member short of memory can't
+    reach an agreement and are skipped without a session, as are, with
+    `feasibility`, coalitions whose members miss one of the task's windows;
+    both are counted as 'prefiltered_sessions'. With a `session_cache`
+    (session_cache.SessionCache) sessions of deterministic negotiators that
+    were run before are not run again.
+    With mechanism "bilateral" two-party sessions run on bilateral_mechanism.py's
+    BilateralMechanism instead of SAOMechanism.
+    """
 
     print("\nNegotiations Starting")
 
@@ -50,18 +73,21 @@ def run_negotiations(negotiator_version, satellites, tasks, plot=False, n_steps=
     allocated_tasks = set()
 
     negotiation_results = []
+    prefiltered_sessions = 0
+
+    # Either JSON form; the compact table is already grouped by task and ranked
+    tables = {sat['name']: CompactCoalitionTable.from_dict(sat['coalition_table']) for sat in satellites}
+    ranking = None
+    if live_ranking:
+        ranking = PartnerRanking({s['name']: s['available_memory'] for s in satellites})
+        for table in tables.values():
+            ranking.add_table(table)
 
     for sat in satellites:
         print(f"\n=== Running negotiations with {sat['name']} as initiator ===")
-        initiator_table = sat['coalition_table']
-
-        task_preferences = {}
-        for pref in initiator_table['preferences']:
-            if pref['task_id'] not in task_preferences:
-                task_preferences[pref['task_id']] = []
-            task_preferences[pref['task_id']].append(pref)
+        initiator_table = tables[sat['name']]
 
-        for task_id, prefs in sorted(task_preferences.items()):
+        for task_id in sorted(initiator_table.task_ids):
             # Skip if task has already been allocated
             if task_id in allocated_tasks:
                 print(f"Task {task_id} already allocated, skipping...")
@@ -78,66 +104,94 @@ def run_negotiations(negotiator_version, satellites, tasks, plot=False, n_steps=
                 "negotiations": []
             }
 
-            required_satellites = 2
-            # Try each coalition in order of priority
-            for pref in sorted(prefs, key=lambda p: p['priority']):
+            # Try each coalition in order of priority. Coalitions can have any
+            # number of partners (see coalition_finder.py)
+            if ranking is not None:
+                coalitions = ranking.candidates(sat['name'], task_id)
+            else:
+                coalitions = initiator_table.candidates(task_id)
+            for preferred_satellites in coalitions:
+                initiator = sat
+                partners = []
+                for partner_id in preferred_satellites:
+                    partner = next((s for s in satellites if s['name'] == partner_id), None)
+                    if partner:
+                        partners.append(partner)
+                if not partners:
+                    continue
 
-                # This check... more thinking needed
-                if len(pref['preferred_satellites']) + 1 != required_satellites:
+                # Skip sessions that are doomed from the start
+                reason = check_coalition_feasibility(
+                    task, [initiator] + partners, negotiator_class.MEMORY_GATED, feasibility
+                )
+                if reason is not None:
+                    print(f"Task {task_id}: skipping {initiator['name']} vs {preferred_satellites} - infeasible ({reason})")
+                    prefiltered_sessions += 1
                     continue
 
-                session = SAOMechanism(issues=negotiator_class.negotiator_issues, n_steps=n_steps)
-                initiator = sat
                 initiator_negotiator = negotiator_class(Satellite(**initiator), Task(**task))
-                session.add(initiator_negotiator, ufun=negotiator_class.initiator_ufun)
 
                 # Add all partners in the coalition with task information
-                # At this stage, only one partner
                 partner_negotiators = []
-                for partner_id in pref['preferred_satellites']:
-                    partner = next((s for s in satellites if s['name'] == partner_id), None)
-                    if partner:
-                        partner_negotiator = negotiator_class(Satellite(**partner), Task(**task))
-                        partner_negotiators.append(partner_negotiator)
+                for partner in partners:
+                    partner_negotiator = negotiator_class(Satellite(**partner), Task(**task))
+                    partner_negotiators.append(partner_negotiator)
+                print(f"Task {task_id}: {initiator['name']} vs {preferred_satellites}")
+
+                def run_session():
+                    session = make_session(mechanism, negotiator_class.negotiator_issues, n_steps,
+                                           n_negotiators=1 + len(partner_negotiators))
+                    session.add(initiator_negotiator, ufun=negotiator_class.initiator_ufun)
+                    for partner_negotiator in partner_negotiators:
                         session.add(partner_negotiator, ufun=negotiator_class.partner_ufun)
-                print(f"Task {task_id}: {initiator['name']} vs {pref['preferred_satellites']}")
+                    return session.run()
 
-                result = session.run()
-                agreement = session.state.agreement is not None
+                outcome = run_cached_session(
+                    session_cache, negotiator_class, task, [initiator] + partners, n_steps, run_session
+                )
+                agreement = outcome.agreement is not None
 
                 negotiation_result = {
                     'task_id': task_id,
                     'initiator': initiator['name'],
-                    'partners': pref['preferred_satellites'],
+                    'partners': preferred_satellites,
                     'agreement_reached': agreement,
-                    'rounds': session.state.step
+                    'rounds': outcome.step
                 }
                 negotiation_results.append(negotiation_result)
 
                 if agreement:
-                    print(f"Agreement achieved: {session.state.agreement} - {initiator_negotiator} and {partner_negotiator}")
+                    print(f"Agreement achieved: {outcome.agreement} - {initiator_negotiator} and {', '.join(str(n) for n in partner_negotiators)}")
 
-                    # Calculate new memory for initiator and partner
+                    # Calculate new memory for initiator and partners; the
+                    # partners share the rest of the task equally
                     current_memory_init = float(initiator['available_memory'])
-                    current_memory_part = float(partner['available_memory'])
                     task_memory = float(task['memory_required'])
-                    memory_percentage_init = float(session.state.agreement[1] / 100)
+                    memory_percentage_init = float(outcome.agreement[1] / 100)
+                    memory_per_partner = task_memory * (1 - memory_percentage_init) / len(partners)
                     new_memory_init = round(current_memory_init - task_memory * memory_percentage_init)
-                    new_memory_part = round(current_memory_part - task_memory * (1 - memory_percentage_init))
 
                     # Update satellite's available memory in the original list
                     initiator['available_memory'] = new_memory_init
-                    partner['available_memory'] = new_memory_part
-
                     # Also update the negotiator objects for consistency
                     initiator_negotiator.satellite.available_memory = new_memory_init
-                    partner_negotiator.satellite.available_memory = new_memory_part
+                    for partner, partner_negotiator in zip(partners, partner_negotiators):
+                        new_memory_part = round(float(partner['available_memory']) - memory_per_partner)
+                        partner['available_memory'] = new_memory_part
+                        partner_negotiator.satellite.available_memory = new_memory_part
 
                     # Update rewards
-                    initiator_reward = (float(session.state.agreement[0]) / 100) * float(task["reward_points"])
-                    partner_reward = float(task["reward_points"]) - initiator_reward
+                    initiator_reward = (float(outcome.agreement[0]) / 100) * float(task["reward_points"])
+                    partner_reward = (float(task["reward_points"]) - initiator_reward) / len(partners)
                     initiator['accumulated_reward'] += round(initiator_reward)
-                    partner['accumulated_reward'] += round(partner_reward)
+                    for partner in partners:
+                        partner['accumulated_reward'] += round(partner_reward)
+
+                    # Drained partners move down the other tasks' rankings
+                    if ranking is not None:
+                        for member in [initiator] + partners:
+                            ranking.update_memory(member['name'], member['available_memory'])
+                        ranking.discard_task(task_id)
 
                     # Mark task as allocated
                     allocated_tasks.add(task_id)
@@ -145,24 +199,38 @@ def run_negotiations(negotiator_version, satellites, tasks, plot=False, n_steps=
 
     return {
         'negotiation_results': negotiation_results,
-        'allocated_tasks': allocated_tasks
+        'allocated_tasks': allocated_tasks,
+        'prefiltered_sessions': prefiltered_sessions
     }
 
 def main():
     if len(sys.argv) < 2:
-        print("Usage: python coalition_strategy.py <path_to_json_file>")
+        print("Usage: python coalition_strategy.py <path_to_json_file> [--max-partners K|all] [--live-ranking] "
+              "[--session-cache PATH | --no-session-cache] [--mechanism sao|bilateral] [--coverage-prefilter]")
         sys.exit(1)
 
     json_file = sys.argv[1]
     setup_name = os.path.basename(json_file).replace('.json', '')
 
     PRINT_DEBUG = any(flag in sys.argv for flag in ["--debug", "-d"])
-    with open(json_file, 'r') as file:
-        data = json.load(file)
+    data = load_scenario(json_file)
 
     tasks = data['tasks']
     satellites = data['satellites']
 
+    # Satellites without a coalition table get one derived from the cached coverage.
+    # With --max-partners every table is rebuilt with coalitions of up to K partners
+    max_partners = None
+    if "--max-partners" in sys.argv:
+        value = flag_value("--max-partners", "all")
+        max_partners = None if value == "all" else int(value)
+    feasibility = load_feasibility(json_file, data)
+    for sat in satellites:
+        if "--max-partners" in sys.argv:
+            sat['coalition_table'] = feasibility.coalition_table(sat['name'], max_partners=max_partners)
+        elif 'coalition_table' not in sat:
+            sat['coalition_table'] = feasibility.coalition_table(sat['name'])
+
     print("\n--- Task Information ---")
     for t in tasks:
         print(f"Task {t['id']}: Memory Required: {t['memory_required']}")
@@ -171,7 +239,24 @@ def main():
     for sat in satellites:
         print(f"{sat['name']}: Memory Capacity: {sat['available_memory']}")
 
-    results = run_negotiations("v05", satellites, tasks)
+    # Outcomes of deterministic sessions, kept on disk across runs with --session-cache
+    session_cache = None
+    if "--no-session-cache" not in sys.argv:
+        session_cache = SessionCache(path=flag_value("--session-cache"))
+
+    mechanism = flag_value("--mechanism", "sao")
+
+    # Coalitions of the hand-made tables don't always cover every window, but
+    # their sessions can still agree, so the coverage check is opt-in
+    coverage_prefilter = feasibility if "--coverage-prefilter" in sys.argv else None
+
+    # Reordering the coalitions by available memory changes which ones agree,
+    # so the coalition tables' own order stays the default
+    results = run_negotiations("v05", satellites, tasks, live_ranking="--live-ranking" in sys.argv,
+                               feasibility=coverage_prefilter, session_cache=session_cache, mechanism=mechanism)
+    if session_cache is not None:
+        session_cache.save()
+        print(f"\nSession cache: {session_cache.hits} hits, {session_cache.misses} misses")
 
     # Calculate and display memory utilization metrics
     avg_utilisation, total_used, total_available = calculate_average_memory_utilisation(satellites)
@@ -199,6 +284,7 @@ def main():
     print("\n--- Negotiation Success Rate Metrics ---")
     print(f"Total Negotiations: {total_negotiations}")
     print(f"Successful Negotiations: {successful_negotiations}")
+    print(f"Prefiltered (Infeasible) Sessions: {results['prefiltered_sessions']}")
     print(f"Success Rate: {success_rate:.2f}%")
 
     # Calculate and display task allocation success rate metrics
@@ -229,7 +315,8 @@ def main():
                 "average_rounds": avg_rounds,
                 "success_rate": success_rate,
                 "successful_negotiations": successful_negotiations,
-                "total_negotiations": total_negotiations
+                "total_negotiations": total_negotiations,
+                "prefiltered_sessions": results['prefiltered_sessions']
             },
             "task_allocation": {
                 "success_rate": task_success_rate,
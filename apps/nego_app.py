@@ -16,7 +16,6 @@ import sys
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from negmas import (
-    SAOMechanism,
     SAONegotiator,
     MappingUtilityFunction,
     Issue,
@@ -28,8 +27,11 @@ from MultiSatellitesNego.negotiation_config import ISSUES, SIMPLE_CITIES
 from MultiSatellitesNego.negotiation_config import INITIATOR_UTILITY, PARTNER_UTILITY
 from MultiSatellitesNego.task_generator import create_tasks
 from MultiSatellitesNego.satellite_generator import create_satellites
-from MultiSatellitesNego.negotiators import get_negotiator, NEGOTIATOR_REGISTRY
+from MultiSatellitesNego.negotiators import get_negotiator, NEGOTIATOR_REGISTRY, RECORDING_LEVELS
+from MultiSatellitesNego.negotiators.outcome_grid import parse_grid
 from MultiSatellitesNego.coalition_generator import generate_coalition_tables
+from MultiSatellitesNego.utils import check_coalition_feasibility
+from MultiSatellitesNego.bilateral_mechanism import MECHANISMS, make_session
 from datetime import datetime
 import matplotlib.pyplot as plt
 import json
@@ -80,12 +82,13 @@ def create_results_dict(tasks, satellites, coalition_table, task_preferences):
                 for pref in coalition_table.preferences
             ]
         },
-        "negotiation_results": []
+        "negotiation_results": [],
+        "prefiltered_sessions": 0
     }
 
     return results_dict
 
-def write_negotiation_results(cls, results_dict, task_preferences, tasks, satellites, plot=False, n_steps: int = 10):
+def write_negotiation_results(cls, results_dict, task_preferences, tasks, satellites, plot=False, n_steps: int = 10, mechanism: str = "sao"):
 
     for task_id, prefs in sorted(task_preferences.items()):
         task = next((t for t in tasks if t.id == task_id), None)
@@ -99,26 +102,30 @@ def write_negotiation_results(cls, results_dict, task_preferences, tasks, satell
             "negotiations": []
         }
 
-        # Get the task's required number of satellites
-        # This needs to be calculated properly instead of being hard-coded.
-        # The easist set up could be each task time window one satellite, so
-        # required_satellites = (number of time windows)
-        required_satellites = 2
-
-        # Try each coalition in order of priority
+        # Try each coalition in order of priority. Coalitions can have any
+        # number of partners (see coalition_finder.py)
         for pref in sorted(prefs, key=lambda p: p.priority):
-            if len(pref.preferred_satellites) + 1 != required_satellites:
-                continue
-
-            # Create negotiation session with specified number of steps
-            # The issues argument probabaly should be the negotiator's issues - see traditional_strategy.py
-            session = SAOMechanism(issues=ISSUES, n_steps=n_steps)
 
             # Get the initiator satellite from the coalition table
             initiator_name = results_dict["coalition_table"]["satellite"]
             initiator = next((s for s in satellites if s.name == initiator_name), None)
             if not initiator:
                 continue
+            partners = [s for s in satellites if s.name in pref.preferred_satellites]
+            if not partners:
+                continue
+
+            # Skip sessions that are doomed from the start
+            reason = check_coalition_feasibility(task, [initiator] + partners, cls.MEMORY_GATED)
+            if reason is not None:
+                print(f"Task {task_id}: skipping {initiator_name} vs {pref.preferred_satellites} - infeasible ({reason})")
+                results_dict["prefiltered_sessions"] += 1
+                continue
+
+            # Create negotiation session with specified number of steps
+            # The issues argument probabaly should be the negotiator's issues - see traditional_strategy.py
+            # Plotting needs SAOMechanism's trace, and sessions with several partners run on it anyway
+            session = make_session("sao" if plot else mechanism, ISSUES, n_steps, n_negotiators=1 + len(partners))
 
             # Add initiator with task information
             initiator_negotiator = cls(initiator, task)
@@ -127,7 +134,7 @@ def write_negotiation_results(cls, results_dict, task_preferences, tasks, satell
             # Add all partners in the coalition with task information
             partner_negotiators = []
             for partner_id in pref.preferred_satellites:
-                partner = next((s for s in satellites if s.name == partner_id), None)
+                partner = next((s for s in partners if s.name == partner_id), None)
                 if partner:
                     partner_negotiator = cls(partner, task)
                     partner_negotiators.append(partner_negotiator)
@@ -141,38 +148,42 @@ def write_negotiation_results(cls, results_dict, task_preferences, tasks, satell
             agreement = session.state.agreement is not None
 
             if agreement:
-                print(f"Agreement achieved: {session.state.agreement} - {initiator_negotiator} and {partner_negotiator}")
+                print(f"Agreement achieved: {session.state.agreement} - {initiator_negotiator} and {', '.join(str(n) for n in partner_negotiators)}")
 
                 try:
                     current_memory_init = float(initiator_negotiator.satellite.available_memory)
-                    current_memory_part = float(partner_negotiator.satellite.available_memory)
                     task_memory = float(task.memory_required)
 
-                    # Calculate memory percentage based on task requirement
+                    # Calculate memory percentage based on task requirement;
+                    # the partners share the rest of the task equally
                     memory_percentage_init = float(session.state.agreement[1] / 100)
+                    partner_share = (1 - memory_percentage_init) / len(partner_negotiators)
 
                     # Calculate new available memory
                     new_memory_init = round(current_memory_init - task_memory * memory_percentage_init)
-                    new_memory_part = round(current_memory_part - task_memory * (1 - memory_percentage_init))
 
                     # Update satellite's available memory
                     initiator_negotiator.satellite.available_memory = new_memory_init
-                    partner_negotiator.satellite.available_memory = new_memory_part
-
                     print(f"{initiator_negotiator.satellite.name} memory update: {current_memory_init} -> {new_memory_init} (Contribution: {task_memory} * {memory_percentage_init*100:.1f}% = {task_memory * memory_percentage_init})")
-                    print(f"{partner_negotiator.satellite.name} memory update: {current_memory_part} -> {new_memory_part} (Contribution: {task_memory} * {(1-memory_percentage_init)*100:.1f}% = {task_memory * (1-memory_percentage_init)})")
+
+                    for partner_negotiator in partner_negotiators:
+                        current_memory_part = float(partner_negotiator.satellite.available_memory)
+                        new_memory_part = round(current_memory_part - task_memory * partner_share)
+                        partner_negotiator.satellite.available_memory = new_memory_part
+                        print(f"{partner_negotiator.satellite.name} memory update: {current_memory_part} -> {new_memory_part} (Contribution: {task_memory} * {partner_share*100:.1f}% = {task_memory * partner_share})")
 
                     # Calculate reward distribution
                     reward_percentage_init = float(session.state.agreement[0] / 100)
                     total_reward = float(task.reward_points)
                     initiator_reward = round(total_reward * reward_percentage_init)
-                    partner_reward = round(total_reward - initiator_reward)
+                    partner_reward = round((total_reward - initiator_reward) / len(partner_negotiators))
 
                     initiator_negotiator.satellite.accumulated_reward += initiator_reward
-                    partner_negotiator.satellite.accumulated_reward += partner_reward
-
                     print(f"{initiator_negotiator.satellite.name} reward update: {initiator_negotiator.satellite.accumulated_reward-initiator_reward} -> {initiator_negotiator.satellite.accumulated_reward} (Earned: {total_reward} * {reward_percentage_init*100:.1f}% = {initiator_reward})")
-                    print(f"{partner_negotiator.satellite.name} reward update: {partner_negotiator.satellite.accumulated_reward-partner_reward} -> {partner_negotiator.satellite.accumulated_reward} (Earned: {total_reward} * {(1-reward_percentage_init)*100:.1f}% = {partner_reward})")
+
+                    for partner_negotiator in partner_negotiators:
+                        partner_negotiator.satellite.accumulated_reward += partner_reward
+                        print(f"{partner_negotiator.satellite.name} reward update: {partner_negotiator.satellite.accumulated_reward-partner_reward} -> {partner_negotiator.satellite.accumulated_reward} (Earned: {total_reward} * {(1-reward_percentage_init)/len(partner_negotiators)*100:.1f}% = {partner_reward})")
                 except (ValueError, AttributeError) as e:
                     print(f"Warning: Failed to update memory and rewards - {str(e)}")
 
@@ -255,7 +266,7 @@ def write_negotiation_results(cls, results_dict, task_preferences, tasks, satell
         results_dict["negotiation_results"].append(task_result)
 
 
-def run_negotiation(negotiator_version: str, num_satellites: int, num_tasks: int, plot: bool = False, n_steps: int = 10):
+def run_negotiation(negotiator_version: str, num_satellites: int, num_tasks: int, plot: bool = False, n_steps: int = 10, seed: int | None = None, record_level: str = "summary", mechanism: str = "sao", outcome_grid: tuple[int, ...] | None = None):
     """Run the negotiation with the specified parameters."""
     print("\n=== Starting Satellite Negotiation ===")
     print(f"Negotiator: {negotiator_version}")
@@ -263,23 +274,30 @@ def run_negotiation(negotiator_version: str, num_satellites: int, num_tasks: int
     print(f"Number of Tasks: {num_tasks}")
     print(f"Number of Steps: {n_steps}")
     print(f"Plot Negotiation: {'Yes' if plot else 'No'}")
+    print(f"Seed: {seed}")
+    print(f"Recording Level: {record_level}")
+    print(f"Mechanism: {mechanism}")
+    print(f"Outcome Grid: {outcome_grid if outcome_grid else 'Off'}")
 
     negotiator_class = get_negotiator(negotiator_version)
+    negotiator_class.RECORDING_LEVEL = record_level
+    negotiator_class.OUTCOME_GRID = outcome_grid
 
-    satellites = create_satellites(num_satellites=num_satellites, cities=SIMPLE_CITIES)
+    satellites = create_satellites(num_satellites=num_satellites, cities=SIMPLE_CITIES, seed=seed)
     all_satellite_ids = [f"sat{i+1}" for i in range(num_satellites)]
 
     for sat in satellites:
         print(f"1. @#$@#$@#$@#$ {sat.memory_capacity}, {sat.available_memory}, {sat.accumulated_reward}")
 
-    tasks = create_tasks(num_tasks=num_tasks, cities=SIMPLE_CITIES)
+    tasks = create_tasks(num_tasks=num_tasks, cities=SIMPLE_CITIES, seed=seed)
 
     for tsk in tasks:
         print(f"Reward cost of task {tsk.id}: {float(tsk.memory_required/tsk.reward_points):.2f}")
 
     coalition_tables = generate_coalition_tables(
         tasks=tasks,
-        all_satellites=all_satellite_ids
+        all_satellites=all_satellite_ids,
+        seed=seed
     )
 
     all_negotiation_results = []
@@ -300,7 +318,7 @@ def run_negotiation(negotiator_version: str, num_satellites: int, num_tasks: int
 
         results_dict = create_results_dict(tasks, satellites, initiator_table, task_preferences)
 
-        write_negotiation_results(negotiator_class, results_dict, task_preferences, tasks, satellites, plot=plot, n_steps=n_steps)
+        write_negotiation_results(negotiator_class, results_dict, task_preferences, tasks, satellites, plot=plot, n_steps=n_steps, mechanism=mechanism)
 
         all_negotiation_results.append(results_dict)
 
@@ -320,6 +338,7 @@ def run_negotiation(negotiator_version: str, num_satellites: int, num_tasks: int
         "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
         "satellites": all_negotiation_results[0]["satellites"],
         "tasks": all_negotiation_results[0]["tasks"],
+        "outcome_grid": list(outcome_grid) if outcome_grid else None,
         "coalition_tables": [result["coalition_table"] for result in all_negotiation_results],
         "negotiation_results": [result["negotiation_results"] for result in all_negotiation_results],
         "final_states": {
@@ -336,7 +355,8 @@ def run_negotiation(negotiator_version: str, num_satellites: int, num_tasks: int
             "average_memory_utilisation": f"{average_utilization:.2f}%",
             "average_reward_per_satellite": f"{sum(sat.accumulated_reward for sat in satellites) / num_satellites:.2f}",
             "average_memory_cost": f"{sum(sat.memory_capacity - sat.available_memory for sat in satellites) / sum(sat.accumulated_reward for sat in satellites):.2f}",
-            "gini_coefficient": f"{gini_coefficient:.2f}"
+            "gini_coefficient": f"{gini_coefficient:.2f}",
+            "prefiltered_sessions": sum(result["prefiltered_sessions"] for result in all_negotiation_results)
         }
     }
 
@@ -410,6 +430,36 @@ def main():
         help='Plot negotiation results (default: False)'
     )
 
+    parser.add_argument(
+        '--seed',
+        type=int,
+        default=None,
+        help='Seed for reproducible satellites, tasks and coalition tables (default: random)'
+    )
+
+    parser.add_argument(
+        '--record',
+        type=str,
+        default='summary',
+        choices=list(RECORDING_LEVELS),
+        help='How much negotiation detail to record (default: summary, what the results need)'
+    )
+
+    parser.add_argument(
+        '--mechanism',
+        type=str,
+        default='sao',
+        choices=list(MECHANISMS),
+        help='Mechanism of the sessions: negmas SAO, or the lightweight bilateral one for two-party sessions (default: sao)'
+    )
+
+    parser.add_argument(
+        '--grid',
+        type=parse_grid,
+        default=None,
+        help='Grid steps of the coarse-to-fine mode, coarsest first, e.g. 10,1 (default: every outcome)'
+    )
+
     args = parser.parse_args()
 
     run_negotiation(
@@ -417,7 +467,11 @@ def main():
         num_satellites=args.satellites,
         num_tasks=args.tasks,
         plot=args.plot,
-        n_steps=args.steps
+        n_steps=args.steps,
+        seed=args.seed,
+        record_level=args.record,
+        mechanism=args.mechanism,
+        outcome_grid=args.grid
     )
 
 if __name__ == "__main__":
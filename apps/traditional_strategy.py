@@ -16,23 +16,35 @@ import sys
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from negmas import SAOMechanism, TimeBasedConcedingNegotiator, AspirationNegotiator, SAONegotiator, ResponseType
+from negmas import TimeBasedConcedingNegotiator, AspirationNegotiator, SAONegotiator, ResponseType
 from negmas.preferences import LinearAdditiveUtilityFunction as LUFun
 from negmas.preferences.value_fun import LinearFun, IdentityFun, AffineFun
 from negmas.preferences.crisp.mapping import MappingUtilityFunction
-from negmas.outcomes import dict2outcome, make_issue, Outcome
+from negmas.outcomes import dict2outcome, make_issue, make_os, Outcome
 import matplotlib.pyplot as plt
 import pprint
+import numpy as np
+import bisect
+import operator
 from random import choice
-from negmas import PolyAspiration, PresortingInverseUtilityFunction, PreferencesChangeType
+from negmas import PolyAspiration, PreferencesChangeType
 from MultiSatellitesNego.negotiators.v05 import NegotiatorV05
+from MultiSatellitesNego.negotiators.base import inverse_utility
 from MultiSatellitesNego.satellite import Satellite
 from MultiSatellitesNego.task import Task
+from MultiSatellitesNego.availability_index import AvailabilityIndex
+from MultiSatellitesNego.feasibility_cache import load_feasibility
+from MultiSatellitesNego.scenario import load_scenario
+from MultiSatellitesNego.session_cache import SessionCache, SessionOutcome, run_cached_session
+from MultiSatellitesNego.batch_auction import run_auction_batch
+from MultiSatellitesNego.bilateral_mechanism import make_session
+from MultiSatellitesNego.cli import flag_value
 from MultiSatellitesNego.utils import (
     calculate_average_memory_utilisation,
     calculate_average_reward,
     calculate_average_negotiation_rounds,
     calculate_negotiation_success_rate,
+    check_coalition_feasibility,
     is_satellite_available_for_task,
     calculate_task_allocation_success_rate
 )
@@ -42,8 +54,52 @@ import sys
 
 PRINT_DEBUG = False
 
+class PriceTable:
+    """
+    An auction ufun compiled into arrays once per ufun: its outcomes ranked by
+    utility, worst first (the order of its shared invertor), with their
+    utilities and prices, so AuctionNegotiator finds the outcomes within an
+    aspiration range, and prices within them, by bisection instead of
+    scanning, filtering and sorting every outcome on every step.
+
+    Ranked so, the buyer's prices descend, and the seller's ascend from the
+    task's memory requirement on (below it they are all worth 0 to it).
+    """
+
+    def __init__(self, ufun):
+        inverter = inverse_utility(ufun).inverter
+        self.ufun = ufun
+        # The shared invertor keeps every outcome (rational_only is off)
+        self.outcomes = list(inverter.outcomes)
+        self.utilities = [float(u) for u in inverter.utils]
+        self.prices = [outcome[0] for outcome in self.outcomes]
+        self.utility_array = np.array(self.utilities)
+        self.price_array = np.array(self.prices)
+        self._utility_of = dict(zip(self.outcomes, self.utilities))
+
+    def utility(self, outcome):
+        """Utility of an outcome, without evaluating the ufun."""
+        utility = self._utility_of.get(outcome)
+        return utility if utility is not None else float(self.ufun(outcome))
+
+    def span(self, low, high):
+        """(start, stop) of the outcomes with a utility within [low, high]."""
+        return (bisect.bisect_left(self.utilities, low),
+                bisect.bisect_right(self.utilities, high))
+
+_PRICE_TABLES = {}
+
+def price_table(ufun):
+    """The PriceTable of an auction ufun, built on first use."""
+    table = _PRICE_TABLES.get(id(ufun))
+    # The ufun is kept in the table, so a matching id can't be a reused one
+    if table is None or table.ufun is not ufun:
+        table = PriceTable(ufun)
+        _PRICE_TABLES[id(ufun)] = table
+    return table
+
 class AuctionNegotiator(SAONegotiator):
-    _inv = None
+    _prices = None
     _partner_first = None
     _min = None
     _max = None
@@ -67,15 +123,15 @@ class AuctionNegotiator(SAONegotiator):
         # create an initialize an invertor for my ufun
         changes = [_ for _ in changes if _.type not in (PreferencesChangeType.Scale,)]
 
-        self._inv = PresortingInverseUtilityFunction(self.ufun)
-        self._inv.init()
-
+        # The invertor and extremes of a ufun are shared by all its negotiators
+        shared = inverse_utility(self.ufun)
+        self._prices = price_table(self.ufun)
 
-        # find worst and best outcomes for me
-        worst, self._best = self.ufun.extreme_outcomes()
+        # find my best outcome
+        self._best = shared.best
 
         # and the corresponding utility values
-        self._min, self._max = self.ufun(worst), self.ufun(self._best)
+        self._min, self._max = shared.min, shared.max
 
         # MUST call parent to avoid being called again for no reason
         super().on_preferences_changed(changes)
@@ -107,13 +163,14 @@ class AuctionNegotiator(SAONegotiator):
                 state.relative_time
             ) * 0.8 + (self._min or 0)  # 20% discount on aspiration
 
-            if self.ufun(offer) >= current_aspiration:
+            utility = self._prices.utility(offer)
+            if utility >= current_aspiration:
                 if PRINT_DEBUG:
                     print(f"self.ufun(offer) >= current_aspiration, accepting\n")
                 return ResponseType.ACCEPT_OFFER
 
             # Accept anyway in the final 20% of negotiation time if it's not terrible
-            if state.relative_time > 0.8 and self.ufun(offer) > self._min * 1.2:
+            if state.relative_time > 0.8 and utility > self._min * 1.2:
                 if PRINT_DEBUG:
                     print(f"state.relative_time > 0.8 and self.ufun(offer) > self._min * 1.2, accepting\n")
                 return ResponseType.ACCEPT_OFFER
@@ -167,33 +224,37 @@ class AuctionNegotiator(SAONegotiator):
             print(f"Step {state.step} ({state.relative_time}): offer from {state.last_negotiator}: {state.current_offer}")
             print(f"Now {self._negotiator_type} proposing\n")
 
-        if self._inv is None:
+        if self._prices is None:
             return
+        table = self._prices
+        prices = table.prices
 
         # calculate the current aspiration level (utility level at which I will offer and accept)
         a = ((self._max or 0) - (self._min or 0)) * self._asp.utility_at(
             state.relative_time
         ) + (self._min or 0)
 
+        # Outcomes above the aspiration level are table.outcomes[start:stop], worst first
+        start, stop = table.span(a - 1e-6, self._max + 1e-6)
+
         # SATELLITE LOGIC (BUYER)
         if self._negotiator_type == "satellite" and self._sat is not None:
             available_memory = self._sat["available_memory"]
 
-            # Find outcomes above the aspiration level
-            outcomes = self._inv.some((a - 1e-6, self._max + 1e-6), False)
             if PRINT_DEBUG:
-                print(f"available_memory: {available_memory}, outcomes: {len(outcomes)}")
-            if not outcomes:
+                print(f"available_memory: {available_memory}, outcomes: {stop - start}")
+            if start == stop:
                 return self._best
 
-            # Filter to ensure price <= available_memory
-            filtered_outcomes = [o for o in outcomes if o[0] <= available_memory]
-            if not filtered_outcomes:
+            # Filter to ensure price <= available_memory: the prices descend,
+            # so these are outcomes[first:stop]
+            first = bisect.bisect_left(prices, -available_memory, start, stop, key=operator.neg)
+            if first == stop:
                 return self._best
 
             # Get price range information from filtered outcomes
-            min_price = min(o[0] for o in filtered_outcomes)
-            max_price = max(o[0] for o in filtered_outcomes)
+            min_price = prices[stop - 1]
+            max_price = prices[first]
             price_range = max_price - min_price if max_price > min_price else 1
 
             # Early negotiation: offer based on memory capacity
@@ -206,12 +267,21 @@ class AuctionNegotiator(SAONegotiator):
                 # Convert percentile to target price within our filtered range
                 target_price = min_price + (price_range * memory_percentile)
 
-                # Find outcomes closest to this target
-                sorted_outcomes = sorted(filtered_outcomes,
-                                        key=lambda o: abs(o[0] - target_price))
+                # Find the outcomes closest to this target, walking out from it
+                # (the higher price first on equal distances, as it comes first)
+                above = bisect.bisect_left(prices, -target_price, first, stop, key=operator.neg) - 1
+                below = above + 1
+                top_matches = []
+                while len(top_matches) < 3 and (above >= first or below < stop):
+                    if below >= stop or (above >= first and
+                                         abs(prices[above] - target_price) <= abs(prices[below] - target_price)):
+                        top_matches.append(table.outcomes[above])
+                        above -= 1
+                    else:
+                        top_matches.append(table.outcomes[below])
+                        below += 1
 
                 # Take one of the top few matches
-                top_matches = sorted_outcomes[:min(3, len(sorted_outcomes))]
                 return choice(top_matches)
 
             # Middle stages: adjust based on available memory
@@ -220,14 +290,13 @@ class AuctionNegotiator(SAONegotiator):
                 # Scaled based on memory size
                 flexibility = min(0.3 + (available_memory / 1000), 0.8)
 
-                # Select outcomes based on this flexibility
-                sorted_outcomes = sorted(filtered_outcomes, key=lambda o: o[0], reverse=True)
-                selection_point = int(len(sorted_outcomes) * flexibility)
+                # Select outcomes based on this flexibility, highest prices first
+                selection_point = int((stop - first) * flexibility)
                 selection_point = max(1, selection_point)  # Ensure at least 1
 
                 # Choose from the higher-priced outcomes based on memory size
-                candidate_outcomes = sorted_outcomes[:selection_point]
-                return choice(candidate_outcomes)
+                # (a choice of position draws as a choice of the outcomes would)
+                return table.outcomes[choice(range(first, first + selection_point))]
 
             # Late negotiation: focus on reaching agreement
             else:
@@ -236,70 +305,51 @@ class AuctionNegotiator(SAONegotiator):
 
                 # Sort outcomes by utility, with small boost for higher prices
                 # based on memory capacity
-                def custom_sort(outcome):
-                    base_utility = self.ufun(outcome)
-                    price_position = (outcome[0] - min_price) / price_range if price_range > 0 else 0
-                    memory_boost = price_position * memory_factor
-                    return base_utility + memory_boost
-
-                sorted_outcomes = sorted(filtered_outcomes, key=custom_sort, reverse=True)
+                price_position = (table.price_array[first:stop] - min_price) / price_range
+                scores = table.utility_array[first:stop] + price_position * memory_factor
+                ranked = np.argsort(-scores, kind="stable")
 
                 # Select from top options
-                selection_size = max(1, int(len(sorted_outcomes) * 0.2))
-                return choice(sorted_outcomes[:selection_size])
-
-            outcomes = filtered_outcomes
+                selection_size = max(1, int((stop - first) * 0.2))
+                return choice([table.outcomes[first + idx] for idx in ranked[:selection_size]])
 
         # TASK LOGIC (SELLER)
         elif self._negotiator_type == "task" and self._task is not None:
             min_price = self._task["memory_required"]
-            # find some outcomes above the aspiration level
-            outcomes = self._inv.some((a - 1e-6, self._max + 1e-6), False)
 
             # If there are no outcomes above the aspiration level, offer my best outcome
-            if not outcomes:
+            if start == stop:
                 return self._best
 
-            filtered_outcomes = [o for o in outcomes if o[0] >= min_price]
-            if not filtered_outcomes:
-                highest_price = -1
-                best_outcome = None
-                for o in outcomes:
-                    if o[0] > highest_price:
-                        highest_price = o[0]
-                        best_outcome = o
-                return best_outcome or self._best
+            # Prices >= min_price are the outcomes worth at least min_price's
+            # utility, outcomes[first:stop], their prices ascending
+            first = bisect.bisect_left(table.utilities, table.utility((min_price,)), start, stop)
+            if first == stop:
+                best_idx = max(range(start, stop), key=prices.__getitem__)
+                return table.outcomes[best_idx]
 
             # In early stages, start with higher offers (30% premium)
             if state.relative_time < 0.4:
                 target_price = min_price * 1.3  # 30% higher than minimum
 
-                # Find outcomes closest to (but not below) the target price
-                best_match = None
-                min_distance = float('inf')
-
-                for o in filtered_outcomes:
-                    # Only consider outcomes at or above target price in early stages
-                    if o[0] >= target_price:
-                        distance = abs(o[0] - target_price)
-                        if distance < min_distance:
-                            min_distance = distance
-                            best_match = o
-
-                # If we found a match at or above target price, return it
-                if best_match:
-                    return best_match
+                # The outcome closest to (but not below) the target price
+                idx = bisect.bisect_left(prices, target_price, first, stop)
+                if idx < stop:
+                    return table.outcomes[idx]
 
             # Use filtered outcomes for the rest of the logic
-            outcomes = filtered_outcomes
+            start = first
 
         # else if I did not  receive anything from the partner, offer any outcome above the aspiration level
         if not self._partner_first:
-            return choice(outcomes)
+            return table.outcomes[choice(range(start, stop))]
         else:
-            # Find the outcome closest to the partner's first offer
-            closest_outcome = min(outcomes, key=lambda o: sum((a - b)**2 for a, b in zip(o, self._partner_first)))
-            return closest_outcome
+            # Find the outcome closest to the partner's first offer (the lower price on equal distances)
+            partner_price = self._partner_first[0]
+            idx = bisect.bisect_left(prices, partner_price, start, stop)
+            if idx == stop or (idx > start and partner_price - prices[idx - 1] <= prices[idx] - partner_price):
+                idx -= 1
+            return table.outcomes[idx]
 
 def price_value_function(price):
     min_price = 20
@@ -308,25 +358,34 @@ def price_value_function(price):
     else:
         return price - min_price + 1  # Linear increase above minimum
 
-def run_negotiation(cls, satellite, task, plot=False, n_steps=20):
-    satellite_cls = cls
-    task_cls = cls
+# The agenda and utility functions of an auction only depend on the task's
+# memory requirement, so tasks with the same requirement share them (and with
+# them the cached ufun invertors)
+_TASK_AGENDAS = {}
+
+def task_agenda(memory_required):
+    """
+    Issues, seller (task) and buyer (satellite) utility functions of the
+    auction for a memory requirement, built once per requirement.
+    """
+    agenda = _TASK_AGENDAS.get(memory_required)
+    if agenda is not None:
+        return agenda
 
     # create negotiation agenda (issues)
     # "* 2" is to make the range of prices larger to allow tasks for more aggressive proposals
     issues = [
-        make_issue(name="price", values=range(0, int(task["memory_required"]) * 2 + 1))
+        make_issue(name="price", values=range(0, int(memory_required) * 2 + 1))
     ]
-
-    session = SAOMechanism(issues=issues, n_steps=n_steps)
+    outcome_space = make_os(issues)
 
     seller_utility = LUFun(
         values={
             "price": MappingUtilityFunction(
-                mapping=lambda price: 0 if price < task["memory_required"] else price - task["memory_required"] + 1
+                mapping=lambda price: 0 if price < memory_required else price - memory_required + 1
             )
         },
-        outcome_space=session.outcome_space,
+        outcome_space=outcome_space,
     ).scale_max(1.0)
 
     buyer_utility = LUFun(
@@ -334,10 +393,22 @@ def run_negotiation(cls, satellite, task, plot=False, n_steps=20):
             "price": AffineFun(slope=-1, bias=9)
         },
 
-        outcome_space=session.outcome_space,
+        outcome_space=outcome_space,
         reserved_value=10.0,
     ).scale_max(1.0)
 
+    agenda = (issues, seller_utility, buyer_utility)
+    _TASK_AGENDAS[memory_required] = agenda
+    return agenda
+
+def run_negotiation(cls, satellite, task, plot=False, n_steps=20, mechanism="sao"):
+    satellite_cls = cls
+    task_cls = cls
+
+    issues, seller_utility, buyer_utility = task_agenda(task["memory_required"])
+    # Plotting and the debug trace need SAOMechanism
+    session = make_session("sao" if plot or PRINT_DEBUG else mechanism, issues, n_steps)
+
     session.add(satellite_cls(name=satellite["name"], satellite=satellite), ufun=buyer_utility)
     session.add(task_cls(name="task" + str(task["id"]), task=task), ufun=seller_utility)
 
@@ -352,8 +423,11 @@ def run_negotiation(cls, satellite, task, plot=False, n_steps=20):
 
     return session
 
-def stage_1_task_distribution(tasks, satellites):
+def stage_1_task_distribution(tasks, satellites, index=None, batch=False, seed=None, mechanism="sao"):
     print("\n--- Stage 1: Task Distribution ---")
+    if index is None:
+        index = AvailabilityIndex.from_satellites(satellites)
+
     if PRINT_DEBUG:
         s = run_negotiation(AuctionNegotiator, satellites[0], tasks[1])
         pprint.pp(s.full_trace)
@@ -367,8 +441,41 @@ def stage_1_task_distribution(tasks, satellites):
             'satellite_memory': {},
             'agreement_prices': {},
             'negotiation_results': [],
-            'availability_checks': 0
+            'availability_checks': 0,
+            'prefiltered_sessions': 0
         }
+        # Random offer choices of the batch engine
+        rng = np.random.default_rng(seed)
+
+        def can_negotiate(sate, tsk):
+            # Check if satellite is available for this task
+            stage1_results['availability_checks'] += 1  # Count availability check
+            if is_satellite_available_for_task(sate, tsk, index) < 0:
+                print(f"Skipping negotiation with {sate['name']} - not available for Task {tsk['id']}\n")
+                return False
+
+            # The satellite rejects prices above its available memory and the
+            # task prices below its requirement, so there is no deal without memory
+            if check_coalition_feasibility(tsk, [sate]) is not None:
+                print(f"Skipping negotiation with {sate['name']} - not enough memory for Task {tsk['id']}\n")
+                stage1_results['prefiltered_sessions'] += 1
+                return False
+            return True
+
+        def sessions(tsk):
+            # (satellite, SessionOutcome) of every negotiation for the task
+            if batch:
+                # All of the task's sessions at once, in lockstep
+                partners = [sate for sate in satellites if can_negotiate(sate, tsk)]
+                outcomes = run_auction_batch(
+                    tsk["memory_required"], [sate["available_memory"] for sate in partners], rng=rng
+                )
+                yield from zip(partners, outcomes)
+                return
+            for sate in satellites:
+                if can_negotiate(sate, tsk):
+                    s = run_negotiation(AuctionNegotiator, sate, tsk, mechanism=mechanism)
+                    yield sate, SessionOutcome.from_state(s.state)
 
         for tsk in tasks:
             task_id = tsk["id"]
@@ -380,28 +487,21 @@ def stage_1_task_distribution(tasks, satellites):
             }
 
             # Negotiate only with available satellites
-            for sate in satellites:
-                # Check if satellite is available for this task
-                stage1_results['availability_checks'] += 1  # Count availability check
-                if is_satellite_available_for_task(sate, tsk) < 0:
-                    print(f"Skipping negotiation with {sate['name']} - not available for Task {task_id}\n")
-                    continue
-
+            for sate, outcome in sessions(tsk):
                 print(f"Negotiation Task{task_id} vs {sate['name']}")
-                s = run_negotiation(AuctionNegotiator, sate, tsk)
 
                 # Track negotiation results
                 negotiation_result = {
                     'task_id': task_id,
                     'satellite': sate['name'],
-                    'agreement_reached': s.state.agreement is not None,
-                    'rounds': s.state.step
+                    'agreement_reached': outcome.agreement is not None,
+                    'rounds': outcome.step
                 }
                 stage1_results['negotiation_results'].append(negotiation_result)
 
                 # Check if an agreement was reached
-                if s.state.agreement is not None:
-                    agreement_price = s.state.agreement[0]
+                if outcome.agreement is not None:
+                    agreement_price = outcome.agreement[0]
                     print(f"Agreement reached at price: {agreement_price}")
 
                     # Update best agreement if this one has a higher price
@@ -409,7 +509,7 @@ def stage_1_task_distribution(tasks, satellites):
                         task_best_agreements[task_id] = {
                             "price": agreement_price,
                             "satellite": sate["name"],
-                            "agreement": s.state.agreement
+                            "agreement": outcome.agreement
                         }
                 else:
                     print("No agreement reached")
@@ -446,8 +546,11 @@ def stage_1_task_distribution(tasks, satellites):
 
         return stage1_results
 
-def stage_2_finding_partner(tasks, satellites, stage1_results):
+def stage_2_finding_partner(tasks, satellites, stage1_results, index=None, session_cache=None, mechanism="sao"):
     print("\n--- Stage 2: Finding Partner ---")
+    if index is None:
+        index = AvailabilityIndex.from_satellites(satellites)
+
     print("Current satellite memory status")
     for sat in satellites:
         print(f"{sat['name']}: Memory available: {sat['available_memory']}")
@@ -457,7 +560,8 @@ def stage_2_finding_partner(tasks, satellites, stage1_results):
 
     stage2_results = {
         'negotiation_results': [],  # List to store negotiation results
-        'availability_checks': 0  # Track availability checks
+        'availability_checks': 0,  # Track availability checks
+        'prefiltered_sessions': 0  # Sessions skipped as they can't reach an agreement
     }
 
     # For each task that was assigned in stage 1
@@ -484,29 +588,43 @@ def stage_2_finding_partner(tasks, satellites, stage1_results):
 
             # Check if potential partner is available for the task
             stage2_results['availability_checks'] += 1  # Count availability check
-            if is_satellite_available_for_task(potential_partner, task) < 0:
+            if is_satellite_available_for_task(potential_partner, task, index) < 0:
                 print(f"Skipping {potential_partner['name']} - not available for Task {task_id}")
                 continue
 
+            # The initiator negotiator keeps its own copy of the satellite
+            if check_coalition_feasibility(task, [initiator_negotiator.satellite, potential_partner],
+                                           NegotiatorV05.MEMORY_GATED) is not None:
+                print(f"Skipping {potential_partner['name']} - not enough memory for Task {task_id}")
+                stage2_results['prefiltered_sessions'] += 1
+                continue
+
             print(f"Negotiating with potential partner: {potential_partner['name']} (available_memory: {potential_partner['available_memory']})")
 
-            session = SAOMechanism(issues=NegotiatorV05.negotiator_issues, n_steps=20)
-            session.add(initiator_negotiator, ufun=NegotiatorV05.initiator_ufun)
-            partner_negotiator = NegotiatorV05(satellite=Satellite(**potential_partner), task=Task(**task))
-            session.add(partner_negotiator, ufun=NegotiatorV05.partner_ufun)
-            session.run()
+            def run_session():
+                session = make_session(mechanism, NegotiatorV05.negotiator_issues, 20)
+                session.add(initiator_negotiator, ufun=NegotiatorV05.initiator_ufun)
+                partner_negotiator = NegotiatorV05(satellite=Satellite(**potential_partner), task=Task(**task))
+                session.add(partner_negotiator, ufun=NegotiatorV05.partner_ufun)
+                return session.run()
+
+            # Repeated sessions of the deterministic v05 negotiators come from the cache
+            outcome = run_cached_session(
+                session_cache, NegotiatorV05, task, [initiator_negotiator.satellite, potential_partner], 20,
+                run_session
+            )
 
             negotiation_result = {
                 'task_id': task_id,
                 'initiator': assigned_satellite,
                 'partner': potential_partner['name'],
-                'agreement_reached': session.state.agreement is not None,
-                'rounds': session.state.step
+                'agreement_reached': outcome.agreement is not None,
+                'rounds': outcome.step
             }
             stage2_results['negotiation_results'].append(negotiation_result)
 
-            if session.state.agreement is not None:
-                agreement = session.state.agreement
+            if outcome.agreement is not None:
+                agreement = outcome.agreement
                 print(f"Agreement reached with {potential_partner['name']}:")
                 print(f"  Initiator reward: {agreement[0]}")
                 print(f"  Initiator memory: {agreement[1]}")
@@ -534,13 +652,11 @@ def stage_2_finding_partner(tasks, satellites, stage1_results):
             else:
                 print(f"No agreement reached with {potential_partner['name']}")
 
-            session = None
-
     return stage2_results
 
 def main():
     if len(sys.argv) < 2:
-        print("Usage: python traditional_strategy.py <path_to_json_file>")
+        print("Usage: python traditional_strategy.py <path_to_json_file> [--batch [--seed N]] [--session-cache PATH | --no-session-cache] [--mechanism sao|bilateral]")
         sys.exit(1)
 
     json_file = sys.argv[1]
@@ -548,16 +664,35 @@ def main():
 
     PRINT_DEBUG = any(flag in sys.argv for flag in ["--debug", "-d"])
 
-    with open(json_file, 'r') as file:
-        data = json.load(file)
+    data = load_scenario(json_file)
 
     tasks = data['tasks']
     satellites = data['satellites']
 
     print("\n---=== Traditional Strategy ===---")
 
-    s1_results = stage_1_task_distribution(tasks, satellites)
-    s2_results = stage_2_finding_partner(tasks, satellites, s1_results)
+    # Availability never changes during a run, so the scenario's cached
+    # feasibility serves both stages
+    index = load_feasibility(json_file, data)
+
+    # --batch runs each task's stage 1 sessions in lockstep (seeded with --seed)
+    batch = "--batch" in sys.argv
+    seed = flag_value("--seed")
+    seed = int(seed) if seed is not None else None
+
+    # --mechanism bilateral runs the sessions on the lightweight bilateral mechanism
+    mechanism = flag_value("--mechanism", "sao")
+
+    s1_results = stage_1_task_distribution(tasks, satellites, index, batch, seed, mechanism)
+    # Outcomes of deterministic sessions, kept on disk across runs with --session-cache
+    session_cache = None
+    if "--no-session-cache" not in sys.argv:
+        session_cache = SessionCache(path=flag_value("--session-cache"))
+
+    s2_results = stage_2_finding_partner(tasks, satellites, s1_results, index, session_cache, mechanism)
+    if session_cache is not None:
+        session_cache.save()
+        print(f"\nSession cache: {session_cache.hits} hits, {session_cache.misses} misses")
 
     # Calculate and display memory utilization metrics
     avg_utilisation, total_used, total_available = calculate_average_memory_utilisation(satellites)
@@ -585,6 +720,8 @@ def main():
     print("\n--- Negotiation Success Rate Metrics ---")
     print(f"Total Negotiations: {total_negotiations}")
     print(f"Successful Negotiations: {successful_negotiations}")
+    prefiltered_sessions = s1_results['prefiltered_sessions'] + s2_results['prefiltered_sessions']
+    print(f"Prefiltered (Infeasible) Sessions: {prefiltered_sessions}")
     print(f"Success Rate: {success_rate:.2f}%")
 
     # Calculate and display task allocation success rate metrics
@@ -613,7 +750,8 @@ def main():
                 "average_rounds": avg_rounds,
                 "success_rate": success_rate,
                 "successful_negotiations": successful_negotiations,
-                "total_negotiations": total_negotiations
+                "total_negotiations": total_negotiations,
+                "prefiltered_sessions": prefiltered_sessions
             },
             "task_allocation": {
                 "success_rate": task_success_rate,
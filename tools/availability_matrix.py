@@ -12,9 +12,13 @@ import sys
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 import json
-import re
 from textwrap import wrap
+import numpy as np
 from MultiSatellitesNego.utils import generate_coverage_array, generate_coverage_console_table
+from MultiSatellitesNego.availability_runs import encode_runs
+from MultiSatellitesNego.availability_store import write_availability_store, attach_availability_store, is_store_backed
+from MultiSatellitesNego.scenario import load_scenario, save_scenario
+from MultiSatellitesNego.cli import flag_value
 
 tasks = [
     {
@@ -339,44 +343,53 @@ def main():
 
     if len(sys.argv) < 2:
         print("Please specify the setup JSON file\n")
+        print("Usage: python availability_matrix.py <path_to_json_file> [--rle | --npy] [--seed N] [--quiet]")
         sys.exit(1)
 
     json_file = sys.argv[1]
-    with open(json_file, 'r') as file:
-        data = json.load(file)
+    # Write run-length-encoded availability instead of 96-int matrices
+    use_rle = "--rle" in sys.argv
+    # Write the availability to a memory-mapped .npy store next to the JSON
+    use_npy = "--npy" in sys.argv
+    # Same seed, same matrices
+    seed = flag_value("--seed")
+    seed = int(seed) if seed is not None else None
+    quiet = "--quiet" in sys.argv
+    data = load_scenario(json_file)
 
     tsk_list = data['tasks']
 
-    am = generate_coverage_array(tsk_list, assignments)
+    am = generate_coverage_array(tsk_list, assignments, seed=seed, quiet=quiet)
 
     satellites = data["satellites"]
+    data.pop("availability_store", None)
     for i, satellite in enumerate(satellites):
-        if i < len(am):
+        satellite.pop("availability_row", None)
+        if i < len(am) and use_rle:
+            satellite.pop("availability_matrix", None)
+            satellite["availability_runs"] = encode_runs(am[i])
+            satellite["availability_slots"] = len(am[i])
+        elif i < len(am):
+            satellite.pop("availability_runs", None)
+            satellite.pop("availability_slots", None)
             satellite["availability_matrix"] = am[i]
         else:
             print(f"Warning: No coverage data for satellite {satellite['name']}")
+            # Keep its availability once the store reference is gone
+            if is_store_backed(satellite):
+                satellite["availability_matrix"] = np.asarray(satellite["availability_matrix"]).tolist()
 
-    json_str = json.dumps(data, indent=4)
+    if use_npy:
+        path = write_availability_store(json_file, data)
+        print(f"Availability store written to '{path}'")
 
-    # Replace availability_matrix content with a compact version
-    def compact_matrix(match):
-        numbers = re.findall(r'\d+', match.group(0))
-        compact = ', '.join(numbers)
-        return f'"availability_matrix": [{compact}]'
-
-    # Replace all availability_matrix arrays with compact versions
-    json_str = re.sub(
-        r'"availability_matrix":\s*\[[^\]]*\]',
-        compact_matrix,
-        json_str
-    )
-
-    with open(json_file, 'w') as f:
-        f.write(json_str)
+    save_scenario(json_file, data)
 
     print(f"Availability matrices updated and saved to '{json_file}'")
 
-    generate_coverage_console_table(satellites, tsk_list)
+    if not quiet:
+        attach_availability_store(json_file, data)
+        generate_coverage_console_table(satellites, tsk_list)
 
 
 if __name__ == "__main__":
@@ -13,6 +13,8 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 
 import json
 from MultiSatellitesNego.utils import interpret_satellite_availability
+from MultiSatellitesNego.feasibility_cache import load_feasibility
+from MultiSatellitesNego.scenario import load_scenario
 
 tasks = [
     {
@@ -110,7 +112,24 @@ sat = {
 
 def main():
 
-    ret = interpret_satellite_availability(sat, tasks)
+    # Optionally interpret a satellite of a setup file:
+    # python availability_matrix_interpret.py <path_to_json_file> <satellite_name>
+    if len(sys.argv) < 3:
+        sat_to_interpret = sat
+        tsk_list = tasks
+        feasibility = None
+    else:
+        json_file = sys.argv[1]
+        data = load_scenario(json_file)
+
+        tsk_list = data['tasks']
+        sat_to_interpret = next((s for s in data['satellites'] if s['name'] == sys.argv[2]), None)
+        if sat_to_interpret is None:
+            print(f"Satellite {sys.argv[2]} not found in {json_file}")
+            sys.exit(1)
+        feasibility = load_feasibility(json_file, data)
+
+    ret = interpret_satellite_availability(sat_to_interpret, tsk_list, feasibility)
     print(f"Result: {ret}")
 
 
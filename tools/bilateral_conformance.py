@@ -0,0 +1,152 @@
+"""
+Tool: Bilateral Mechanism Conformance Check
+
+Runs the same seeded two-party sessions on negmas' SAOMechanism and on
+BilateralMechanism (MultiSatellitesNego/bilateral_mechanism.py) and checks
+they end alike: the same agreement, number of steps, broken and timed-out
+flags, and the global random stream left at the same position. Covers every
+negotiator of the registry, the stage 1 AuctionNegotiator of the traditional
+strategy and an initiator negotiator reused across sessions, as in its stage 2.
+
+Usage: python tools/bilateral_conformance.py [--sessions N] [--seed N]
+
+Exits with status 1 if any session differs.
+
+Author: Zheng Wang
+Email: wanzy133@mymail.unisa.edu.au
+Supervisor: Dr. Jianglin Qiao
+
+Date Created: 17/10/2026
+"""
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'apps')))
+
+import contextlib
+import io
+import logging
+import random
+import time
+import numpy as np
+from negmas import SAOMechanism
+from MultiSatellitesNego.bilateral_mechanism import BilateralMechanism
+from MultiSatellitesNego.negotiators import NEGOTIATOR_REGISTRY, NegotiatorV05
+from MultiSatellitesNego.satellite import Satellite
+from MultiSatellitesNego.task import Task
+from MultiSatellitesNego.cli import flag_value
+from traditional_strategy import AuctionNegotiator, task_agenda
+
+MECHANISM_CLASSES = {"sao": SAOMechanism, "bilateral": BilateralMechanism}
+
+# v04 and v04.1 scan the outcome space on every call, so they get fewer sessions
+SLOW_VERSIONS = {"v04", "v041"}
+
+def random_case(rng, n_steps):
+    """Satellites and a task of one session, half of them short of memory."""
+    task = dict(id=rng.randint(1, 50), location_index=str(rng.randint(1, 10)), time_window=[],
+                reward_points=rng.randint(50, 1000), memory_required=rng.randint(10, 400))
+    members = []
+    for i in range(2):
+        capacity = rng.randint(100, 1000)
+        members.append(dict(name=f"sat{i + 1}", memory_capacity=capacity,
+                            available_memory=rng.randint(0, capacity)))
+    return dict(task=task, members=members, n_steps=n_steps)
+
+def agenda(cls):
+    """Issues and ufuns of a negotiator class; v05's for the classes without their own."""
+    source = cls if hasattr(cls, "negotiator_issues") else NegotiatorV05
+    return source.negotiator_issues, source.initiator_ufun, source.partner_ufun
+
+def run_registry_session(mechanism_cls, cls, case):
+    issues, initiator_ufun, partner_ufun = agenda(cls)
+    session = mechanism_cls(issues=issues, n_steps=case["n_steps"])
+    task = Task(**case["task"])
+    for member, ufun in zip(case["members"], (initiator_ufun, partner_ufun)):
+        session.add(cls(Satellite(**member), task), ufun=ufun)
+    return [session.run()]
+
+def run_auction_session(mechanism_cls, case):
+    satellite, task = case["members"][0], case["task"]
+    issues, seller_utility, buyer_utility = task_agenda(task["memory_required"])
+    session = mechanism_cls(issues=issues, n_steps=case["n_steps"])
+    session.add(AuctionNegotiator(name=satellite["name"], satellite=satellite), ufun=buyer_utility)
+    session.add(AuctionNegotiator(name="task" + str(task["id"]), task=task), ufun=seller_utility)
+    return [session.run()]
+
+def run_reused_initiator(mechanism_cls, case):
+    """One initiator negotiator against several partners in turn."""
+    task = Task(**case["task"])
+    initiator = NegotiatorV05(satellite=Satellite(**case["members"][0]), task=task)
+    states = []
+    for available_memory in (10, 200, 1000):
+        partner = dict(case["members"][1], available_memory=available_memory,
+                       memory_capacity=max(available_memory, case["members"][1]["memory_capacity"]))
+        session = mechanism_cls(issues=NegotiatorV05.negotiator_issues, n_steps=case["n_steps"])
+        session.add(initiator, ufun=NegotiatorV05.initiator_ufun)
+        session.add(NegotiatorV05(satellite=Satellite(**partner), task=task), ufun=NegotiatorV05.partner_ufun)
+        states.append(session.run())
+    return states
+
+def summary(states):
+    """What both mechanisms must agree on, including the next numbers of the random streams."""
+    ends = [(state.agreement, state.step, state.broken, state.timedout) for state in states]
+    return ends, random.random(), np.random.random()
+
+def check(name, run, cases, seed, timings):
+    mismatches = 0
+    for i, case in enumerate(cases):
+        results = {}
+        # Some negotiators print as they go
+        with contextlib.redirect_stdout(io.StringIO()):
+            # Builds the shared agendas and invertors, which draw random numbers, beforehand
+            run(SAOMechanism, case)
+            for mechanism, mechanism_cls in MECHANISM_CLASSES.items():
+                # negmas samples outcomes with numpy's global generator
+                random.seed(seed + i)
+                np.random.seed(seed + i)
+                start = time.perf_counter()
+                states = run(mechanism_cls, case)
+                timings[mechanism] += time.perf_counter() - start
+                results[mechanism] = summary(states)
+        if results["sao"] != results["bilateral"]:
+            mismatches += 1
+            print(f"  MISMATCH {name} #{i}: {case}")
+            print(f"    sao:       {results['sao']}")
+            print(f"    bilateral: {results['bilateral']}")
+    print(f"{name:>16}: {len(cases)} cases, {mismatches} mismatches")
+    return mismatches
+
+def main():
+    n_sessions = int(flag_value("--sessions", 40))
+    seed = int(flag_value("--seed", 0))
+
+    # The negotiators' logging and prints would drown the report
+    logging.disable(logging.CRITICAL)
+    for cls in NEGOTIATOR_REGISTRY.values():
+        cls.LOGGING_ENABLED = False
+
+    rng = random.Random(seed)
+    timings = {mechanism: 0.0 for mechanism in MECHANISM_CLASSES}
+    mismatches = 0
+
+    for version, cls in NEGOTIATOR_REGISTRY.items():
+        count = max(1, n_sessions // 8) if version in SLOW_VERSIONS else n_sessions
+        cases = [random_case(rng, rng.choice((10, 20))) for _ in range(count)]
+        mismatches += check(version, lambda mechanism_cls, case: run_registry_session(mechanism_cls, cls, case),
+                            cases, seed, timings)
+
+    cases = [random_case(rng, rng.choice((10, 20))) for _ in range(n_sessions)]
+    mismatches += check("auction", run_auction_session, cases, seed, timings)
+
+    cases = [random_case(rng, rng.choice((10, 20))) for _ in range(max(1, n_sessions // 4))]
+    mismatches += check("reused initiator", run_reused_initiator, cases, seed, timings)
+
+    print(f"\nSAOMechanism: {timings['sao']:.2f}s, BilateralMechanism: {timings['bilateral']:.2f}s")
+    if mismatches:
+        print(f"{mismatches} sessions differ")
+        sys.exit(1)
+    print("All sessions match")
+
+if __name__ == "__main__":
+    main()
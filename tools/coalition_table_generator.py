@@ -12,25 +12,59 @@ import sys
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 import json
-from MultiSatellitesNego.utils import generate_coalition_table
+import time
+from MultiSatellitesNego.feasibility_cache import load_feasibility
+from MultiSatellitesNego.scenario import load_scenario, save_scenario
+from MultiSatellitesNego.cli import flag_value
 
 def main():
     if len(sys.argv) < 3:
-        print("Usage: python coalition_table_generator.py <path_to_json_file> <initiator_satellite_name>")
+        print("Usage: python coalition_table_generator.py <path_to_json_file> <initiator_satellite_name> "
+              "[--max-partners K|all] [--max-coalitions N] [--compact]")
+        print("       python coalition_table_generator.py <path_to_json_file> --all "
+              "[--processes N] [--max-partners K|all] [--max-coalitions N] [--compact]")
         sys.exit(1)
 
 
     json_file = sys.argv[1]
-    with open(json_file, 'r') as file:
-        data = json.load(file)
+    data = load_scenario(json_file)
 
     initiator_satellite_name = sys.argv[2]
 
     tasks = data['tasks']
     satellites = data['satellites']
 
-    ret = generate_coalition_table(initiator_satellite_name, satellites, tasks)
-    print(f"ret: {ret}")
+    # Pairwise by default; coalitions of up to K partners (or any size) on request
+    max_partners = flag_value("--max-partners", "1")
+    max_partners = None if max_partners == "all" else int(max_partners)
+    max_coalitions = flag_value("--max-coalitions")
+    max_coalitions = int(max_coalitions) if max_coalitions is not None else None
+
+    # Coalition candidates come from the scenario's feasibility cache
+    feasibility = load_feasibility(json_file, data)
+    compact = "--compact" in sys.argv
+
+    if initiator_satellite_name == "--all":
+        # Every satellite's table in one pass, written back into the scenario file
+        processes = flag_value("--processes")
+        start = time.perf_counter()
+        tables = feasibility.coalition_tables(
+            max_partners, max_coalitions, int(processes) if processes is not None else None, compact
+        )
+        for sat in satellites:
+            table = tables[sat['name']]
+            sat['coalition_table'] = table.to_compact() if compact else table
+        save_scenario(json_file, data)
+        print(f"Coalition tables of {len(satellites)} satellites for {len(tasks)} tasks "
+              f"saved to '{json_file}' in {time.perf_counter() - start:.2f}s")
+        return
+
+    if initiator_satellite_name not in feasibility:
+        print(f"Initiator satellite {initiator_satellite_name} not found in satellites list")
+        sys.exit(1)
+
+    ret = feasibility.coalition_table(initiator_satellite_name, max_partners, max_coalitions, compact)
+    print(json.dumps(ret.to_compact() if compact else ret, indent=4))
 
 if __name__ == "__main__":
     main()
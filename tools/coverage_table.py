@@ -11,8 +11,10 @@ import os
 import sys
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-import json
-from MultiSatellitesNego.utils import generate_coverage_markdown_table, generate_coverage_console_table
+from MultiSatellitesNego.utils import generate_coverage_markdown_table, generate_coverage_console_table, write_coverage_table
+from MultiSatellitesNego.feasibility_cache import load_feasibility
+from MultiSatellitesNego.scenario import load_scenario
+from MultiSatellitesNego.cli import flag_value
 
 satellites = [
     {
@@ -78,18 +80,41 @@ tasks = [
 
 def main():
 
-    if len(sys.argv) < 2:
+    if len(sys.argv) < 2 or sys.argv[1].startswith("--"):
         sat_list = satellites
         tsk_list = tasks
+        feasibility = None
     else:
         json_file = sys.argv[1]
-        with open(json_file, 'r') as file:
-            data = json.load(file)
+        data = load_scenario(json_file)
 
         tsk_list = data['tasks']
         sat_list = data['satellites']
+        feasibility = load_feasibility(json_file, data)
 
-    ret = generate_coverage_console_table(sat_list, tsk_list)
+    # Streaming mode: rows are written as they are computed
+    out_file = flag_value("--out")
+    cell_format = flag_value("--cells", "names")
+    processes = flag_value("--processes")
+    if out_file or processes or "--cells" in sys.argv or "--markdown" in sys.argv:
+        table_format = "markdown" if "--markdown" in sys.argv else "console"
+        if processes:
+            # Workers compute coverage themselves instead of reading the cached table
+            feasibility = None
+        out = open(out_file, 'w') if out_file else sys.stdout
+        try:
+            count = write_coverage_table(
+                sat_list, tsk_list, out, table_format, feasibility,
+                cell_format=cell_format, processes=int(processes) if processes else None
+            )
+        finally:
+            if out_file:
+                out.close()
+        if out_file:
+            print(f"{count} rows written to '{out_file}'")
+        return
+
+    ret = generate_coverage_console_table(sat_list, tsk_list, feasibility)
     print(f"ret: {ret}")
 
 if __name__ == "__main__":
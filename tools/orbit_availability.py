@@ -0,0 +1,81 @@
+"""
+Tool: Orbit-based Availability Generator
+
+Replaces the availability of every satellite in a setup with the
+visibility of its tasks' locations from a Walker-delta constellation.
+
+Author: Zheng Wang
+Email: wanzy133@mymail.unisa.edu.au
+Supervisor: Dr. Jianglin Qiao
+
+Date Created: 17/10/2026
+"""
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import time
+from MultiSatellitesNego.coverage import SLOTS_PER_HOUR
+from MultiSatellitesNego.negotiation_config import SIMPLE_CITIES
+from MultiSatellitesNego.orbits import walker_delta, location_sites, cached_visibility_matrix
+from MultiSatellitesNego.scenario import load_scenario
+from MultiSatellitesNego.scenario_generator import write_scenario
+from MultiSatellitesNego.cli import flag_value
+
+def default_planes(num_satellites):
+    """Largest divisor of num_satellites not above its square root."""
+    return max(p for p in range(1, int(num_satellites ** 0.5) + 1) if num_satellites % p == 0)
+
+def main():
+
+    if len(sys.argv) < 2:
+        print("Usage: python orbit_availability.py <path_to_json_file> [--planes P] [--phasing F] "
+              "[--inclination DEG] [--altitude KM] [--min-elevation DEG] [--days D] [--rle | --npy]")
+        sys.exit(1)
+
+    json_file = sys.argv[1]
+    data = load_scenario(json_file)
+    satellites = data["satellites"]
+    tasks = data["tasks"]
+
+    num_planes = int(flag_value("--planes", default_planes(len(satellites))))
+    constellation = walker_delta(
+        len(satellites),
+        num_planes,
+        phasing=int(flag_value("--phasing", 1)),
+        inclination=float(flag_value("--inclination", 53.0)),
+        altitude=float(flag_value("--altitude", 550.0))
+    )
+    num_locations = max(int(task["location_index"]) for task in tasks)
+    sites = location_sites(num_locations, SIMPLE_CITIES)
+    n_slots = int(float(flag_value("--days", 1)) * 24 * SLOTS_PER_HOUR)
+
+    start = time.perf_counter()
+    # Cached next to the setup, so re-running with the same constellation is instant
+    cache_dir = os.path.join(os.path.dirname(os.path.abspath(json_file)), ".orbit_cache")
+    matrix = cached_visibility_matrix(
+        constellation, sites, n_slots, cache_dir,
+        min_elevation=float(flag_value("--min-elevation", 10.0))
+    )
+    print(f"Visibility of {num_locations} locations from {len(satellites)} satellites "
+          f"({num_planes} planes) over {n_slots} slots in {time.perf_counter() - start:.2f}s")
+
+    data.pop("availability_store", None)
+    for sat, row in zip(satellites, matrix.tolist()):
+        for key in ("availability_row", "availability_runs", "availability_slots"):
+            sat.pop(key, None)
+        sat["availability_matrix"] = row
+
+    if "--rle" in sys.argv:
+        availability = "rle"
+    elif "--npy" in sys.argv:
+        availability = "npy"
+    else:
+        availability = "matrix"
+    write_scenario(json_file, data, availability)
+
+    print(f"Availability updated and saved to '{json_file}'")
+
+
+if __name__ == "__main__":
+    main()
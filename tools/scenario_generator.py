@@ -0,0 +1,54 @@
+"""
+Tool: Scenario Generator
+
+Author: Zheng Wang
+Email: wanzy133@mymail.unisa.edu.au
+Supervisor: Dr. Jianglin Qiao
+
+Date Created: 17/10/2026
+"""
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import time
+from MultiSatellitesNego.scenario_generator import generate_scenario, write_scenario
+from MultiSatellitesNego.cli import flag_value
+
+def main():
+
+    if len(sys.argv) < 4:
+        print("Usage: python scenario_generator.py <output_json_file> <num_tasks> <num_satellites> "
+              "[--seed N] [--coverage P] [--locations N] [--no-coalitions] [--rle | --npy]")
+        sys.exit(1)
+
+    json_file = sys.argv[1]
+    num_tasks = int(sys.argv[2])
+    num_satellites = int(sys.argv[3])
+    seed = flag_value("--seed")
+    num_locations = flag_value("--locations")
+
+    if "--rle" in sys.argv:
+        availability = "rle"
+    elif "--npy" in sys.argv:
+        availability = "npy"
+    else:
+        availability = "matrix"
+
+    start = time.perf_counter()
+    data = generate_scenario(
+        num_tasks,
+        num_satellites,
+        seed=int(seed) if seed is not None else None,
+        num_locations=int(num_locations) if num_locations is not None else None,
+        coverage_probability=float(flag_value("--coverage", 0.3)),
+        coalition_tables="--no-coalitions" not in sys.argv
+    )
+    write_scenario(json_file, data, availability)
+
+    print(f"Scenario with {num_tasks} tasks and {num_satellites} satellites "
+          f"saved to '{json_file}' in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,8 +11,9 @@ import os
 import sys
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-import json
 from MultiSatellitesNego.utils import check_task_coverage, is_satellite_available_for_task
+from MultiSatellitesNego.feasibility_cache import load_feasibility
+from MultiSatellitesNego.scenario import load_scenario
 
 satellites = [
     {
@@ -81,19 +82,20 @@ def main():
     if len(sys.argv) < 2:
         sat_list = satellites
         tsk_list = tasks
+        feasibility = None
     else:
         json_file = sys.argv[1]
-        with open(json_file, 'r') as file:
-            data = json.load(file)
+        data = load_scenario(json_file)
 
         tsk_list = data['tasks']
         sat_list = data['satellites']
+        feasibility = load_feasibility(json_file, data)
 
     print(f"Check if a satellite available for a task:")
-    print(f"{is_satellite_available_for_task(sat_list[2], tsk_list[0])}")
+    print(f"{is_satellite_available_for_task(sat_list[2], tsk_list[0], feasibility)}")
 
     print('Coverage Detailed Information')
-    ret = check_task_coverage(tsk_list, sat_list)
+    ret = check_task_coverage(tsk_list, sat_list, feasibility)
     print(f"ret: {ret}")
 
 if __name__ == "__main__":